@@ -0,0 +1,60 @@
+"""Compare the compact binary encoding with the JSON path.
+
+Run with ``python benchmarks/bench_binary.py``.
+"""
+
+import json
+import time
+
+from slurm_script_generator.slurm_script import SlurmScript
+
+SCRIPTS = 20_000
+
+
+def build_sweep(n: int) -> list:
+    return [
+        SlurmScript(
+            job_name=f"sweep_{i}",
+            partition="gpu",
+            account="myacct",
+            nodes=2,
+            ntasks_per_node=4,
+            cpus_per_task=8,
+            time=f"0{i % 4}:30:00",
+            mem="32G",
+            hold=True,
+            modules=["gcc/12", "openmpi/4.1"],
+            custom_commands=[f"srun ./bin --point {i}"],
+        )
+        for i in range(n)
+    ]
+
+
+def timed(label: str, func) -> object:
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<14} {elapsed * 1e6 / SCRIPTS:8.2f} us/script")
+    return result
+
+
+def main() -> None:
+    scripts = build_sweep(SCRIPTS)
+
+    as_json = timed(
+        "json encode", lambda: [json.dumps(s.to_dict(), indent=4) for s in scripts]
+    )
+    as_bytes = timed("binary encode", lambda: [s.to_bytes() for s in scripts])
+    timed(
+        "json decode", lambda: [SlurmScript.from_dict(json.loads(t)) for t in as_json]
+    )
+    timed("binary decode", lambda: [SlurmScript.from_bytes(b) for b in as_bytes])
+
+    json_size = sum(len(t.encode()) for t in as_json) / SCRIPTS
+    binary_size = sum(len(b) for b in as_bytes) / SCRIPTS
+    print(f"json size      {json_size:8.0f} bytes/script")
+    print(f"binary size    {binary_size:8.0f} bytes/script")
+
+
+if __name__ == "__main__":
+    main()
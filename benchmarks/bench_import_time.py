@@ -0,0 +1,80 @@
+"""Measure how long importing the package and its pragmas takes.
+
+Every measurement starts a fresh interpreter, since a module is only imported
+once per process. Run with ``python benchmarks/bench_import_time.py``.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+RUNS = 30
+
+# Measure imports the way an installed package sees them: from cached bytecode.
+ENV = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+
+STATEMENTS = {
+    "import slurm_script_generator.pragmas": "import slurm_script_generator.pragmas",
+    "import + create one pragma": (
+        "from slurm_script_generator.pragmas import PragmaFactory; "
+        "PragmaFactory.create_pragma('nodes', 2)"
+    ),
+    "import + build all pragma classes": (
+        "from slurm_script_generator.pragmas import PragmaFactory; "
+        "list(PragmaFactory.pragmas.values())"
+    ),
+}
+
+TIMER = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def time_statement(statement: str) -> float:
+    """Run ``statement`` in a fresh interpreter and return its duration in s."""
+    result = subprocess.run(
+        [sys.executable, "-c", TIMER.format(statement=statement)],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=ENV,
+    )
+    return float(result.stdout)
+
+
+def pragmas_self_time() -> float:
+    """Time spent in the body of the pragmas module itself, in s."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import slurm_script_generator"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=ENV,
+    )
+    for line in result.stderr.splitlines():
+        if line.rstrip().endswith("slurm_script_generator.pragmas"):
+            return int(line.split("|")[0].split(":")[1]) / 1e6
+    raise RuntimeError("slurm_script_generator.pragmas was not imported")
+
+
+def main() -> None:
+    # Warm up the bytecode cache so that compiling does not count.
+    time_statement("import slurm_script_generator")
+
+    for name, statement in STATEMENTS.items():
+        timings = [time_statement(statement) for _ in range(RUNS)]
+        print(f"{name:40s} median {statistics.median(timings) * 1e3:7.2f} ms")
+
+    timings = [pragmas_self_time() for _ in range(RUNS)]
+    print(
+        f"{'pragmas module body (-X importtime)':40s} "
+        f"median {statistics.median(timings) * 1e3:7.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
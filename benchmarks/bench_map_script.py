@@ -0,0 +1,67 @@
+"""Compare read_script and map_script on a script with a huge inlined payload.
+
+Run with ``python benchmarks/bench_map_script.py [SIZE_MB] [DIRECTORY]``.
+SIZE_MB defaults to 500 and DIRECTORY to the system temporary directory. Each
+reader runs in a fresh process, so that its peak resident memory can be told
+apart from that of the other.
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from slurm_script_generator.slurm_script import SlurmScript
+
+
+def measure(reader: str, path: str) -> None:
+    """Run one reader and print its time and the peak resident memory."""
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    script = getattr(SlurmScript, reader)(path)
+    pragmas = len(script.pragmas)
+    elapsed = time.perf_counter() - start
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+    print(
+        f"{reader:12s} {elapsed * 1e3:10.2f} ms  {rss / 1024:8.1f} MB peak RSS"
+        f"  ({pragmas} pragmas)"
+    )
+
+
+def main() -> None:
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    directory = sys.argv[2] if len(sys.argv) > 2 else None
+
+    header = SlurmScript(
+        partition="gpu",
+        account="myacct",
+        nodes=2,
+        ntasks_per_node=4,
+        time="01:00:00",
+        mem="32G",
+        modules=["gcc/12"],
+        custom_commands=["cat > payload.txt << 'EOF'"],
+    ).to_string()
+    line = "x" * 99 + "\n"
+    fd, path = tempfile.mkstemp(suffix=".sh", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(header)
+            block = line * 10_000
+            for _ in range(size_mb * 1024 * 1024 // len(block)):
+                f.write(block)
+            f.write("EOF\n")
+        print(f"{os.path.getsize(path) / 2**20:.0f} MB script")
+        for reader in ("map_script", "read_script"):
+            subprocess.run([sys.executable, __file__, "--measure", reader, path])
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--measure"]:
+        measure(sys.argv[2], sys.argv[3])
+    else:
+        main()
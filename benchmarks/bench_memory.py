@@ -0,0 +1,79 @@
+"""Measure the memory held by a parameter sweep of SlurmScript objects.
+
+Run with ``python benchmarks/bench_memory.py``.
+"""
+
+import gc
+import tracemalloc
+
+from slurm_script_generator.slurm_script import SlurmScript
+
+SCRIPTS = 20_000
+
+
+def build_sweep(n: int) -> list:
+    """A typical sweep: shared resources, a per-point name and time limit."""
+    return [
+        SlurmScript(
+            job_name=f"sweep_{i}",
+            partition="gpu",
+            account="myacct",
+            nodes=2,
+            ntasks_per_node=4,
+            cpus_per_task=8,
+            time=f"0{i % 4}:30:00",
+            mem="32G",
+            hold=True,
+            modules=["gcc/12", "openmpi/4.1"],
+            custom_commands=[f"srun ./bin --point {i}"],
+        )
+        for i in range(n)
+    ]
+
+
+def derive_sweep(n: int) -> list:
+    """The same sweep, derived from one base script."""
+    base = SlurmScript(
+        partition="gpu",
+        account="myacct",
+        nodes=2,
+        ntasks_per_node=4,
+        cpus_per_task=8,
+        mem="32G",
+        hold=True,
+        modules=["gcc/12", "openmpi/4.1"],
+    )
+    return [
+        base.derive(
+            job_name=f"sweep_{i}",
+            time=f"0{i % 4}:30:00",
+            custom_commands=[f"srun ./bin --point {i}"],
+        )
+        for i in range(n)
+    ]
+
+
+def measure(build) -> float:
+    """Bytes held per script by the scripts *build* returns."""
+    # Build once so that caches and lazily created classes do not count.
+    build(10)
+    gc.collect()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    scripts = build(SCRIPTS)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(scripts) == SCRIPTS
+    return (after - before) / SCRIPTS
+
+
+def main() -> None:
+    print(f"{SCRIPTS} scripts, 9 pragmas each")
+    print(f"constructor {measure(build_sweep):10.0f} bytes per script")
+    print(f"derive      {measure(derive_sweep):10.0f} bytes per script")
+
+
+if __name__ == "__main__":
+    main()
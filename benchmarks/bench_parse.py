@@ -0,0 +1,77 @@
+"""Measure how fast batch scripts are parsed.
+
+Run with ``python benchmarks/bench_parse.py``. Scripts of several thousand
+lines are parsed from a string, from an open file and by the tokenizer alone.
+"""
+
+import os
+import tempfile
+import time
+
+from slurm_script_generator.slurm_script import SlurmScript
+from slurm_script_generator.tokenizer import tokenize
+
+REPEATS = 20
+
+
+def make_script(lines: int) -> str:
+    """A script with pragmas, modules, comments and mostly commands."""
+    out = ["#!/bin/bash"]
+    out += [
+        "#SBATCH --job-name=bench",
+        "#SBATCH --nodes=2 # two nodes",
+        "#SBATCH --ntasks-per-node 4",
+        "#SBATCH --time=01:00:00",
+        "#SBATCH --hold",
+        "#SBATCH --frobnicate=1",
+    ]
+    out += ["module purge", "module load gcc/12 openmpi/4.1 # compilers"]
+    while len(out) < lines:
+        i = len(out)
+        if i % 10 == 0:
+            out.append(f"# step {i}")
+        elif i % 10 == 1:
+            out.append("")
+        else:
+            out.append(f'    srun --exclusive -n 4 ./bin --step {i} >> "run_{i}.out"')
+    return "\n".join(out) + "\n"
+
+
+def rate(func, lines: int) -> float:
+    """Lines per second of the fastest of REPEATS calls."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return lines / best
+
+
+def main() -> None:
+    for lines in (1_000, 10_000, 100_000):
+        text = make_script(lines)
+        fd, path = tempfile.mkstemp(suffix=".sh")
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        try:
+
+            def from_file():
+                with open(path) as f:
+                    SlurmScript.from_lines(f)
+
+            results = {
+                "from_script": rate(lambda: SlurmScript.from_script(text), lines),
+                "from_lines(file)": rate(from_file, lines),
+                "tokenize": rate(
+                    lambda: sum(1 for _ in tokenize(text.splitlines())), lines
+                ),
+            }
+        finally:
+            os.unlink(path)
+        print(f"{lines:7d} lines")
+        for name, value in results.items():
+            print(f"    {name:18s} {value / 1e6:6.2f} M lines/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Compare reading scripts with and without a ParseCache.
+
+Run with ``python benchmarks/bench_parse_cache.py``.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+from slurm_script_generator.parse_cache import ParseCache
+from slurm_script_generator.slurm_script import SlurmScript
+
+SCRIPTS = 1000
+COMMANDS = 200
+
+
+def main() -> None:
+    base = SlurmScript(
+        partition="gpu",
+        account="myacct",
+        nodes=2,
+        ntasks_per_node=4,
+        cpus_per_task=8,
+        time="01:00:00",
+        mem="32G",
+        output="run.out",
+        error="run.err",
+        modules=["gcc/12", "openmpi/4.1"],
+    )
+    directory = tempfile.mkdtemp()
+    try:
+        paths = []
+        for i in range(SCRIPTS):
+            path = os.path.join(directory, f"job_{i}.sh")
+            base.derive(
+                job_name=f"job_{i}",
+                custom_commands=[f"srun ./bin {i} {j}" for j in range(COMMANDS)],
+            ).save(path)
+            paths.append(path)
+        # Scripts modified just now are hashed on every read (see ParseCache).
+        an_hour_ago = time.time() - 3600
+        for path in paths:
+            os.utime(path, (an_hour_ago, an_hour_ago))
+
+        start = time.perf_counter()
+        for path in paths:
+            SlurmScript.read_script(path)
+        elapsed = time.perf_counter() - start
+        print(f"no cache      {elapsed / SCRIPTS * 1e6:8.1f} us/script")
+
+        cache = ParseCache(os.path.join(directory, "cache"))
+        for label in ("cold cache", "warm cache"):
+            start = time.perf_counter()
+            for path in paths:
+                SlurmScript.read_script(path, cache=cache)
+            elapsed = time.perf_counter() - start
+            print(f"{label}    {elapsed / SCRIPTS * 1e6:8.1f} us/script")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
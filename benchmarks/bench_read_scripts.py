@@ -0,0 +1,63 @@
+"""Measure how read_scripts scales with the number of worker processes.
+
+Run with ``python benchmarks/bench_read_scripts.py [DIRECTORY]``. The scripts
+are written to a temporary directory under DIRECTORY, by default /dev/shm
+(tmpfs), so that the parser rather than the disk is measured.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from slurm_script_generator.slurm_script import SlurmScript
+from slurm_script_generator.writers import save_many
+
+SCRIPTS = 20_000
+
+
+def main() -> None:
+    root = sys.argv[1] if len(sys.argv) > 1 else "/dev/shm"
+    base = SlurmScript(
+        partition="gpu",
+        account="myacct",
+        nodes=2,
+        ntasks_per_node=4,
+        cpus_per_task=8,
+        time="01:00:00",
+        mem="32G",
+        modules=["gcc/12", "openmpi/4.1"],
+    )
+    scripts = (
+        base.derive(
+            job_name=f"job_{i}",
+            custom_commands=[f"srun ./bin {i} {j}" for j in range(20)],
+        )
+        for i in range(SCRIPTS)
+    )
+
+    directory = tempfile.mkdtemp(dir=root)
+    try:
+        save_many(scripts, os.path.join(directory, "job_{index:05d}.sh"))
+        pattern = os.path.join(directory, "*.sh")
+        print(f"{os.cpu_count()} CPUs")
+
+        start = time.perf_counter()
+        for path in sorted(os.listdir(directory)):
+            SlurmScript.read_script(os.path.join(directory, path))
+        elapsed = time.perf_counter() - start
+        print(f"read_script loop  {SCRIPTS / elapsed:8.0f} scripts/s")
+
+        for workers in (1, 2, 4, 8, 16):
+            start = time.perf_counter()
+            count = sum(1 for _ in SlurmScript.read_scripts(pattern, workers))
+            elapsed = time.perf_counter() - start
+            assert count == SCRIPTS
+            print(f"{workers:2d} workers        {SCRIPTS / elapsed:8.0f} scripts/s")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
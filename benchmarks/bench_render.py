@@ -0,0 +1,44 @@
+"""Measure how fast scripts are rendered to text.
+
+Run with ``python benchmarks/bench_render.py``.
+"""
+
+import time
+
+from slurm_script_generator.slurm_script import SlurmScript
+
+SCRIPTS = 100_000
+
+
+def build_sweep(n: int) -> list:
+    return [
+        SlurmScript(
+            job_name=f"sweep_{i}",
+            partition="gpu",
+            account="myacct",
+            nodes=2,
+            ntasks_per_node=4,
+            cpus_per_task=8,
+            time=f"0{i % 4}:30:00",
+            mem="32G",
+            hold=True,
+            modules=["gcc/12", "openmpi/4.1"],
+            custom_commands=[f"srun ./bin --point {i}"],
+        )
+        for i in range(n)
+    ]
+
+
+def main() -> None:
+    scripts = build_sweep(SCRIPTS)
+
+    start = time.perf_counter()
+    for script in scripts:
+        script.generate_script(include_header=True)
+    elapsed = time.perf_counter() - start
+    print(f"rendered {SCRIPTS} scripts in {elapsed:.2f} s")
+    print(f"{elapsed * 1e6 / SCRIPTS:.2f} us/script")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Measure how save_many scales with the number of threads.
+
+Run with ``python benchmarks/bench_save_many.py [DIRECTORY]``. The directory
+defaults to /dev/shm (tmpfs), which shows the overhead of the writer itself;
+run it on a parallel filesystem to see the effect of file open/close latency.
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+
+from slurm_script_generator.slurm_script import SlurmScript
+from slurm_script_generator.writers import save_many
+
+SCRIPTS = 10_000
+
+
+def main() -> None:
+    root = sys.argv[1] if len(sys.argv) > 1 else "/dev/shm"
+    base = SlurmScript(
+        partition="gpu",
+        account="myacct",
+        nodes=2,
+        ntasks_per_node=4,
+        cpus_per_task=8,
+        time="01:00:00",
+        mem="32G",
+        modules=["gcc/12", "openmpi/4.1"],
+    )
+    scripts = [
+        base.derive(job_name=f"sweep_{i}", custom_commands=[f"srun ./bin {i}"])
+        for i in range(SCRIPTS)
+    ]
+
+    directory = tempfile.mkdtemp(dir=root)
+    try:
+        start = time.perf_counter()
+        for i, script in enumerate(scripts):
+            script.save(f"{directory}/save_{i}.sh")
+        elapsed = time.perf_counter() - start
+        print(f"save() loop    {SCRIPTS / elapsed:8.0f} scripts/s")
+
+        for workers in (1, 2, 4, 8, 16):
+            start = time.perf_counter()
+            save_many(scripts, f"{directory}/{workers}_{{index}}.sh", workers)
+            elapsed = time.perf_counter() - start
+            print(f"{workers:2d} workers     {SCRIPTS / elapsed:8.0f} scripts/s")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compare SlurmScript.sweep with a loop around the constructor.
+
+Run with ``python benchmarks/bench_sweep.py``.
+"""
+
+import gc
+import itertools
+import time
+import tracemalloc
+
+from slurm_script_generator.slurm_script import SlurmScript
+
+GRID = {
+    "nodes": [1, 2, 4, 8, 16],
+    "time": ["00:30:00", "01:00:00", "02:00:00", "04:00:00"],
+    "lr": [0.1, 0.03, 0.01, 0.003, 0.001],
+    "seed": list(range(200)),
+}
+COMMAND = "srun ./train --lr {lr} --seed {seed}"
+SHARED = dict(
+    partition="gpu",
+    account="myacct",
+    ntasks_per_node=4,
+    cpus_per_task=8,
+    mem="32G",
+    modules=["gcc/12", "openmpi/4.1"],
+)
+
+
+def constructor_loop() -> int:
+    scripts = []
+    for nodes, time_, lr, seed in itertools.product(*GRID.values()):
+        script = SlurmScript(
+            nodes=nodes,
+            time=time_,
+            custom_commands=[COMMAND.format(lr=lr, seed=seed)],
+            **SHARED,
+        )
+        scripts.append(script)
+    for script in scripts:
+        script.generate_script()
+    return len(scripts)
+
+
+def sweep() -> int:
+    base = SlurmScript(custom_commands=[COMMAND], **SHARED)
+    count = 0
+    for point in base.sweep(GRID):
+        point.script.generate_script()
+        count += 1
+    return count
+
+
+def main() -> None:
+    for run in (constructor_loop, sweep):
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        count = run()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(
+            f"{run.__name__:<17} {count} scripts in {elapsed:.2f} s,"
+            f" peak {peak / 2**20:.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Compare a compiled template with generate_script for many variants.
+
+Run with ``python benchmarks/bench_template.py``.
+"""
+
+import time
+
+from slurm_script_generator.slurm_script import SlurmScript
+
+VARIANTS = 100_000
+
+
+def main() -> None:
+    base = SlurmScript(
+        job_name="sweep",
+        partition="gpu",
+        account="myacct",
+        nodes=2,
+        ntasks_per_node=4,
+        cpus_per_task=8,
+        time="01:00:00",
+        mem="32G",
+        modules=["gcc/12", "openmpi/4.1"],
+        custom_commands=["srun ./bin --point {point}"],
+    )
+
+    start = time.perf_counter()
+    for i in range(VARIANTS):
+        script = base.derive(
+            job_name=f"sweep_{i}",
+            time=f"0{i % 4}:30:00",
+            custom_commands=[f"srun ./bin --point {i}"],
+        )
+        script.generate_script(include_header=True)
+    full = time.perf_counter() - start
+
+    template = base.compile_template(["job_name", "time", "point"], include_header=True)
+    start = time.perf_counter()
+    for i in range(VARIANTS):
+        template.render(job_name=f"sweep_{i}", time=f"0{i % 4}:30:00", point=i)
+    compiled = time.perf_counter() - start
+
+    print(f"generate_script   {full * 1e6 / VARIANTS:6.2f} us/variant")
+    print(f"compiled template {compiled * 1e6 / VARIANTS:6.2f} us/variant")
+    print(f"speed-up          {full / compiled:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Measure how long screening a sweep for invalid option combinations takes.
+
+Run with ``python benchmarks/bench_validation.py``.
+"""
+
+import time
+
+from slurm_script_generator.slurm_script import SlurmScript
+from slurm_script_generator.validation import validate_scripts
+
+SCRIPTS = 50_000
+
+
+def main() -> None:
+    scripts = [
+        SlurmScript(
+            job_name=f"sweep_{i}",
+            partition="gpu",
+            nodes=1 + i % 4,
+            ntasks=16 * (1 + i % 5),
+            ntasks_per_node=16,
+            cpus_per_task=4,
+            time=f"{1 + i % 12}:00:00",
+            mem="64G",
+            # Every hundredth point asks for memory twice.
+            mem_per_cpu="2G" if i % 100 == 0 else None,
+        )
+        for i in range(SCRIPTS)
+    ]
+
+    start = time.perf_counter()
+    diagnostics = validate_scripts(scripts)
+    elapsed = time.perf_counter() - start
+
+    flagged = sum(1 for found in diagnostics if found)
+    print(f"validated {SCRIPTS} scripts in {elapsed * 1e3:.0f} ms")
+    print(f"{flagged} scripts have problems")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ from slurm_script_generator.squeue import (
     job_state,
     job_states,
 )
+from slurm_script_generator.writers import save_many
 
 __all__ = [
     "SlurmScript",
@@ -18,4 +19,5 @@ __all__ = [
     "SAcctJob",
     "job_state",
     "job_states",
+    "save_many",
 ]
@@ -0,0 +1,243 @@
+"""Compact binary encoding of scripts.
+
+A script is encoded as::
+
+    version  n_pragmas  pragma*  n_modules  string*  n_commands  string*
+
+with every count a varint. A pragma is its id followed by its value, where the
+id is the position of its class in ``pragmas_ordered`` plus one. Id 0 stands
+for an :class:`~slurm_script_generator.pragmas.UnknownPragma` and is followed
+by its raw flag. Strings are stored as varint length plus UTF-8 bytes.
+
+The ids depend on the order of the spec table, so :data:`FORMAT_VERSION` must
+be raised whenever options are reordered or removed.
+
+Many encoded scripts can be stored in one file (see :func:`write_records`),
+each prefixed with its length so that the file can be read sequentially.
+"""
+
+import json
+from typing import IO, Any, Dict, Iterable, Iterator, List, Tuple
+
+from slurm_script_generator.pragmas import PragmaFactory
+
+FORMAT_VERSION = 1
+# Start of a file of records, followed by FORMAT_VERSION as one byte.
+FILE_MAGIC = b"SSGB"
+
+_TRUE, _FALSE, _STR, _INT, _JSON = range(5)
+
+_KEYS: List[str] = list(PragmaFactory.pragmas)
+_IDS: Dict[str, int] = {key: i + 1 for i, key in enumerate(_KEYS)}
+
+
+def _put_varint(out: bytearray, number: int) -> None:
+    while number > 0x7F:
+        out.append((number & 0x7F) | 0x80)
+        number >>= 7
+    out.append(number)
+
+
+def _get_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    number = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        number |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return number, pos
+        shift += 7
+
+
+def _put_str(out: bytearray, text: str) -> None:
+    encoded = text.encode()
+    _put_varint(out, len(encoded))
+    out += encoded
+
+
+def _get_str(data: bytes, pos: int) -> Tuple[str, int]:
+    length, pos = _get_varint(data, pos)
+    end = pos + length
+    if end > len(data):
+        raise ValueError("Truncated record")
+    return data[pos:end].decode(), end
+
+
+def _put_value(out: bytearray, value: Any) -> None:
+    if value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif isinstance(value, str):
+        out.append(_STR)
+        _put_str(out, value)
+    elif isinstance(value, int):
+        out.append(_INT)
+        # Zigzag, so that small negative numbers stay small.
+        _put_varint(out, value << 1 if value >= 0 else (~value << 1) | 1)
+    else:
+        # Rare values such as the list argparse makes of `--nodelist a b`.
+        out.append(_JSON)
+        _put_str(out, json.dumps(value))
+
+
+def _get_value(data: bytes, pos: int) -> Tuple[Any, int]:
+    tag = data[pos]
+    pos += 1
+    if tag == _STR:
+        return _get_str(data, pos)
+    if tag == _TRUE:
+        return True, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _INT:
+        number, pos = _get_varint(data, pos)
+        return (number >> 1) if not number & 1 else ~(number >> 1), pos
+    if tag == _JSON:
+        text, pos = _get_str(data, pos)
+        return json.loads(text), pos
+    raise ValueError(f"Unknown value tag {tag} at byte {pos - 1}")
+
+
+def encode(data: Dict[str, Any]) -> bytes:
+    """Encode the dict form of a script (see ``SlurmScript.to_dict``).
+
+    Args:
+        data: Dict with keys 'pragmas', 'modules' and 'custom_commands'.
+
+    Returns:
+        The encoded script.
+    """
+    out = bytearray()
+    _put_varint(out, FORMAT_VERSION)
+    pragmas = data.get("pragmas", {})
+    _put_varint(out, len(pragmas))
+    for key, value in pragmas.items():
+        pragma_id = _IDS.get(key, 0)
+        _put_varint(out, pragma_id)
+        if pragma_id == 0:
+            _put_str(out, key)
+        _put_value(out, value)
+    for section in ("modules", "custom_commands"):
+        lines = data.get(section, [])
+        _put_varint(out, len(lines))
+        for line in lines:
+            _put_str(out, line)
+    return bytes(out)
+
+
+def decode(data: bytes) -> Dict[str, Any]:
+    """Decode a script encoded with :func:`encode`.
+
+    Args:
+        data: The encoded script.
+
+    Returns:
+        Dict with keys 'pragmas', 'modules' and 'custom_commands'.
+
+    Raises:
+        ValueError: If the data was written by another format version, or is
+            truncated or damaged.
+    """
+    try:
+        return _decode(data)
+    except IndexError:
+        # A varint or value tag that runs past the end of the data.
+        raise ValueError("Truncated record") from None
+
+
+def _decode(data: bytes) -> Dict[str, Any]:
+    version, pos = _get_varint(data, 0)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported binary format version {version}")
+
+    count, pos = _get_varint(data, pos)
+    pragmas = {}
+    for _ in range(count):
+        pragma_id, pos = _get_varint(data, pos)
+        if pragma_id == 0:
+            key, pos = _get_str(data, pos)
+        elif pragma_id <= len(_KEYS):
+            key = _KEYS[pragma_id - 1]
+        else:
+            raise ValueError(f"Unknown pragma id {pragma_id}")
+        pragmas[key], pos = _get_value(data, pos)
+
+    result: Dict[str, Any] = {"pragmas": pragmas}
+    for section in ("modules", "custom_commands"):
+        count, pos = _get_varint(data, pos)
+        lines = []
+        for _ in range(count):
+            length = data[pos]
+            if length < 0x80:
+                # Lines shorter than 128 bytes, i.e. nearly all of them, have
+                # a one-byte length: skip the varint loop.
+                pos += 1 + length
+                if pos > len(data):
+                    raise ValueError("Truncated record")
+                lines.append(data[pos - length : pos].decode())
+            else:
+                line, pos = _get_str(data, pos)
+                lines.append(line)
+        result[section] = lines
+    return result
+
+
+def write_records(fp: IO[bytes], records: Iterable[bytes]) -> int:
+    """Write encoded scripts to a binary file, one after the other.
+
+    Args:
+        fp: A file opened for binary writing.
+        records: The encoded scripts.
+
+    Returns:
+        The number of records written.
+    """
+    fp.write(FILE_MAGIC + bytes([FORMAT_VERSION]))
+    count = 0
+    header = bytearray()
+    for record in records:
+        header.clear()
+        _put_varint(header, len(record))
+        fp.write(header)
+        fp.write(record)
+        count += 1
+    return count
+
+
+def iter_records(fp: IO[bytes]) -> Iterator[bytes]:
+    """Read the encoded scripts of a file written by :func:`write_records`.
+
+    Records are read one at a time, so memory use does not grow with the
+    size of the file.
+
+    Args:
+        fp: A file opened for binary reading.
+
+    Yields:
+        The encoded scripts, in the order they were written.
+
+    Raises:
+        ValueError: If the file is not a record file or is truncated.
+    """
+    header = fp.read(len(FILE_MAGIC) + 1)
+    if header[:-1] != FILE_MAGIC:
+        raise ValueError("Not a file of binary encoded scripts")
+    if header[-1] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported binary format version {header[-1]}")
+    while True:
+        length = shift = 0
+        while True:
+            byte = fp.read(1)
+            if not byte:
+                if shift:
+                    raise ValueError("Truncated record header")
+                return
+            length |= (byte[0] & 0x7F) << shift
+            if byte[0] < 0x80:
+                break
+            shift += 7
+        record = fp.read(length)
+        if len(record) != length:
+            raise ValueError("Truncated record")
+        yield record
@@ -0,0 +1,315 @@
+"""Bundles: many rendered scripts in one tar or zip archive.
+
+Parallel filesystems cope badly with many small files, so
+:func:`write_bundle` streams scripts into a single archive instead. Its last
+member, :data:`INDEX_NAME`, lists the name, SHA-256 and data offset of every
+script. :class:`Bundle` reads that index from the end of the archive, then
+reads, extracts or submits single scripts without reading the others.
+
+Tar bundles are written uncompressed so that members can be read at their
+offset; zip bundles are deflated.
+"""
+
+import hashlib
+import io
+import itertools
+import json
+import os
+import posixpath
+import subprocess
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    from slurm_script_generator.slurm_script import SlurmScript
+
+INDEX_NAME = ".bundle-index.json"
+INDEX_VERSION = 1
+
+BundleFormat = Literal["tar", "zip"]
+
+
+class BundleEntry(NamedTuple):
+    """One script in a bundle."""
+
+    name: str
+    sha256: str
+    # Offset of the data in a tar bundle, of the local header in a zip bundle.
+    offset: int
+    size: int
+
+
+def _bundle_format(
+    path: str | Path, archive_format: BundleFormat | None
+) -> BundleFormat:
+    if archive_format is not None:
+        if archive_format not in ("tar", "zip"):
+            raise ValueError(f"Unknown bundle format: {archive_format}")
+        return archive_format
+    return "zip" if os.fspath(path).endswith(".zip") else "tar"
+
+
+def _check_name(name: str, seen: set) -> None:
+    normalized = posixpath.normpath(name)
+    if (
+        name == INDEX_NAME
+        or normalized != name
+        or normalized.startswith(("/", "../"))
+        or normalized == ".."
+    ):
+        raise ValueError(f"Invalid bundle member name: '{name}'")
+    if name in seen:
+        raise ValueError(f"Duplicate bundle member name: '{name}'")
+    seen.add(name)
+
+
+def write_bundle(
+    scripts: Iterable["SlurmScript"],
+    path: str | Path,
+    names: Iterable[str] | str = "job_{index:05d}.sh",
+    archive_format: BundleFormat | None = None,
+    include_header: bool = True,
+) -> List[BundleEntry]:
+    """Write rendered scripts into one tar or zip archive, with an index.
+
+    Scripts are rendered and written one at a time, so any number of them
+    can be bundled.
+
+    Args:
+        scripts: The scripts to bundle.
+        path: The archive to create.
+        names: One member name per script, or a pattern formatted with the
+            index of each script.
+        archive_format: "tar" or "zip"; by default "zip" for a ``.zip`` path and
+            "tar" otherwise.
+        include_header: Whether to include the script header.
+
+    Returns:
+        The index entries of the scripts, in order.
+
+    Raises:
+        ValueError: If a name is not a plain relative path, is used twice, or
+            there are fewer or more names than scripts.
+    """
+    if isinstance(names, str):
+        pattern = names
+        named = zip(scripts, (pattern.format(index=i) for i in itertools.count()))
+    else:
+        named = zip(scripts, names, strict=True)
+    archive_format = _bundle_format(path, archive_format)
+    entries = []
+    seen: set = set()
+    mtime = int(time.time())
+
+    def members() -> Iterator[Tuple[str, bytes]]:
+        for script, name in named:
+            _check_name(name, seen)
+            yield name, script.to_string(include_header=include_header).encode()
+
+    if archive_format == "zip":
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name, data in members():
+                archive.writestr(name, data)
+                offset = archive.infolist()[-1].header_offset
+                sha256 = hashlib.sha256(data).hexdigest()
+                entries.append(BundleEntry(name, sha256, offset, len(data)))
+            archive.writestr(INDEX_NAME, _index_bytes(entries))
+    else:
+        with tarfile.open(path, "w") as archive:
+            for name, data in members():
+                info = _tar_info(name, len(data), mtime)
+                header = info.tobuf(archive.format, archive.encoding, archive.errors)
+                offset = archive.offset + len(header)
+                archive.addfile(info, io.BytesIO(data))
+                sha256 = hashlib.sha256(data).hexdigest()
+                entries.append(BundleEntry(name, sha256, offset, len(data)))
+            index = _index_bytes(entries)
+            archive.addfile(_tar_info(INDEX_NAME, len(index), mtime), io.BytesIO(index))
+    return entries
+
+
+def _tar_info(name: str, size: int, mtime: int) -> tarfile.TarInfo:
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = mtime
+    info.mode = 0o644
+    return info
+
+
+def _index_bytes(entries: List[BundleEntry]) -> bytes:
+    index = {
+        "version": INDEX_VERSION,
+        "members": [entry._asdict() for entry in entries],
+    }
+    return json.dumps(index).encode()
+
+
+def _read_tar_index(fp: io.BufferedReader) -> bytes:
+    """Find the index, the last member of a tar bundle, from the end.
+
+    Headers start on 512-byte blocks, so the blocks before the end-of-archive
+    padding are tried as headers, reading backwards in chunks, until the one
+    of the index is found.
+    """
+    block_size = tarfile.BLOCKSIZE
+    end = fp.seek(0, os.SEEK_END)
+    # The chunks read so far, last first; chunks hold whole blocks, so each
+    # header is read from a single chunk and they are only joined once the
+    # index is found.
+    chunks: List[bytes] = []
+    chunk_end = end - end % block_size
+    while chunk_end > 0:
+        chunk_start = max(0, chunk_end - 256 * block_size)
+        fp.seek(chunk_start)
+        chunk = fp.read(chunk_end - chunk_start)
+        chunks.append(chunk)
+        for offset in range(len(chunk) - block_size, -1, -block_size):
+            block = chunk[offset : offset + block_size]
+            if not any(block):
+                continue
+            try:
+                info = tarfile.TarInfo.frombuf(block, "utf-8", "surrogateescape")
+            except tarfile.HeaderError:
+                continue
+            if info.name == INDEX_NAME:
+                tail = b"".join(reversed(chunks))
+                data_start = offset + block_size
+                return tail[data_start : data_start + info.size]
+        chunk_end = chunk_start
+    raise ValueError("Not a bundle: no index found")
+
+
+class Bundle:
+    """Read access to a bundle written by :func:`write_bundle`.
+
+    Only the index is read when the bundle is opened; each script is read
+    from its offset when it is asked for.
+
+    Args:
+        path: The archive to open.
+
+    Raises:
+        ValueError: If the archive has no index.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._fp = open(path, "rb")
+        try:
+            if zipfile.is_zipfile(self._fp):
+                self._zip: zipfile.ZipFile | None = zipfile.ZipFile(self._fp)
+                try:
+                    index = self._zip.read(INDEX_NAME)
+                except KeyError:
+                    raise ValueError("Not a bundle: no index found") from None
+            else:
+                self._zip = None
+                index = _read_tar_index(self._fp)
+            data = json.loads(index)
+            if data.get("version") != INDEX_VERSION:
+                raise ValueError(f"Unsupported bundle version {data.get('version')}")
+            self.entries: Dict[str, BundleEntry] = {}
+            seen: set = set()
+            for member in data["members"]:
+                # The index may come from anywhere: its names must not lead
+                # extract() outside of its directory.
+                _check_name(member["name"], seen)
+                self.entries[member["name"]] = BundleEntry(**member)
+        except BaseException:
+            self._fp.close()
+            raise
+
+    def __enter__(self) -> "Bundle":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the archive."""
+        if self._zip is not None:
+            self._zip.close()
+        self._fp.close()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.entries
+
+    def read(self, name: str) -> bytes:
+        """Read one script.
+
+        Args:
+            name: The member name.
+
+        Returns:
+            The rendered script.
+
+        Raises:
+            KeyError: If there is no such member.
+            ValueError: If the member does not match its index entry.
+        """
+        entry = self.entries[name]
+        if self._zip is not None:
+            data = self._zip.read(name)
+        else:
+            self._fp.seek(entry.offset)
+            data = self._fp.read(entry.size)
+        if hashlib.sha256(data).hexdigest() != entry.sha256:
+            raise ValueError(f"Bundle member '{name}' does not match its index")
+        return data
+
+    def extract(self, name: str, directory: str | Path = ".") -> Path:
+        """Write one script to a file.
+
+        Args:
+            name: The member name.
+            directory: The directory to extract into; subdirectories in the
+                name are created.
+
+        Returns:
+            The path of the extracted script.
+        """
+        path = Path(directory, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self.read(name))
+        return path
+
+    def submit(self, name: str, verbose: bool = False) -> int:
+        """Submit one script with sbatch, passing it on standard input.
+
+        Args:
+            name: The member name.
+            verbose: Whether to print sbatch's output.
+
+        Returns:
+            The job id.
+
+        Raises:
+            RuntimeError: If sbatch fails to submit the job.
+        """
+        if verbose:
+            print(f"Submitting job with sbatch: {self.path}:{name}")
+        result = subprocess.run(["sbatch"], input=self.read(name), capture_output=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"sbatch failed: {result.stderr.decode().strip()}")
+        stdout = result.stdout.decode().strip()
+        if verbose:
+            print(stdout)
+        return int(stdout.split()[-1])
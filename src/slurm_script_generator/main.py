@@ -1,7 +1,12 @@
 import argparse
+import os
+import posixpath
+from typing import Iterable, List
 
 import slurm_script_generator.pragmas as pragmas
+from slurm_script_generator.parse_cache import ParseCache, default_cache_dir
 from slurm_script_generator.slurm_script import SlurmScript
+from slurm_script_generator.writers import save_many
 
 
 def add_misc_options(parser: argparse.ArgumentParser) -> None:
@@ -45,7 +50,7 @@ def add_misc_options(parser: argparse.ArgumentParser) -> None:
         type=str,
         default=None,
         metavar="INPUT_PATH",
-        help="path to input json file",
+        help="path to input json file, or to a JSON Lines (.jsonl) manifest to generate one script per record (--output-path is then a pattern such as 'job_{index}.sh')",
     )
 
     parser.add_argument(
@@ -57,6 +62,14 @@ def add_misc_options(parser: argparse.ArgumentParser) -> None:
         help="path to save the generated SLURM script",
     )
 
+    parser.add_argument(
+        "--bundle",
+        dest="bundle",
+        type=str,
+        default=None,
+        metavar="BUNDLE_PATH",
+        help="write the generated script into a tar or zip (.zip) archive with an index, named after --output-path if given",
+    )
     parser.add_argument(
         "--export-json",
         dest="export_json",
@@ -94,6 +107,17 @@ def add_misc_options(parser: argparse.ArgumentParser) -> None:
         help="Path to a slurm script file to read and include pragmas and commands from (e.g. --read-script sbatch_script.sh)",
     )
 
+    parser.add_argument(
+        "--parse-cache",
+        dest="parse_cache",
+        type=str,
+        nargs="?",
+        const=default_cache_dir(),
+        default=None,
+        metavar="DIRECTORY",
+        help="Cache parsed --read-script scripts on disk, so that an unchanged script is not parsed again (e.g. --parse-cache; without DIRECTORY, slurm-script-generator/parse under $XDG_CACHE_HOME or ~/.cache is used)",
+    )
+
     parser.add_argument(
         "--inline-script",
         dest="inlined_script",
@@ -147,37 +171,28 @@ def main():
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
 
-    pragma_dict = {}
-
-    # Add each pragma as an argument to the parser
-    for _, pragma_cls in pragmas.__dict__.items():
-        if (
-            isinstance(pragma_cls, type)
-            and issubclass(pragma_cls, pragmas.Pragma)
-            and pragma_cls != pragmas.Pragma
-            # Skip helpers that carry no flags of their own (UnknownPragma).
-            and pragma_cls.flags
-        ):
-            # print(f"{pragma_cls = }")
-            pragma_dict[pragma_cls.dest] = pragma_cls
-            if pragma_cls.action is None:
+    # Add each pragma as an argument to the parser. The specs carry everything
+    # argparse needs, so no pragma class is built just to describe it.
+    for specs in pragmas.PRAGMA_SPECS.values():
+        for spec in specs:
+            if spec.action is None:
                 parser.add_argument(
-                    *pragma_cls.flags,
-                    dest=pragma_cls.arg_varname,
-                    metavar=pragma_cls.metavar,
-                    help=pragma_cls.help,
-                    type=pragma_cls.type,
-                    nargs=pragma_cls.nargs,
-                    choices=pragma_cls.choices,
-                    default=pragma_cls.default,
+                    *spec.flags,
+                    dest=spec.arg_varname,
+                    metavar=spec.metavar,
+                    help=spec.help,
+                    type=spec.type,
+                    nargs=spec.nargs,
+                    choices=spec.choices,
+                    default=spec.default,
                 )
             else:
                 parser.add_argument(
-                    *pragma_cls.flags,
-                    dest=pragma_cls.arg_varname,
-                    help=pragma_cls.help,
-                    action=pragma_cls.action,
-                    default=pragma_cls.default,
+                    *spec.flags,
+                    dest=spec.arg_varname,
+                    help=spec.help,
+                    action=spec.action,
+                    default=spec.default,
                 )
 
     # Add the other options
@@ -190,31 +205,27 @@ def main():
     path_json_out = sbatch_args.export_json
     path_json_in = sbatch_args.input
     path_out = sbatch_args.output_path
+    path_bundle = sbatch_args.bundle
     delattr(sbatch_args, "export_json")
     delattr(sbatch_args, "input")
     delattr(sbatch_args, "output_path")
+    delattr(sbatch_args, "bundle")
 
     # Extract the no_header flag
     no_header = sbatch_args.no_header
     submit = sbatch_args.submit
     read_script = sbatch_args.read_script
+    parse_cache = sbatch_args.parse_cache
     delattr(sbatch_args, "no_header")
     delattr(sbatch_args, "submit")
     delattr(sbatch_args, "read_script")
-
-    # If a JSON input path is provided, load the SlurmScript from that JSON file.
-    # Otherwise, create a new SlurmScript instance.
-    if path_json_in is not None:
-        slurm_script = SlurmScript.from_json(path=path_json_in)
-    elif read_script is not None:
-        slurm_script = SlurmScript.read_script(path=read_script)
-    else:
-        slurm_script = SlurmScript()
+    delattr(sbatch_args, "parse_cache")
 
     # Convert the remaining arguments to pragmas or other SlurmScript parameters
+    pragma_values = {}
+    params = {}
     for arg_varname in vars(sbatch_args):
         value = getattr(sbatch_args, arg_varname)
-        # print(f"Processing argument {arg_varname} with value {value}")
         if value is None:
             continue
         if value is False:
@@ -222,13 +233,39 @@ def main():
         if isinstance(value, list) and len(value) == 0:
             continue
         if pragmas.PragmaFactory.is_valid_pragma_key(arg_varname):
-            pragma = pragmas.PragmaFactory.create_pragma(
-                key=arg_varname,
-                value=value,
-            )
-            slurm_script.add_pragma(pragma=pragma)
+            pragma_values[arg_varname] = value
         else:
-            slurm_script.add_param(arg_varname, value)
+            params[arg_varname] = value
+    pragma_list = pragmas.PragmaFactory.create_many(pragma_values)
+
+    def customize(slurm_script: SlurmScript) -> SlurmScript:
+        for key, value in params.items():
+            slurm_script.add_param(key, value)
+        slurm_script.add_pragmas(pragma_list)
+        return slurm_script
+
+    if path_json_in is not None and path_json_in.endswith(".jsonl"):
+        scripts = map(customize, SlurmScript.iter_jsonl(path_json_in))
+        generate_many(
+            scripts,
+            path_out=path_out,
+            path_bundle=path_bundle,
+            path_json_out=path_json_out,
+            include_header=not no_header,
+            submit=submit,
+        )
+        return
+
+    # If a JSON input path is provided, load the SlurmScript from that JSON file.
+    # Otherwise, create a new SlurmScript instance.
+    if path_json_in is not None:
+        slurm_script = SlurmScript.from_json(path=path_json_in)
+    elif read_script is not None:
+        cache = None if parse_cache is None else ParseCache(parse_cache)
+        slurm_script = SlurmScript.read_script(path=read_script, cache=cache)
+    else:
+        slurm_script = SlurmScript()
+    customize(slurm_script)
 
     if path_json_out is not None:
         slurm_script.to_json(path=path_json_out)
@@ -238,11 +275,149 @@ def main():
             print("Error: --submit requires --output-path to be specified")
         else:
             slurm_script.submit_job(path=path_out)
+    elif path_bundle:
+        write_bundle_or_exit(
+            [slurm_script],
+            path_bundle,
+            names=[member_name(path_out)] if path_out else "job_{index:05d}.sh",
+            include_header=not no_header,
+        )
     elif path_out:
         slurm_script.save(path=path_out, include_header=not no_header)
     else:
         print(slurm_script.to_string(include_header=not no_header))
 
 
+def member_name(path: str) -> str:
+    """Turn an --output-path into the name of a bundle member.
+
+    Parameters
+    ----------
+    path : str
+        The path, or path pattern, given on the command line.
+
+    Returns
+    -------
+    str
+        The path relative to the bundle root: normalized, and reduced to its
+        file name if it is absolute or leads out of the current directory.
+
+    """
+    name = posixpath.normpath(path.replace(os.sep, "/"))
+    if name.startswith("/") or name == ".." or name.startswith("../"):
+        name = posixpath.basename(name)
+    return name
+
+
+def write_bundle_or_exit(
+    scripts: Iterable[SlurmScript],
+    path: str,
+    names: List[str] | str,
+    include_header: bool,
+) -> None:
+    """Write scripts to a bundle, exiting with an error message on bad names.
+
+    Parameters
+    ----------
+    scripts : iterable of SlurmScript
+        The scripts to write.
+    path : str
+        Path of the archive.
+    names : list of str or str
+        Member names, or a pattern formatted with the record index.
+    include_header : bool
+        Whether to include the header.
+
+    Returns
+    -------
+
+    """
+    try:
+        SlurmScript.to_bundle(scripts, path, names=names, include_header=include_header)
+    except ValueError as exc:
+        raise SystemExit(f"Error: {exc}") from None
+
+
+def check_pattern_or_exit(pattern: str) -> None:
+    """Check an --output-path pattern, exiting with an error message if bad.
+
+    Parameters
+    ----------
+    pattern : str
+        The pattern, which must use ``{index}`` and no other placeholder.
+
+    Returns
+    -------
+
+    """
+    try:
+        if pattern.format(index=0) == pattern.format(index=1):
+            raise SystemExit(f"Error: Pattern '{pattern}' does not use {{index}}")
+    except (KeyError, IndexError):
+        raise SystemExit(
+            f"Error: Pattern '{pattern}' may only use the {{index}} placeholder"
+        ) from None
+    except ValueError as exc:
+        raise SystemExit(f"Error: Invalid pattern '{pattern}': {exc}") from None
+
+
+def generate_many(
+    scripts: Iterable[SlurmScript],
+    path_out: str | None,
+    path_bundle: str | None,
+    path_json_out: str | None,
+    include_header: bool,
+    submit: bool,
+) -> None:
+    """Write the scripts generated from a JSON Lines manifest.
+
+    Parameters
+    ----------
+    scripts : iterable of SlurmScript
+        The scripts, one per manifest record.
+    path_out : str, optional
+        Pattern for the script paths, formatted with the record index.
+    path_bundle : str, optional
+        Archive to write the scripts into instead.
+    path_json_out : str, optional
+        JSON Lines manifest to export the generated scripts to.
+    include_header : bool
+        Whether to include the header.
+    submit : bool
+        Whether to submit each script after saving it.
+
+    Returns
+    -------
+
+    """
+    if path_out:
+        check_pattern_or_exit(path_out)
+    if path_json_out is not None:
+        scripts = list(scripts)
+        SlurmScript.to_jsonl(scripts, path_json_out)
+
+    if submit:
+        if not path_out:
+            print("Error: --submit requires --output-path to be specified")
+            return
+        for index, slurm_script in enumerate(scripts):
+            slurm_script.submit_job(path=path_out.format(index=index))
+    elif path_bundle:
+        write_bundle_or_exit(
+            scripts,
+            path_bundle,
+            names=member_name(path_out) if path_out else "job_{index:05d}.sh",
+            include_header=include_header,
+        )
+    elif path_out:
+        try:
+            save_many(scripts, path_out, include_header=include_header)
+        except ValueError as exc:
+            raise SystemExit(f"Error: {exc}") from None
+    else:
+        for slurm_script in scripts:
+            print(slurm_script.to_string(include_header=include_header))
+
+
 if __name__ == "__main__":
     main()
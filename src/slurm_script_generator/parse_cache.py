@@ -0,0 +1,211 @@
+"""An on-disk cache of parsed batch scripts.
+
+Tools that read the same job scripts again and again, such as ``slurm-alloc``
+or ``--read-script``, can keep the parsed scripts in a :class:`ParseCache` so
+that reading an unchanged script only costs a lookup. Entries hold the compact
+binary form of :mod:`slurm_script_generator.binary`, one file per script, so
+several processes can share a cache directory: every entry is written to a
+temporary file and renamed into place, and a reader sees either a whole entry
+or none at all.
+"""
+
+import functools
+import hashlib
+import os
+import struct
+import time
+from importlib.metadata import version
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from slurm_script_generator import binary
+from slurm_script_generator.writers import _default_mode, _replace
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Magic, layout version, file size, file mtime_ns, SHA-256 of the file.
+_ENTRY = struct.Struct("<4sBQq32s")
+_MAGIC = b"SSGP"
+# Version 3: #SBATCH lines after the first line that is neither a comment
+# nor blank are parsed as commands.
+_ENTRY_VERSION = 3
+# Files modified this recently may change again within the same mtime tick
+# without their size changing, so their stat alone is not trusted.
+_RACY_NS = 2_000_000_000
+# Leftover temporary files of writers that died are removed after this long.
+_STALE_TMP_NS = 3600 * 1_000_000_000
+# Eviction frees space down to this fraction of the limit, so that it does
+# not have to run again on the very next store.
+_EVICT_TO = 0.8
+# Other processes write to the cache too, so its size is re-read this often.
+_SCAN_EVERY = 256
+
+
+def default_cache_dir() -> str:
+    """The cache directory under ``$XDG_CACHE_HOME`` (or ``~/.cache``)."""
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(root, "slurm-script-generator", "parse")
+
+
+@functools.lru_cache(maxsize=1)
+def _salt() -> bytes:
+    """Mixed into every key, since pragma ids change between versions."""
+    v = version("slurm-script-generator")
+    return f"{v}:{binary.FORMAT_VERSION}:".encode()
+
+
+class ParseCache:
+    """Parsed scripts kept on disk, keyed by their path.
+
+    An entry is used when the script still has the size and modification time
+    it had when it was parsed. If only the modification time changed, the
+    script is hashed and the entry is used when the content is the same.
+
+    The cache holds about ``max_bytes`` of entries. Each hit refreshes the
+    modification time of its entry, and the entries used longest ago are
+    evicted first.
+
+    Args:
+        directory: Where entries are stored; created if needed. Defaults to
+            :func:`default_cache_dir`.
+        max_bytes: Size the entries are kept under.
+    """
+
+    def __init__(
+        self, directory: str | Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.directory = os.fspath(
+            default_cache_dir() if directory is None else directory
+        )
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Estimated size of the entries; None until the directory is scanned.
+        self._size: int | None = None
+        self._stores = 0
+        self._mode = _default_mode()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def load(self, path: str | Path, parse: Callable[[str], bytes]) -> bytes:
+        """The encoded script at *path*, parsed with *parse* on a miss.
+
+        Args:
+            path: Path to the script file.
+            parse: Turns the text of the script into its binary encoding.
+
+        Returns:
+            The binary encoding of the script.
+        """
+        path = os.path.abspath(path)
+        entry_path = self._entry_path(path)
+        entry = self._read_entry(entry_path)
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if entry is not None and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+                self.hits += 1
+                self._touch(entry_path)
+                return entry[3]
+            content = f.read()
+
+        sha256 = hashlib.sha256(content).digest()
+        if entry is not None and entry[2] == sha256:
+            self.hits += 1
+            record = entry[3]
+        else:
+            self.misses += 1
+            record = parse(content.decode())
+        self._store(entry_path, stat, sha256, record)
+        return record
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        for item in os.scandir(self.directory):
+            if item.name.endswith(".bin"):
+                _unlink(item.path)
+        self._size = 0
+
+    def _entry_path(self, path: str) -> str:
+        key = hashlib.sha256(_salt() + os.fsencode(path)).hexdigest()[:32]
+        return os.path.join(self.directory, f"{key}.bin")
+
+    @staticmethod
+    def _read_entry(entry_path: str) -> Tuple[int, int, bytes, bytes] | None:
+        """(size, mtime_ns, sha256, record) of an entry, or None."""
+        try:
+            with open(entry_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        if len(data) < _ENTRY.size:
+            return None
+        magic, entry_version, size, mtime_ns, sha256 = _ENTRY.unpack_from(data)
+        if magic != _MAGIC or entry_version != _ENTRY_VERSION:
+            return None
+        return size, mtime_ns, sha256, data[_ENTRY.size :]
+
+    @staticmethod
+    def _touch(entry_path: str) -> None:
+        try:
+            os.utime(entry_path)
+        except FileNotFoundError:
+            # Evicted by another process in the meantime.
+            pass
+
+    def _store(
+        self, entry_path: str, stat: os.stat_result, sha256: bytes, record: bytes
+    ) -> None:
+        mtime_ns = stat.st_mtime_ns
+        if time.time_ns() - mtime_ns < _RACY_NS:
+            # Never matches, so the next read compares hashes instead.
+            mtime_ns = -1
+        data = _ENTRY.pack(_MAGIC, _ENTRY_VERSION, stat.st_size, mtime_ns, sha256)
+        data += record
+        _replace(entry_path, lambda f: f.write(data), self._mode, binary=True)
+
+        self._stores += 1
+        if self._size is None or self._stores % _SCAN_EVERY == 0:
+            self._size = self._scan_size()
+        else:
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _scan(self) -> List[Tuple[int, int, str]]:
+        """(mtime_ns, size, path) of every entry; stale temporary files go."""
+        now = time.time_ns()
+        entries = []
+        for item in os.scandir(self.directory):
+            try:
+                stat = item.stat()
+            except FileNotFoundError:
+                continue
+            if item.name.endswith(".bin"):
+                entries.append((stat.st_mtime_ns, stat.st_size, item.path))
+            elif now - stat.st_mtime_ns > _STALE_TMP_NS:
+                _unlink(item.path)
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._scan())
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until enough space is free."""
+        entries = sorted(self._scan())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        target = self.max_bytes * _EVICT_TO
+        for _, entry_size, entry_path in entries:
+            if size <= target:
+                break
+            _unlink(entry_path)
+            size -= entry_size
+        self._size = size
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        # Another process got there first.
+        pass
@@ -1,4 +1,20 @@
-from typing import Any, Callable, List, Literal, Type
+import enum
+import functools
+import math
+import weakref
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    NamedTuple,
+    Tuple,
+    Type,
+)
 
 from slurm_script_generator.utils import add_line
 
@@ -50,2275 +66,1397 @@ def to_bool(value: Any) -> bool:
     return bool(value)
 
 
-class Pragma:
-    """Base class representing a SLURM #SBATCH pragma."""
-
-    arg_varname: str
-    pragma_id: int
-    pragma_type: PragmaTypes
-    flags: List[str] = []
-    dest: str = ""
-    metavar: str | None = None
-    help: str = ""
-    example: str | None = None
-    type: Callable[[str], Any] = str
-    nargs: str | None = None
-    const: int | None = None
-    choices: List[str] | None = None
-    action: str | None = None
-    default: str | None = None
-
-    def __init__(self, value: str):
-        """Initialize the Pragma with a value, converting it to the correct type if possible.
-
-        Args:
-            value: The value to set for this pragma.
-        """
-        # Convert value to the correct type if 'type' attribute is set
-        # if hasattr(self, "type") and self.type is not None:
-        #     try:
-        #         self.value = self.type(value)
-        #     except Exception:
-        #         self.value = value
-        # else:
-        #     self.value = value
-        self.value = to_bool(value) if self.is_flag else value
-
-    @property
-    def is_flag(self) -> bool:
-        """Whether this pragma is a valueless switch such as ``--hold``."""
-        return self.action == "store_true"
-
-    def __eq__(self, value: object) -> bool:
-        if not isinstance(value, Pragma):
-            return False
-        return self.dest == value.dest and self.value == value.value
-
-    def __str__(self) -> str:
-        flag = self.dest.replace("_", "-")
-        # Valueless switches are written without a value: sbatch rejects
-        # `--hold=True`.
-        line = flag if self.is_flag else f"{flag}={self.value}"
-        return add_line(f"#SBATCH {line}", comment=self.help)
-
-    def __repr__(self) -> str:
-        return f"{self.__class__.__name__}(value={self.value})"
-
-    def to_dict(self) -> dict[str, Any]:
-        """ """
-        return {self.arg_varname: self.value}
-
-
-# --- 1. Job Identification & Basic Info (job_config) ---
-class Job_name(Pragma):
-    """Represents the SLURM #SBATCH --job-name pragma.
-    Sets a custom name for the submitted job, which appears in job listings and output files.
-    Usage: --job-name <NAME>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 0
-    pragma_type = "job_config"
-    arg_varname = "job_name"
-    flags = ["-J", "--job-name"]
-    dest = "--job-name"
-    metavar = "NAME"
-    help = "name of job"
-    example = "my_job"
-    type = str
-
-
-class Account(Pragma):
-    """Represents the SLURM #SBATCH --account pragma.
-    Specifies the account to charge for resource usage of the job.
-    Usage: --account <ACCOUNT_NAME>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    """This class represents the SLURM #SBATCH --account pragma."""
-
-    pragma_id = 1
-    pragma_type = "job_config"
-    arg_varname = "account"
-    flags = ["-A", "--account"]
-    dest = "--account"
-    metavar = "NAME"
-    help = "charge job to specified account"
-    example = "myacct"
-    type = str
-
-
-class Partition(Pragma):
-    """Represents the SLURM #SBATCH --partition pragma.
-    Requests a specific partition (queue) for job scheduling.
-    Usage: --partition <PARTITION>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 2
-    pragma_type = "job_config"
-    arg_varname = "partition"
-    flags = ["-p", "--partition"]
-    dest = "--partition"
-    metavar = "PARTITION"
-    help = "partition requested"
-    type = str
-
-
-class Qos(Pragma):
-    """Represents the SLURM #SBATCH --qos pragma.
-    Sets the quality of service for the job, affecting priority and limits.
-    Usage: --qos <QOS>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 3
-    pragma_type = "job_config"
-    arg_varname = "qos"
-    flags = ["-q", "--qos"]
-    dest = "--qos"
-    metavar = "QOS"
-    help = "quality of service"
-    type = str
-
-
-class Clusters(Pragma):
-    """Represents the SLURM #SBATCH --clusters pragma.
-    Specifies a comma-separated list of clusters to issue commands to, for multi-cluster environments.
-    Usage: --clusters <CLUSTER1,CLUSTER2,...>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 4
-    pragma_type = "job_config"
-    arg_varname = "clusters"
-    flags = ["-M", "--clusters"]
-    dest = "--clusters"
-    metavar = "NAMES"
-    help = "Comma separated list of clusters to issue commands to"
-    type = str
-
-
-class Reservation(Pragma):
-    """Represents the SLURM #SBATCH --reservation pragma.
-    Allocates resources from a named reservation, useful for reserved compute time or special projects.
-    Usage: --reservation <RESERVATION_NAME>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 5
-    pragma_type = "job_config"
-    arg_varname = "reservation"
-    flags = ["--reservation"]
-    dest = "--reservation"
-    metavar = "NAME"
-    help = "allocate resources from named reservation"
-    type = str
-
-
-class Wckey(Pragma):
-    """Represents the SLURM #SBATCH --wckey pragma.
-    Runs the job under a specified workload key (wckey) for accounting or tracking purposes.
-    Usage: --wckey <WCKEY>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 6
-    pragma_type = "job_config"
-    arg_varname = "wckey"
-    flags = ["--wckey"]
-    dest = "--wckey"
-    metavar = "WCKEY"
-    help = "wckey to run job under"
-    type = str
-
-
-class Mcs_label(Pragma):
-    """Represents the SLURM #SBATCH --mcs-label pragma.
-    Sets an MCS label if the mcs plugin is enabled, for group-based resource allocation.
-    Usage: --mcs-label <LABEL>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 7
-    pragma_type = "job_config"
-    arg_varname = "mcs_label"
-    flags = ["--mcs-label"]
-    dest = "--mcs-label"
-    metavar = "MCS"
-    help = "mcs label if mcs plugin mcs/group is used"
-    type = str
-
-
-class Comment(Pragma):
-    """Represents the SLURM #SBATCH --comment pragma.
-    Adds an arbitrary comment to the job for annotation or tracking.
-    Usage: --comment <TEXT>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 8
-    pragma_type = "job_config"
-    arg_varname = "comment"
-    flags = ["--comment"]
-    dest = "--comment"
-    metavar = "NAME"
-    help = "arbitrary comment"
-    type = str
-
-
-# --- 2. Time & Priority (time_and_priority) ---
-class Time(Pragma):
-    """Represents the SLURM #SBATCH --time pragma.
-    Sets the maximum walltime for the job in minutes or HH:MM:SS format.
-    Usage: --time <DURATION>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 0
-    pragma_type = "time_and_priority"
-    arg_varname = "time"
-    flags = ["-t", "--time"]
-    dest = "--time"
-    metavar = "MINUTES"
-    help = "time limit"
-    example = "00:45:00"
-    type = str
-
-
-class Time_min(Pragma):
-    """Represents the SLURM #SBATCH --time-min pragma.
-    Specifies the minimum walltime for the job, if distinct from the maximum.
-    Usage: --time-min <DURATION>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 1
-    pragma_type = "time_and_priority"
-    arg_varname = "time_min"
-    flags = ["--time-min"]
-    dest = "--time-min"
-    metavar = "MINUTES"
-    help = "minimum time limit (if distinct)"
-    type = str
-
-
-class Begin(Pragma):
-    """Represents the SLURM #SBATCH --begin pragma.
-    Defers job start until a specified time (absolute or relative).
-    Usage: --begin <TIME>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 2
-    pragma_type = "time_and_priority"
-    arg_varname = "begin"
-    flags = ["-b", "--begin"]
-    dest = "--begin"
-    metavar = "TIME"
-    help = "defer job until HH:MM MM/DD/YY"
-    type = str
-
-
-class Deadline(Pragma):
-    """Represents the SLURM #SBATCH --deadline pragma.
-    Removes the job if it cannot finish before the specified deadline.
-    Usage: --deadline <TIME>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 3
-    pragma_type = "time_and_priority"
-    arg_varname = "deadline"
-    flags = ["--deadline"]
-    dest = "--deadline"
-    metavar = "TIME"
-    help = "remove the job if no ending possible before this deadline"
-    type = str
-
-
-class Priority(Pragma):
-    """Represents the SLURM #SBATCH --priority pragma.
-    Sets the priority value for the job, influencing scheduling order.
-    Usage: --priority <VALUE>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 4
-    pragma_type = "time_and_priority"
-    arg_varname = "priority"
-    flags = ["--priority"]
-    dest = "--priority"
-    metavar = "VALUE"
-    help = "set the priority of the job"
-    type = str
-
-
-class Nice(Pragma):
-    """Represents the SLURM #SBATCH --nice pragma.
-    Decreases the job's scheduling priority by the specified value.
-    Usage: --nice <VALUE>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 5
-    pragma_type = "time_and_priority"
-    arg_varname = "nice"
-    flags = ["--nice"]
-    dest = "--nice"
-    metavar = "VALUE"
-    help = "decrease scheduling priority by value"
-    example = "1"
-    type = str
-
-
-# --- 3. Standard IO & Directory (io_and_directory) ---
-class Chdir(Pragma):
-    """Represents the SLURM #SBATCH --chdir pragma.
-    Changes the working directory for the job before execution.
-    Usage: --chdir <PATH>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 0
-    pragma_type = "io_and_directory"
-    arg_varname = "chdir"
-    flags = ["-D", "--chdir"]
-    dest = "--chdir"
-    metavar = "PATH"
-    help = "change working directory"
-    type = str
-
-
-class Output(Pragma):
-    """Represents the SLURM #SBATCH --output pragma.
-    Redirects job output to a specified file, supporting job and jobname variables.
-    Usage: --output <FILE>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 1
-    pragma_type = "io_and_directory"
-    arg_varname = "output"
-    flags = ["--output", "-o"]
-    dest = "--output"
-    metavar = "OUTPUT"
-    help = "File to redirect output (%%x=jobname, %%j=jobid)"
-    example = "--output ./%x.%j.out"
-    type = str
-
-
-class Error(Pragma):
-    """Represents the SLURM #SBATCH --error pragma.
-    Redirects job error to a specified file, supporting job and jobname variables.
-    Usage: --error <FILE>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 2
-    pragma_type = "io_and_directory"
-    arg_varname = "error"
-    flags = ["--error", "-e"]
-    dest = "--error"
-    metavar = "ERROR"
-    help = "File to redirect error (%%x=jobname, %%j=jobid)"
-    example = "--error ./%x.%j.err"
-    type = str
-
-
-class Disable_output_job_summary(Pragma):
-    """Represents the SLURM #SBATCH --disable-output-job-summary pragma.
-    Disables the job summary in the output file for the job.
-    Usage: --disable-output-job-summary
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 3
-    pragma_type = "io_and_directory"
-    arg_varname = "disable_output_job_summary"
-    flags = ["--disable-output-job-summary"]
-    dest = "--disable-output-job-summary"
-    help = "disable job summary in output file for the job"
-    action = "store_true"
-    type = str
-
-
-class Get_user_env(Pragma):
-    """Represents the SLURM #SBATCH --get-user-env pragma.
-    Used by Moab for environment setup; see srun man page for details.
-    Usage: --get-user-env
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 4
-    pragma_type = "io_and_directory"
-    arg_varname = "get_user_env"
-    flags = ["--get-user-env"]
-    dest = "--get-user-env"
-    help = "used by Moab. See srun man page"
-    action = "store_true"
-    type = str
-
-
-class Quiet(Pragma):
-    """Represents the SLURM #SBATCH --quiet pragma.
-    Suppresses informational messages during job submission.
-    Usage: --quiet
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 5
-    pragma_type = "io_and_directory"
-    arg_varname = "quiet"
-    flags = ["-Q", "--quiet"]
-    dest = "--quiet"
-    help = "quiet mode (suppress informational messages)"
-    action = "store_true"
-    type = str
-
-
-# --- 4. Notifications (notifications) ---
-class Mail_user(Pragma):
-    """Represents the SLURM #SBATCH --mail-user pragma.
-    Specifies the email address to receive job state notifications.
-    Usage: --mail-user <EMAIL>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 0
-    pragma_type = "notifications"
-    arg_varname = "mail_user"
-    flags = ["--mail-user"]
-    dest = "--mail-user"
-    metavar = "USER"
-    help = "who to send email notification for job state changes"
-    example = "example@email.com"
-    type = str
-
-
-class Mail_type(Pragma):
-    """Represents the SLURM #SBATCH --mail-type pragma.
-    Sets which job state changes trigger email notifications (e.g., BEGIN, END, FAIL).
-    Usage: --mail-type <TYPE>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 1
-    pragma_type = "notifications"
-    arg_varname = "mail_type"
-    flags = ["--mail-type"]
-    dest = "--mail-type"
-    metavar = "TYPE"
-    help = "notify on state change"
-    example = "ALL"
-    choices = ["NONE", "BEGIN", "END", "FAIL", "REQUEUE", "ALL"]
-    type = str
-
-
-class Bell(Pragma):
-    """Represents the SLURM #SBATCH --bell pragma.
-    Rings the terminal bell when the job is allocated.
-    Usage: --bell
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 2
-    pragma_type = "notifications"
-    arg_varname = "bell"
-    flags = ["--bell"]
-    dest = "--bell"
-    help = "ring the terminal bell when the job is allocated"
-    action = "store_true"
-    type = str
-
-
-# --- 5. Dependencies & Job Arrays (dependencies_and_arrays) ---
-class Dependency(Pragma):
-    """Represents the SLURM #SBATCH --dependency pragma.
-    Defers job start until a condition on another job ID is satisfied (e.g., after, afterok).
-    Usage: --dependency <TYPE:JOBID[:TIME]>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 0
-    pragma_type = "dependencies_and_arrays"
-    arg_varname = "dependency"
-    flags = ["-d", "--dependency"]
-    dest = "--dependency"
-    metavar = "TYPE:JOBID[:TIME]"
-    help = "defer job until condition on jobid is satisfied"
-    type = str
-
-
-class Array(Pragma):
-    """Represents the SLURM #SBATCH --array pragma.
-    Submits a job array, allowing multiple similar jobs to be managed together.
-    Usage: --array <INDEXES>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 1
-    pragma_type = "dependencies_and_arrays"
-    arg_varname = "array"
-    flags = ["--array"]
-    dest = "--array"
-    metavar = "INDEXES"
-    help = "submit a job array"
-    type = str
-
-
-# --- 6. Core Node & Task Allocation (core_node_and_task_allocation) ---
-class Nodes(Pragma):
-    """Represents the SLURM #SBATCH --nodes pragma.
-    Specifies the number of nodes to allocate for the job.
-    Usage: --nodes <COUNT>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 0
-    pragma_type = "core_node_and_task_allocation"
-    arg_varname = "nodes"
-    flags = ["-N", "--nodes"]
-    dest = "--nodes"
-    metavar = "NODES"
-    help = "number of nodes on which to run"
-    example = "2"
-    type = int
-
-
-class Ntasks(Pragma):
-    """Represents the SLURM #SBATCH --ntasks pragma.
-    Sets the total number of tasks (processes) to run for the job.
-    Usage: --ntasks <COUNT>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 1
-    pragma_type = "core_node_and_task_allocation"
-    arg_varname = "ntasks"
-    flags = ["-n", "--ntasks"]
-    dest = "--ntasks"
-    metavar = "N"
-    help = "number of processors required"
-    example = "16"
-    type = str
-
-
-class Ntasks_per_node(Pragma):
-    """Represents the SLURM #SBATCH --ntasks-per-node pragma.
-    Specifies the number of tasks to invoke on each node.
-    Usage: --ntasks-per-node <COUNT>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 2
-    pragma_type = "core_node_and_task_allocation"
-    arg_varname = "ntasks_per_node"
-    flags = ["--ntasks-per-node"]
-    dest = "--ntasks-per-node"
-    metavar = "N"
-    help = "number of tasks to invoke on each node"
-    example = "16"
-    type = int
-
-
-class Cpus_per_task(Pragma):
-    """Represents the SLURM #SBATCH --cpus-per-task pragma.
-    Sets the number of CPUs required per task.
-    Usage: --cpus-per-task <COUNT>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 3
-    pragma_type = "core_node_and_task_allocation"
-    arg_varname = "cpus_per_task"
-    flags = ["-c", "--cpus-per-task"]
-    dest = "--cpus-per-task"
-    metavar = "NCPUS"
-    help = "number of cpus required per task"
-    example = "16"
-    type = str
-
-
-class Mincpus(Pragma):
-    """Represents the SLURM #SBATCH --mincpus pragma.
-    Specifies the minimum number of logical processors per node.
-    Usage: --mincpus <COUNT>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 4
-    pragma_type = "core_node_and_task_allocation"
-    arg_varname = "mincpus"
-    flags = ["--mincpus"]
-    dest = "--mincpus"
-    metavar = "N"
-    help = "minimum number of logical processors per node"
-    type = str
-
-
-class Distribution(Pragma):
-    """Represents the SLURM #SBATCH --distribution pragma.
-    Sets the distribution method for processes across nodes (block, cyclic, arbitrary).
-    Usage: --distribution <TYPE>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 5
-    pragma_type = "core_node_and_task_allocation"
-    arg_varname = "distribution"
-    flags = ["-m", "--distribution"]
-    dest = "--distribution"
-    metavar = "TYPE"
-    help = "distribution method for processes to nodes"
-    choices = ["block", "cyclic", "arbitrary"]
-    type = str
-
-
-class Spread_job(Pragma):
-    """Represents the SLURM #SBATCH --spread-job pragma.
-    Spreads the job across as many nodes as possible.
-    Usage: --spread-job
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 6
-    pragma_type = "core_node_and_task_allocation"
-    arg_varname = "spread_job"
-    flags = ["--spread-job"]
-    dest = "--spread-job"
-    help = "spread job across as many nodes as possible"
-    action = "store_true"
-    type = str
-
-
-class Use_min_nodes(Pragma):
-    """Represents the SLURM #SBATCH --use-min-nodes pragma.
-    If a range of node counts is given, prefers the smaller count for allocation.
-    Usage: --use-min-nodes
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 7
-    pragma_type = "core_node_and_task_allocation"
-    arg_varname = "use_min_nodes"
-    flags = ["--use-min-nodes"]
-    dest = "--use-min-nodes"
-    help = "if a range of node counts is given, prefer the smaller count"
-    action = "store_true"
-    type = str
-
-
-# --- 7. CPU Topology & Binding (cpu_topology_and_binding) ---
-class Sockets_per_node(Pragma):
-    """Represents the SLURM #SBATCH --sockets-per-node pragma.
-    Specifies the number of sockets per node to allocate.
-    Usage: --sockets-per-node <COUNT>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 0
-    pragma_type = "cpu_topology_and_binding"
-    arg_varname = "sockets_per_node"
-    flags = ["--sockets-per-node"]
-    dest = "--sockets-per-node"
-    metavar = "S"
-    help = "number of sockets per node to allocate"
-    type = str
-
-
-class Cores_per_socket(Pragma):
-    """Represents the SLURM #SBATCH --cores-per-socket pragma.
-    Sets the number of cores per socket to allocate.
-    Usage: --cores-per-socket <COUNT>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 1
-    pragma_type = "cpu_topology_and_binding"
-    arg_varname = "cores_per_socket"
-    flags = ["--cores-per-socket"]
-    dest = "--cores-per-socket"
-    metavar = "C"
-    help = "number of cores per socket to allocate"
-    example = "8"
-    type = str
-
-
-class Threads_per_core(Pragma):
-    """Represents the SLURM #SBATCH --threads-per-core pragma.
-    Specifies the number of threads per core to allocate.
-    Usage: --threads-per-core <COUNT>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 2
-    pragma_type = "cpu_topology_and_binding"
-    arg_varname = "threads_per_core"
-    flags = ["--threads-per-core"]
-    dest = "--threads-per-core"
-    metavar = "T"
-    help = "number of threads per core to allocate"
-    example = "4"
-    type = str
-
-
-class Ntasks_per_core(Pragma):
-    """Represents the SLURM #SBATCH --ntasks-per-core pragma.
-    Sets the number of tasks to invoke on each core.
-    Usage: --ntasks-per-core <COUNT>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 3
-    pragma_type = "cpu_topology_and_binding"
-    arg_varname = "ntasks_per_core"
-    flags = ["--ntasks-per-core"]
-    dest = "--ntasks-per-core"
-    metavar = "N"
-    help = "number of tasks to invoke on each core"
-    example = "16"
-    type = str
-
-
-class Ntasks_per_socket(Pragma):
-    """Represents the SLURM #SBATCH --ntasks-per-socket pragma.
-    Specifies the number of tasks to invoke on each socket.
-    Usage: --ntasks-per-socket <COUNT>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 4
-    pragma_type = "cpu_topology_and_binding"
-    arg_varname = "ntasks_per_socket"
-    flags = ["--ntasks-per-socket"]
-    dest = "--ntasks-per-socket"
-    metavar = "N"
-    help = "number of tasks to invoke on each socket"
-    example = "8"
-    type = str
-
-
-class Extra_node_info(Pragma):
-    """Represents the SLURM #SBATCH --extra-node-info pragma.
-    Combines requests for sockets, cores, and threads in a single specification.
-    Usage: --extra-node-info <S[:C[:T]]>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 5
-    pragma_type = "cpu_topology_and_binding"
-    arg_varname = "extra_node_info"
-    flags = ["-B", "--extra-node-info"]
-    dest = "--extra-node-info"
-    metavar = "S[:C[:T]]"
-    help = "combine request of sockets, cores and threads"
-    type = str
-
-
-class Hint(Pragma):
-    """Represents the SLURM #SBATCH --hint pragma.
-    Provides application binding hints to optimize task placement.
-    Usage: --hint <HINT>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 6
-    pragma_type = "cpu_topology_and_binding"
-    arg_varname = "hint"
-    flags = ["--hint"]
-    dest = "--hint"
-    metavar = "HINT"
-    help = "Bind tasks according to application hints"
-    type = str
-
-
-# --- 8. Memory (memory) ---
-class Mem(Pragma):
-    """Represents the SLURM #SBATCH --mem pragma.
-    Sets the minimum amount of real memory required for the job.
-    Usage: --mem <SIZE>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 0
-    pragma_type = "memory"
-    arg_varname = "mem"
-    flags = ["--mem"]
-    dest = "--mem"
-    metavar = "MB"
-    help = "minimum amount of real memory"
-    example = "25GB"
-    type = str
-
-
-class Mem_per_cpu(Pragma):
-    """Represents the SLURM #SBATCH --mem-per-cpu pragma.
-    Specifies the maximum amount of real memory per allocated CPU.
-    Usage: --mem-per-cpu <SIZE>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 1
-    pragma_type = "memory"
-    arg_varname = "mem_per_cpu"
-    flags = ["--mem-per-cpu"]
-    dest = "--mem-per-cpu"
-    metavar = "MB"
-    help = "maximum amount of real memory per allocated cpu"
-    type = str
-
-
-class Mem_bind(Pragma):
-    """Represents the SLURM #SBATCH --mem-bind pragma.
-    Binds memory to locality domains for performance optimization.
-    Usage: --mem-bind <BIND>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 2
-    pragma_type = "memory"
-    arg_varname = "mem_bind"
-    flags = ["--mem-bind"]
-    dest = "--mem-bind"
-    metavar = "BIND"
-    help = "Bind memory to locality domains"
-    type = str
-
-
-class Oom_kill_step(Pragma):
-    """Represents the SLURM #SBATCH --oom-kill-step pragma.
-    Sets the OOMKillStep behavior for jobs that exceed memory limits.
-    Usage: --oom-kill-step <0|1>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 3
-    pragma_type = "memory"
-    arg_varname = "oom_kill_step"
-    flags = ["--oom-kill-step"]
-    dest = "--oom-kill-step"
-    metavar = "0|1"
-    help = "set the OOMKillStep behaviour"
-    nargs = "?"
-    const = "1"
-    type = str
-
-
-# --- 9. GPUs (gpus) ---
-class Gpus(Pragma):
-    """Represents the SLURM #SBATCH --gpus pragma.
-    Specifies the number of GPUs required for the job.
-    Usage: --gpus <COUNT>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 0
-    pragma_type = "gpus"
-    arg_varname = "gpus"
-    flags = ["-G", "--gpus"]
-    dest = "--gpus"
-    metavar = "N"
-    help = "count of GPUs required for the job"
-    example = "32"
-    type = str
-
-
-class Gpus_per_node(Pragma):
-    """Represents the SLURM #SBATCH --gpus-per-node pragma.
-    Sets the number of GPUs required per allocated node.
-    Usage: --gpus-per-node <COUNT>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 1
-    pragma_type = "gpus"
-    arg_varname = "gpus_per_node"
-    flags = ["--gpus-per-node"]
-    dest = "--gpus-per-node"
-    metavar = "N"
-    help = "number of GPUs required per allocated node"
-    type = str
-
-
-class Gpus_per_task(Pragma):
-    """Represents the SLURM #SBATCH --gpus-per-task pragma.
-    Specifies the number of GPUs required per spawned task.
-    Usage: --gpus-per-task <COUNT>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 2
-    pragma_type = "gpus"
-    arg_varname = "gpus_per_task"
-    flags = ["--gpus-per-task"]
-    dest = "--gpus-per-task"
-    metavar = "N"
-    help = "number of GPUs required per spawned task"
-    type = str
-
-
-class Gpus_per_socket(Pragma):
-    """Represents the SLURM #SBATCH --gpus-per-socket pragma.
-    Sets the number of GPUs required per allocated socket.
-    Usage: --gpus-per-socket <COUNT>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 3
-    pragma_type = "gpus"
-    arg_varname = "gpus_per_socket"
-    flags = ["--gpus-per-socket"]
-    dest = "--gpus-per-socket"
-    metavar = "N"
-    help = "number of GPUs required per allocated socket"
-    type = str
-
-
-class Cpus_per_gpu(Pragma):
-    """Represents the SLURM #SBATCH --cpus-per-gpu pragma.
-    Specifies the number of CPUs required per allocated GPU.
-    Usage: --cpus-per-gpu <COUNT>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 4
-    pragma_type = "gpus"
-    arg_varname = "cpus_per_gpu"
-    flags = ["--cpus-per-gpu"]
-    dest = "--cpus-per-gpu"
-    metavar = "N"
-    help = "number of CPUs required per allocated GPU"
-    example = "4"
-    type = str
-
-
-class Mem_per_gpu(Pragma):
-    """Represents the SLURM #SBATCH --mem-per-gpu pragma.
-    Sets the real memory required per allocated GPU.
-    Usage: --mem-per-gpu <SIZE>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 5
-    pragma_type = "gpus"
-    arg_varname = "mem_per_gpu"
-    flags = ["--mem-per-gpu"]
-    dest = "--mem-per-gpu"
-    help = "real memory required per allocated GPU"
-    example = "8GB"
-    type = str
-
-
-class Gpu_bind(Pragma):
-    """Represents the SLURM #SBATCH --gpu-bind pragma.
-    Specifies task-to-GPU binding options for optimal placement.
-    Usage: --gpu-bind <OPTIONS>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 6
-    pragma_type = "gpus"
-    arg_varname = "gpu_bind"
-    flags = ["--gpu-bind"]
-    dest = "--gpu-bind"
-    metavar = "..."
-    help = "task to gpu binding options"
-    type = str
-
-
-class Gpu_freq(Pragma):
-    """Represents the SLURM #SBATCH --gpu-freq pragma.
-    Sets the frequency and voltage of GPUs for the job.
-    Usage: --gpu-freq <OPTIONS>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 7
-    pragma_type = "gpus"
-    arg_varname = "gpu_freq"
-    flags = ["--gpu-freq"]
-    dest = "--gpu-freq"
-    metavar = "..."
-    help = "frequency and voltage of GPUs"
-    type = str
-
-
-class Nvmps(Pragma):
-    """Represents the SLURM #SBATCH --nvmps pragma.
-    Launches NVIDIA MPS (Multi-Process Service) for the job.
-    Usage: --nvmps
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 8
-    pragma_type = "gpus"
-    arg_varname = "nvmps"
-    flags = ["--nvmps"]
-    dest = "--nvmps"
-    help = "launching NVIDIA MPS for job"
-    action = "store_true"
-    type = str
-
-
-# --- 10. Generic Resources & Licenses (generic_resources_and_licenses) ---
-class Gres(Pragma):
-    """Represents the SLURM #SBATCH --gres pragma.
-    Specifies required generic resources (e.g., GPUs, licenses).
-    Usage: --gres <LIST>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 0
-    pragma_type = "generic_resources_and_licenses"
-    arg_varname = "gres"
-    flags = ["--gres"]
-    dest = "--gres"
-    metavar = "LIST"
-    help = "required generic resources"
-    type = str
-
-
-class Gres_flags(Pragma):
-    """Represents the SLURM #SBATCH --gres-flags pragma.
-    Sets flags related to GRES (Generic Resource) management.
-    Usage: --gres-flags <OPTIONS>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 1
-    pragma_type = "generic_resources_and_licenses"
-    arg_varname = "gres_flags"
-    flags = ["--gres-flags"]
-    dest = "--gres-flags"
-    metavar = "OPTS"
-    help = "flags related to GRES management"
-    type = str
-
-
-class Tres_bind(Pragma):
-    """Represents the SLURM #SBATCH --tres-bind pragma.
-    Specifies task-to-TRES binding options for resource allocation.
-    Usage: --tres-bind <OPTIONS>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 2
-    pragma_type = "generic_resources_and_licenses"
-    arg_varname = "tres_bind"
-    flags = ["--tres-bind"]
-    dest = "--tres-bind"
-    metavar = "..."
-    help = "task to tres binding options"
-    type = str
-
-
-class Tres_per_task(Pragma):
-    """Represents the SLURM #SBATCH --tres-per-task pragma.
-    Sets the list of TRES (Trackable Resources) required per task.
-    Usage: --tres-per-task <LIST>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 3
-    pragma_type = "generic_resources_and_licenses"
-    arg_varname = "tres_per_task"
-    flags = ["--tres-per-task"]
-    dest = "--tres-per-task"
-    metavar = "LIST"
-    help = "list of tres required per task"
-    type = str
-
-
-class Licenses(Pragma):
-    """Represents the SLURM #SBATCH --licenses pragma.
-    Specifies required licenses for the job, comma separated.
-    Usage: --licenses <NAMES>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 4
-    pragma_type = "generic_resources_and_licenses"
-    arg_varname = "licenses"
-    flags = ["-L", "--licenses"]
-    dest = "--licenses"
-    metavar = "NAMES"
-    help = "required license, comma separated"
-    type = str
-
-
-# --- 11. Node Constraints & Selection (node_constraints_and_selection) ---
-class Constraint(Pragma):
-    """Represents the SLURM #SBATCH --constraint pragma.
-    Specifies a list of constraints for node selection.
-    Usage: --constraint <LIST>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 0
-    pragma_type = "node_constraints_and_selection"
-    arg_varname = "constraint"
-    flags = ["-C", "--constraint"]
-    dest = "--constraint"
-    metavar = "LIST"
-    help = "specify a list of constraints"
-    type = str
-
-
-class Cluster_constraint(Pragma):
-    """Represents the SLURM #SBATCH --cluster-constraint pragma.
-    Specifies a list of cluster constraints for node selection.
-    Usage: --cluster-constraint <LIST>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 1
-    pragma_type = "node_constraints_and_selection"
-    arg_varname = "cluster_constraint"
-    flags = ["--cluster-constraint"]
-    dest = "--cluster-constraint"
-    metavar = "LIST"
-    help = "specify a list of cluster constraints"
-    type = str
-
-
-class Contiguous(Pragma):
-    """Represents the SLURM #SBATCH --contiguous pragma.
-    Demands a contiguous range of nodes for the job.
-    Usage: --contiguous
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 2
-    pragma_type = "node_constraints_and_selection"
-    arg_varname = "contiguous"
-    flags = ["--contiguous"]
-    dest = "--contiguous"
-    help = "demand a contiguous range of nodes"
-    action = "store_true"
-    type = str
-
-
-class Nodelist(Pragma):
-    """Represents the SLURM #SBATCH --nodelist pragma.
-    Requests a specific list of hosts for job execution.
-    Usage: --nodelist <HOSTS>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 3
-    pragma_type = "node_constraints_and_selection"
-    arg_varname = "nodelist"
-    flags = ["-w", "--nodelist"]
-    dest = "--nodelist"
-    metavar = "HOST"
-    help = "request a specific list of hosts"
-    nargs = "+"
-    type = str
-
-
-class Nodefile(Pragma):
-    """Represents the SLURM #SBATCH --nodefile pragma.
-    Requests a specific list of hosts from a file for job execution.
-    Usage: --nodefile <FILENAME>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 4
-    pragma_type = "node_constraints_and_selection"
-    arg_varname = "nodefile"
-    flags = ["-F", "--nodefile"]
-    dest = "--nodefile"
-    metavar = "FILENAME"
-    help = "request a specific list of hosts"
-    type = str
-
-
-class Exclude(Pragma):
-    """Represents the SLURM #SBATCH --exclude pragma.
-    Excludes a specific list of hosts from job allocation.
-    Usage: --exclude <HOSTS>
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 5
-    pragma_type = "node_constraints_and_selection"
-    arg_varname = "exclude"
-    flags = ["-x", "--exclude"]
-    dest = "--exclude"
-    metavar = "HOST"
-    help = "exclude a specific list of hosts"
-    nargs = "+"
-    type = str
-
-
-# --- 12. Exclusivity & Sharing (exclusivity_and_sharing) ---
-class Exclusive_user(Pragma):
-    """Represents the SLURM #SBATCH --exclusive-user pragma.
-    Allocates nodes in exclusive mode for CPU consumable resources.
-    Usage: --exclusive-user
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 0
-    pragma_type = "exclusivity_and_sharing"
-    arg_varname = "exclusive_user"
-    flags = ["--exclusive-user"]
-    dest = "--exclusive-user"
-    help = "allocate nodes in exclusive mode for cpu consumable resource"
-    action = "store_true"
-    type = str
-
-
-class Exclusive_mcs(Pragma):
-    """Represents the SLURM #SBATCH --exclusive-mcs pragma.
-    Allocates nodes in exclusive mode when the mcs plugin is enabled.
-    Usage: --exclusive-mcs
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 1
-    pragma_type = "exclusivity_and_sharing"
-    arg_varname = "exclusive_mcs"
-    flags = ["--exclusive-mcs"]
-    dest = "--exclusive-mcs"
-    help = "allocate nodes in exclusive mode when mcs plugin is enabled"
-    action = "store_true"
-    type = str
-
-
-class Oversubscribe(Pragma):
-    """Represents the SLURM #SBATCH --oversubscribe pragma.
-    Allows resources to be oversubscribed with other jobs.
-    Usage: --oversubscribe
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 2
-    pragma_type = "exclusivity_and_sharing"
-    arg_varname = "oversubscribe"
-    flags = ["-s", "--oversubscribe"]
-    dest = "--oversubscribe"
-    help = "oversubscribe resources with other jobs"
-    action = "store_true"
-    type = str
-
-
-class Overcommit(Pragma):
-    """Represents the SLURM #SBATCH --overcommit pragma.
-    Allows resources to be overcommitted for the job.
-    Usage: --overcommit
-
-    Parameters
-    ----------
-
-    Returns
-    -------
-
-    """
-
-    pragma_id = 3
-    pragma_type = "exclusivity_and_sharing"
-    arg_varname = "overcommit"
-    flags = ["-O", "--overcommit"]
-    dest = "--overcommit"
-    help = "overcommit resources"
-    action = "store_true"
-    type = str
+class Tool(enum.IntFlag):
+    """The SLURM commands an option can be given to."""
 
+    SBATCH = 1
+    SALLOC = 2
+    SRUN = 4
+    # Can be changed on a pending job with `scontrol update job`.
+    SCONTROL = 8
 
-# --- 13. Execution Behavior & Signals (execution_behavior_and_signals) ---
-class Hold(Pragma):
-    """Represents the SLURM #SBATCH --hold pragma.
-    Submits the job in a held state, preventing immediate execution.
-    Usage: --hold
 
-    Parameters
-    ----------
-
-    Returns
-    -------
+# What most options are accepted by: everything that allocates resources.
+_LAUNCHERS = Tool.SBATCH | Tool.SALLOC | Tool.SRUN
 
-    """
 
-    pragma_id = 0
-    pragma_type = "execution_behavior_and_signals"
-    arg_varname = "hold"
-    flags = ["-H", "--hold"]
-    dest = "--hold"
-    help = "submit job in held state"
-    action = "store_true"
-    type = str
+def _to_arg(flag: str, value: Any) -> str:
+    """Render an option as a single command-line argument."""
+    return flag if value is True else f"{flag}={value}"
 
 
-class Immediate(Pragma):
-    """Represents the SLURM #SBATCH --immediate pragma.
-    Exits if resources are not available within the specified seconds.
-    Usage: --immediate [SECS]
+_INFINITE_TIMES = {"infinite", "unlimited", "-1"}
+_MEMORY_UNITS = {"K": 1 / 1024, "M": 1, "G": 1024, "T": 1024**2}
 
-    Parameters
-    ----------
 
-    Returns
-    -------
+def parse_time(value: Any) -> float:
+    """Convert a SLURM time limit to seconds.
 
-    """
+    SLURM accepts ``minutes``, ``minutes:seconds``, ``hours:minutes:seconds``,
+    ``days-hours``, ``days-hours:minutes`` and ``days-hours:minutes:seconds``.
 
-    pragma_id = 1
-    pragma_type = "execution_behavior_and_signals"
-    arg_varname = "immediate"
-    flags = ["-I", "--immediate"]
-    dest = "--immediate"
-    metavar = "SECS"
-    help = 'exit if resources not available in "secs"'
-    nargs = "?"
-    const = "0"
-    type = str
+    Args:
+        value: The time limit, e.g. ``"1-02:00:00"`` or ``90``.
 
+    Returns:
+        The limit in seconds, or ``math.inf`` for ``INFINITE``/``UNLIMITED``.
 
-class Reboot(Pragma):
-    """Represents the SLURM #SBATCH --reboot pragma.
-    Reboots compute nodes before starting the job.
-    Usage: --reboot
+    Raises:
+        ValueError: If the value is not a valid time limit.
+    """
+    text = str(value).strip()
+    if text.lower() in _INFINITE_TIMES:
+        return math.inf
+    try:
+        if "-" in text:
+            days, rest = text.split("-", 1)
+            # After a day count, the fields are hours[:minutes[:seconds]].
+            fields = [int(field) for field in rest.split(":")]
+            if len(fields) > 3:
+                raise ValueError
+            hours, minutes, seconds = fields + [0] * (3 - len(fields))
+            return ((int(days) * 24 + hours) * 60 + minutes) * 60 + seconds
+        fields = [int(field) for field in text.split(":")]
+        if len(fields) == 1:
+            return fields[0] * 60
+        if len(fields) == 2:
+            return fields[0] * 60 + fields[1]
+        if len(fields) == 3:
+            return (fields[0] * 60 + fields[1]) * 60 + fields[2]
+    except ValueError:
+        pass
+    raise ValueError(f"Cannot interpret {value!r} as a time limit")
+
+
+def parse_memory(value: Any) -> int:
+    """Convert a SLURM memory size to MiB.
+
+    A size without unit is in megabytes, as for sbatch. The units ``K``,
+    ``M``, ``G`` and ``T`` may be followed by ``B`` (``25GB``).
 
-    Parameters
-    ----------
+    Args:
+        value: The memory size, e.g. ``"32G"`` or ``4000``.
 
-    Returns
-    -------
+    Returns:
+        The size in MiB, rounded up like SLURM does for kilobytes.
 
+    Raises:
+        ValueError: If the value is not a valid memory size.
     """
+    text = str(value).strip().upper()
+    if text.endswith("B"):
+        text = text[:-1]
+    factor = _MEMORY_UNITS.get(text[-1:], None)
+    if factor is not None:
+        text = text[:-1]
+    try:
+        return math.ceil(int(text) * (1 if factor is None else factor))
+    except ValueError:
+        raise ValueError(f"Cannot interpret {value!r} as a memory size") from None
 
-    pragma_id = 2
-    pragma_type = "execution_behavior_and_signals"
-    arg_varname = "reboot"
-    flags = ["--reboot"]
-    dest = "--reboot"
-    help = "reboot compute nodes before starting job"
-    action = "store_true"
-    type = str
 
+def parse_count_range(value: Any) -> Tuple[int, int]:
+    """Convert a count such as ``--nodes`` to its smallest and largest value.
 
-class Delay_boot(Pragma):
-    """Represents the SLURM #SBATCH --delay-boot pragma.
-    Delays node boot for desired features before job execution.
-    Usage: --delay-boot <MINS>
-
-    Parameters
-    ----------
+    Args:
+        value: A count (``4``), a range (``"2-4"``) or a list of allowed
+            counts (``"2,4,8"``, as ``--nodes`` accepts).
 
-    Returns
-    -------
+    Returns:
+        A tuple of (minimum, maximum), equal for a single count.
 
+    Raises:
+        ValueError: If the value is not a valid count.
     """
+    try:
+        counts = []
+        for part in str(value).split(","):
+            low, _, high = part.strip().partition("-")
+            counts.append(int(low))
+            if high:
+                counts.append(int(high))
+        return min(counts), max(counts)
+    except ValueError:
+        raise ValueError(f"Cannot interpret {value!r} as a count") from None
 
-    pragma_id = 3
-    pragma_type = "execution_behavior_and_signals"
-    arg_varname = "delay_boot"
-    flags = ["--delay-boot"]
-    dest = "--delay-boot"
-    metavar = "MINS"
-    help = "delay boot for desired node features"
-    type = str
 
+# Live pragmas by (class, type of value, value). Pragmas are immutable, so
+# equal ones can be shared: a sweep of a million scripts on the "gpu" partition
+# holds a single Partition("gpu"). Entries go away with their last user.
+_interned: "weakref.WeakValueDictionary[tuple, Pragma]" = weakref.WeakValueDictionary()
 
-class No_kill(Pragma):
-    """Represents the SLURM #SBATCH --no-kill pragma.
-    Prevents job termination on node failure.
-    Usage: --no-kill
 
-    Parameters
-    ----------
+def _intern(key: tuple, create: Callable[[], "Pragma"]) -> "Pragma":
+    """Return the live pragma stored under ``key``, creating it if needed.
 
-    Returns
-    -------
+    Args:
+        key: The identity of the pragma. Keys with unhashable values (such as
+            the list argparse makes of ``--nodelist a b``) are not interned.
+        create: Builds a new pragma for the key.
 
+    Returns:
+        The shared pragma for ``key``.
     """
+    try:
+        pragma = _interned.get(key)
+    except TypeError:
+        return create()
+    if pragma is None:
+        pragma = _interned.setdefault(key, create())
+    return pragma
 
-    pragma_id = 4
-    pragma_type = "execution_behavior_and_signals"
-    arg_varname = "no_kill"
-    flags = ["-k", "--no-kill"]
-    dest = "--no-kill"
-    help = "do not kill job on node failure"
-    action = "store_true"
-    type = str
-
-
-class Kill_command(Pragma):
-    """Represents the SLURM #SBATCH --kill-command pragma.
-    Specifies the signal to send when terminating the job.
-    Usage: --kill-command [SIGNAL]
-
-    Parameters
-    ----------
 
-    Returns
-    -------
+class Pragma:
+    """Base class representing a SLURM #SBATCH pragma.
 
+    Pragmas are immutable and interned: creating a pragma equal to one that is
+    still alive returns that same object.
     """
 
-    pragma_id = 5
-    pragma_type = "execution_behavior_and_signals"
-    arg_varname = "kill_command"
-    flags = ["-K", "--kill-command"]
-    dest = "--kill-command"
-    metavar = "SIGNAL"
-    help = "signal to send terminating job"
-    nargs = "?"
-    const = "TERM"
-    type = str
-
-
-class Signal(Pragma):
-    """Represents the SLURM #SBATCH --signal pragma.
-    Sends a signal when the time limit is within the specified seconds.
-    Usage: --signal [R:]NUM[@TIME]
-
-    Parameters
-    ----------
-
-    Returns
-    -------
+    __slots__ = ("value", "_parsed", "__weakref__")
 
-    """
+    arg_varname: str
+    pragma_id: int
+    pragma_type: PragmaTypes
+    flags: List[str] = []
+    dest: str = ""
+    metavar: str | None = None
+    help: str = ""
+    example: str | None = None
+    type: Callable[[str], Any] = str
+    nargs: str | None = None
+    const: int | None = None
+    choices: List[str] | None = None
+    action: str | None = None
+    default: str | None = None
+    # Converts the value to its canonical form, see `parsed`.
+    parser: Callable[[Any], Any] | None = None
+    # Keys of options that sbatch refuses in combination with this one.
+    conflicts: Tuple[str, ...] = ()
+    # The commands that accept this option, test with e.g. `tools & Tool.SRUN`.
+    tools: Tool = Tool(0)
 
-    pragma_id = 6
-    pragma_type = "execution_behavior_and_signals"
-    arg_varname = "signal"
-    flags = ["--signal"]
-    dest = "--signal"
-    metavar = "[R:]NUM[@TIME]"
-    help = "send signal when time limit within time seconds"
-    type = str
+    def __new__(cls, value: Any) -> "Pragma":
+        """Return the pragma with a value, reusing a live equal one.
 
+        Args:
+            value: The value to set for this pragma.
+        """
+        if cls.action == "store_true":
+            value = to_bool(value)
 
-# --- 14. Advanced / Hardware / Misc (advanced_hardware_misc) ---
-class Core_spec(Pragma):
-    """Represents the SLURM #SBATCH --core-spec pragma.
-    Sets the count of reserved cores for the job.
-    Usage: --core-spec <CORES>
+        def create() -> Pragma:
+            pragma = object.__new__(cls)
+            object.__setattr__(pragma, "value", value)
+            return pragma
 
-    Parameters
-    ----------
+        # The type is part of the key, since e.g. 1 == True but Nodes(1) and
+        # Nodes(True) must stay distinct.
+        return _intern((cls, type(value), value), create)
 
-    Returns
-    -------
+    @property
+    def parsed(self) -> Any:
+        """The value in canonical form, e.g. seconds for ``--time``.
 
-    """
+        The value is parsed on first access and cached on the pragma, which
+        interning shares between all scripts using it.
 
-    pragma_id = 0
-    pragma_type = "advanced_hardware_misc"
-    arg_varname = "core_spec"
-    flags = ["-S", "--core-spec"]
-    dest = "--core-spec"
-    metavar = "CORES"
-    help = "count of reserved cores"
-    type = str
+        Returns:
+            The parsed value, or None if this option has no parser.
 
+        Raises:
+            ValueError: If the value cannot be parsed.
+        """
+        try:
+            return self._parsed
+        except AttributeError:
+            parser = self.parser
+            parsed = None if parser is None else parser(self.value)
+            object.__setattr__(self, "_parsed", parsed)
+            return parsed
 
-class Thread_spec(Pragma):
-    """Represents the SLURM #SBATCH --thread-spec pragma.
-    Sets the count of reserved threads for the job.
-    Usage: --thread-spec <THREADS>
+    def to_arg(self) -> str:
+        """Render the pragma as a single command-line argument.
 
-    Parameters
-    ----------
+        Returns:
+            Either ``"--flag"`` for a valueless switch or ``"--flag=value"``.
+        """
+        return _to_arg(self.dest, True if self.is_flag else self.value)
 
-    Returns
-    -------
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} objects are immutable")
 
-    """
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{self.__class__.__name__} objects are immutable")
 
-    pragma_id = 1
-    pragma_type = "advanced_hardware_misc"
-    arg_varname = "thread_spec"
-    flags = ["--thread-spec"]
-    dest = "--thread-spec"
-    metavar = "THREADS"
-    help = "count of reserved threads"
-    type = str
+    def __reduce__(self) -> tuple:
+        return (self.__class__, (self.value,))
 
+    @property
+    def is_flag(self) -> bool:
+        """Whether this pragma is a valueless switch such as ``--hold``."""
+        return self.action == "store_true"
 
-class Cpu_freq(Pragma):
-    """Represents the SLURM #SBATCH --cpu-freq pragma.
-    Requests CPU frequency and governor settings for the job.
-    Usage: --cpu-freq <MIN[-MAX[:GOV]]>
+    def __eq__(self, value: object) -> bool:
+        if not isinstance(value, Pragma):
+            return False
+        return self.dest == value.dest and self.value == value.value
 
-    Parameters
-    ----------
+    def __hash__(self) -> int:
+        # Consistent with __eq__; list values (e.g. `--nodelist a b`) hash as
+        # tuples so that any pragma can go in a set.
+        value = self.value
+        if isinstance(value, list):
+            value = tuple(value)
+        return hash((self.dest, value))
 
-    Returns
-    -------
+    def __str__(self) -> str:
+        return self.render()
 
-    """
+    def render(self, line_length: int = 54) -> str:
+        """Render the #SBATCH line of this pragma, with its help as comment.
 
-    pragma_id = 2
-    pragma_type = "advanced_hardware_misc"
-    arg_varname = "cpu_freq"
-    flags = ["--cpu-freq"]
-    dest = "--cpu-freq"
-    metavar = "MIN[-MAX[:GOV]]"
-    help = "requested cpu frequency (and governor)"
-    type = str
+        Lines are memoized per (class, value, line_length) in a bounded LRU
+        cache, see :func:`render_cache_info`.
 
+        Args:
+            line_length: The column at which the comment starts.
 
-class Tmp(Pragma):
-    """Represents the SLURM #SBATCH --tmp pragma.
-    Sets the minimum amount of temporary disk required for the job.
-    Usage: --tmp <SIZE>
+        Returns:
+            The line, including the trailing newline.
+        """
+        try:
+            return _render_cached(self.__class__, self.value, line_length)
+        except TypeError:
+            # Unhashable values, e.g. the list argparse makes of `--nodelist`.
+            return self._render(self.value, line_length)
+
+    @classmethod
+    def _render(cls, value: Any, line_length: int) -> str:
+        flag = cls.dest.replace("_", "-")
+        # Valueless switches are written without a value: sbatch rejects
+        # `--hold=True`.
+        line = flag if cls.action == "store_true" else f"{flag}={value}"
+        return add_line(f"#SBATCH {line}", comment=cls.help, line_length=line_length)
 
-    Parameters
-    ----------
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(value={self.value})"
 
-    Returns
-    -------
+    def to_dict(self) -> dict[str, Any]:
+        """ """
+        return {self.arg_varname: self.value}
 
-    """
 
-    pragma_id = 3
-    pragma_type = "advanced_hardware_misc"
-    arg_varname = "tmp"
-    flags = ["--tmp"]
-    dest = "--tmp"
-    metavar = "MB"
-    help = "minimum amount of temporary disk"
-    type = str
+# Number of distinct pragma lines kept by the render cache.
+RENDER_CACHE_SIZE = 4096
 
 
-class Resv_ports(Pragma):
-    """Represents the SLURM #SBATCH --resv-ports pragma.
-    Reserves communication ports for the job.
-    Usage: --resv-ports
+# typed, so that Nodes(1) and Nodes(True) do not share a line.
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE, typed=True)
+def _render_cached(pragma_cls: Type[Pragma], value: Any, line_length: int) -> str:
+    return pragma_cls._render(value, line_length)
 
-    Parameters
-    ----------
 
-    Returns
-    -------
+def render_cache_info() -> "functools._CacheInfo":
+    """Report how well the pragma render cache is doing.
 
+    Returns:
+        A named tuple of ``hits``, ``misses``, ``maxsize`` and ``currsize``.
     """
+    return _render_cached.cache_info()
 
-    pragma_id = 4
-    pragma_type = "advanced_hardware_misc"
-    arg_varname = "resv_ports"
-    flags = ["--resv-ports"]
-    dest = "--resv-ports"
-    help = "reserve communication ports"
-    action = "store_true"
-    type = str
 
+def clear_render_cache() -> None:
+    """Empty the pragma render cache and reset its statistics."""
+    _render_cached.cache_clear()
 
-class Switches(Pragma):
-    """Represents the SLURM #SBATCH --switches pragma.
-    Sets optimum switches and maximum wait time for optimum.
-    Usage: --switches <MAX_SWITCHES[@MAX_TIME]>
 
-    Parameters
-    ----------
-
-    Returns
-    -------
+class PragmaSpec(NamedTuple):
+    """Declarative description of one #SBATCH option.
 
+    The Pragma class of an option is built from its spec the first time it is
+    needed (see :data:`PRAGMA_SPECS`), which keeps importing this module cheap.
     """
 
-    pragma_id = 5
-    pragma_type = "advanced_hardware_misc"
-    arg_varname = "switches"
-    flags = ["--switches"]
-    dest = "--switches"
-    metavar = "MAX_SWITCHES[@MAX_TIME]"
-    help = "optimum switches and max time to wait for optimum"
-    type = str
-
-
-class Power(Pragma):
-    """Represents the SLURM #SBATCH --power pragma.
-    Sets power management options for the job.
-    Usage: --power <FLAGS>
+    arg_varname: str
+    flags: Tuple[str, ...]
+    metavar: str | None = None
+    help: str = ""
+    doc: str = ""
+    example: str | None = None
+    type: Callable[[str], Any] = str
+    nargs: str | None = None
+    const: str | None = None
+    choices: Tuple[str, ...] | None = None
+    action: str | None = None
+    default: str | None = None
+    parser: Callable[[Any], Any] | None = None
+    # Keys of options that sbatch refuses in combination with this one.
+    conflicts: Tuple[str, ...] = ()
+    tools: Tool = _LAUNCHERS
 
-    Parameters
-    ----------
+    @property
+    def dest(self) -> str:
+        """The long flag written to the script, e.g. ``"--job-name"``."""
+        return next(flag for flag in self.flags if flag.startswith("--"))
 
-    Returns
-    -------
+    @property
+    def class_name(self) -> str:
+        """Name of the Pragma class, e.g. ``"Job_name"``."""
+        return self.arg_varname.capitalize()
+
+
+# Every option we model, grouped by pragma type in the order they are written
+# to a script. The position of a spec within its group is its pragma_id.
+PRAGMA_SPECS: Dict[PragmaTypes, Tuple[PragmaSpec, ...]] = {
+    # --- 1. Job Identification & Basic Info ---
+    "job_config": (
+        PragmaSpec(
+            "job_name",
+            ("-J", "--job-name"),
+            metavar="NAME",
+            help="name of job",
+            doc="Sets a custom name for the submitted job, which appears in job listings and output files.",
+            example="my_job",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "account",
+            ("-A", "--account"),
+            metavar="NAME",
+            help="charge job to specified account",
+            doc="Specifies the account to charge for resource usage of the job.",
+            example="myacct",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "partition",
+            ("-p", "--partition"),
+            metavar="PARTITION",
+            help="partition requested",
+            doc="Requests a specific partition (queue) for job scheduling.",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "qos",
+            ("-q", "--qos"),
+            metavar="QOS",
+            help="quality of service",
+            doc="Sets the quality of service for the job, affecting priority and limits.",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "clusters",
+            ("-M", "--clusters"),
+            metavar="NAMES",
+            help="Comma separated list of clusters to issue commands to",
+            doc="Specifies a comma-separated list of clusters to issue commands to, for multi-cluster environments.",
+        ),
+        PragmaSpec(
+            "reservation",
+            ("--reservation",),
+            metavar="NAME",
+            help="allocate resources from named reservation",
+            doc="Allocates resources from a named reservation, useful for reserved compute time or special projects.",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "wckey",
+            ("--wckey",),
+            metavar="WCKEY",
+            help="wckey to run job under",
+            doc="Runs the job under a specified workload key (wckey) for accounting or tracking purposes.",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "mcs_label",
+            ("--mcs-label",),
+            metavar="MCS",
+            help="mcs label if mcs plugin mcs/group is used",
+            doc="Sets an MCS label if the mcs plugin is enabled, for group-based resource allocation.",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "comment",
+            ("--comment",),
+            metavar="NAME",
+            help="arbitrary comment",
+            doc="Adds an arbitrary comment to the job for annotation or tracking.",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+    ),
+    # --- 2. Time & Priority ---
+    "time_and_priority": (
+        PragmaSpec(
+            "time",
+            ("-t", "--time"),
+            metavar="MINUTES",
+            help="time limit",
+            doc="Sets the maximum walltime for the job in minutes or HH:MM:SS format.",
+            example="00:45:00",
+            parser=parse_time,
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "time_min",
+            ("--time-min",),
+            metavar="MINUTES",
+            help="minimum time limit (if distinct)",
+            doc="Specifies the minimum walltime for the job, if distinct from the maximum.",
+            parser=parse_time,
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "begin",
+            ("-b", "--begin"),
+            metavar="TIME",
+            help="defer job until HH:MM MM/DD/YY",
+            doc="Defers job start until a specified time (absolute or relative).",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "deadline",
+            ("--deadline",),
+            metavar="TIME",
+            help="remove the job if no ending possible before this deadline",
+            doc="Removes the job if it cannot finish before the specified deadline.",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "priority",
+            ("--priority",),
+            metavar="VALUE",
+            help="set the priority of the job",
+            doc="Sets the priority value for the job, influencing scheduling order.",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "nice",
+            ("--nice",),
+            metavar="VALUE",
+            help="decrease scheduling priority by value",
+            doc="Decreases the job's scheduling priority by the specified value.",
+            example="1",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+    ),
+    # --- 3. Standard IO & Directory ---
+    "io_and_directory": (
+        PragmaSpec(
+            "chdir",
+            ("-D", "--chdir"),
+            metavar="PATH",
+            help="change working directory",
+            doc="Changes the working directory for the job before execution.",
+        ),
+        PragmaSpec(
+            "output",
+            ("--output", "-o"),
+            metavar="OUTPUT",
+            help="File to redirect output (%%x=jobname, %%j=jobid)",
+            doc="Redirects job output to a specified file, supporting job and jobname variables.",
+            example="--output ./%x.%j.out",
+            tools=Tool.SBATCH | Tool.SRUN,
+        ),
+        PragmaSpec(
+            "error",
+            ("--error", "-e"),
+            metavar="ERROR",
+            help="File to redirect error (%%x=jobname, %%j=jobid)",
+            doc="Redirects job error to a specified file, supporting job and jobname variables.",
+            example="--error ./%x.%j.err",
+            tools=Tool.SBATCH | Tool.SRUN,
+        ),
+        PragmaSpec(
+            "disable_output_job_summary",
+            ("--disable-output-job-summary",),
+            help="disable job summary in output file for the job",
+            doc="Disables the job summary in the output file for the job.",
+            action="store_true",
+            tools=Tool.SBATCH,
+        ),
+        PragmaSpec(
+            "get_user_env",
+            ("--get-user-env",),
+            help="used by Moab. See srun man page",
+            doc="Used by Moab for environment setup; see srun man page for details.",
+            action="store_true",
+            tools=Tool.SBATCH,
+        ),
+        PragmaSpec(
+            "quiet",
+            ("-Q", "--quiet"),
+            help="quiet mode (suppress informational messages)",
+            doc="Suppresses informational messages during job submission.",
+            action="store_true",
+        ),
+    ),
+    # --- 4. Notifications ---
+    "notifications": (
+        PragmaSpec(
+            "mail_user",
+            ("--mail-user",),
+            metavar="USER",
+            help="who to send email notification for job state changes",
+            doc="Specifies the email address to receive job state notifications.",
+            example="example@email.com",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "mail_type",
+            ("--mail-type",),
+            metavar="TYPE",
+            help="notify on state change",
+            doc="Sets which job state changes trigger email notifications (e.g., BEGIN, END, FAIL).",
+            example="ALL",
+            choices=("NONE", "BEGIN", "END", "FAIL", "REQUEUE", "ALL"),
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "bell",
+            ("--bell",),
+            help="ring the terminal bell when the job is allocated",
+            doc="Rings the terminal bell when the job is allocated.",
+            action="store_true",
+            tools=Tool.SBATCH | Tool.SALLOC,
+        ),
+    ),
+    # --- 5. Dependencies & Job Arrays ---
+    "dependencies_and_arrays": (
+        PragmaSpec(
+            "dependency",
+            ("-d", "--dependency"),
+            metavar="TYPE:JOBID[:TIME]",
+            help="defer job until condition on jobid is satisfied",
+            doc="Defers job start until a condition on another job ID is satisfied (e.g., after, afterok).",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "array",
+            ("--array",),
+            metavar="INDEXES",
+            help="submit a job array",
+            doc="Submits a job array, allowing multiple similar jobs to be managed together.",
+            tools=Tool.SBATCH,
+        ),
+    ),
+    # --- 6. Core Node & Task Allocation ---
+    "core_node_and_task_allocation": (
+        PragmaSpec(
+            "nodes",
+            ("-N", "--nodes"),
+            metavar="NODES",
+            help="number of nodes on which to run",
+            doc="Specifies the number of nodes to allocate for the job.",
+            example="2",
+            type=int,
+            parser=parse_count_range,
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "ntasks",
+            ("-n", "--ntasks"),
+            metavar="N",
+            help="number of processors required",
+            doc="Sets the total number of tasks (processes) to run for the job.",
+            example="16",
+            parser=parse_count_range,
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "ntasks_per_node",
+            ("--ntasks-per-node",),
+            metavar="N",
+            help="number of tasks to invoke on each node",
+            doc="Specifies the number of tasks to invoke on each node.",
+            example="16",
+            type=int,
+            parser=parse_count_range,
+        ),
+        PragmaSpec(
+            "cpus_per_task",
+            ("-c", "--cpus-per-task"),
+            metavar="NCPUS",
+            help="number of cpus required per task",
+            doc="Sets the number of CPUs required per task.",
+            example="16",
+            parser=parse_count_range,
+            conflicts=("cpus_per_gpu",),
+        ),
+        PragmaSpec(
+            "mincpus",
+            ("--mincpus",),
+            metavar="N",
+            help="minimum number of logical processors per node",
+            doc="Specifies the minimum number of logical processors per node.",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "distribution",
+            ("-m", "--distribution"),
+            metavar="TYPE",
+            help="distribution method for processes to nodes",
+            doc="Sets the distribution method for processes across nodes (block, cyclic, arbitrary).",
+            choices=("block", "cyclic", "arbitrary"),
+        ),
+        PragmaSpec(
+            "spread_job",
+            ("--spread-job",),
+            help="spread job across as many nodes as possible",
+            doc="Spreads the job across as many nodes as possible.",
+            action="store_true",
+        ),
+        PragmaSpec(
+            "use_min_nodes",
+            ("--use-min-nodes",),
+            help="if a range of node counts is given, prefer the smaller count",
+            doc="If a range of node counts is given, prefers the smaller count for allocation.",
+            action="store_true",
+        ),
+    ),
+    # --- 7. CPU Topology & Binding ---
+    "cpu_topology_and_binding": (
+        PragmaSpec(
+            "sockets_per_node",
+            ("--sockets-per-node",),
+            metavar="S",
+            help="number of sockets per node to allocate",
+            doc="Specifies the number of sockets per node to allocate.",
+        ),
+        PragmaSpec(
+            "cores_per_socket",
+            ("--cores-per-socket",),
+            metavar="C",
+            help="number of cores per socket to allocate",
+            doc="Sets the number of cores per socket to allocate.",
+            example="8",
+        ),
+        PragmaSpec(
+            "threads_per_core",
+            ("--threads-per-core",),
+            metavar="T",
+            help="number of threads per core to allocate",
+            doc="Specifies the number of threads per core to allocate.",
+            example="4",
+        ),
+        PragmaSpec(
+            "ntasks_per_core",
+            ("--ntasks-per-core",),
+            metavar="N",
+            help="number of tasks to invoke on each core",
+            doc="Sets the number of tasks to invoke on each core.",
+            example="16",
+        ),
+        PragmaSpec(
+            "ntasks_per_socket",
+            ("--ntasks-per-socket",),
+            metavar="N",
+            help="number of tasks to invoke on each socket",
+            doc="Specifies the number of tasks to invoke on each socket.",
+            example="8",
+        ),
+        PragmaSpec(
+            "extra_node_info",
+            ("-B", "--extra-node-info"),
+            metavar="S[:C[:T]]",
+            help="combine request of sockets, cores and threads",
+            doc="Combines requests for sockets, cores, and threads in a single specification.",
+        ),
+        PragmaSpec(
+            "hint",
+            ("--hint",),
+            metavar="HINT",
+            help="Bind tasks according to application hints",
+            doc="Provides application binding hints to optimize task placement.",
+        ),
+    ),
+    # --- 8. Memory ---
+    "memory": (
+        PragmaSpec(
+            "mem",
+            ("--mem",),
+            metavar="MB",
+            help="minimum amount of real memory",
+            doc="Sets the minimum amount of real memory required for the job.",
+            example="25GB",
+            parser=parse_memory,
+            conflicts=("mem_per_cpu", "mem_per_gpu"),
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "mem_per_cpu",
+            ("--mem-per-cpu",),
+            metavar="MB",
+            help="maximum amount of real memory per allocated cpu",
+            doc="Specifies the maximum amount of real memory per allocated CPU.",
+            parser=parse_memory,
+            conflicts=("mem", "mem_per_gpu"),
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "mem_bind",
+            ("--mem-bind",),
+            metavar="BIND",
+            help="Bind memory to locality domains",
+            doc="Binds memory to locality domains for performance optimization.",
+        ),
+        PragmaSpec(
+            "oom_kill_step",
+            ("--oom-kill-step",),
+            metavar="0|1",
+            help="set the OOMKillStep behaviour",
+            doc="Sets the OOMKillStep behavior for jobs that exceed memory limits.",
+            nargs="?",
+            const="1",
+        ),
+    ),
+    # --- 9. GPUs ---
+    "gpus": (
+        PragmaSpec(
+            "gpus",
+            ("-G", "--gpus"),
+            metavar="N",
+            help="count of GPUs required for the job",
+            doc="Specifies the number of GPUs required for the job.",
+            example="32",
+        ),
+        PragmaSpec(
+            "gpus_per_node",
+            ("--gpus-per-node",),
+            metavar="N",
+            help="number of GPUs required per allocated node",
+            doc="Sets the number of GPUs required per allocated node.",
+        ),
+        PragmaSpec(
+            "gpus_per_task",
+            ("--gpus-per-task",),
+            metavar="N",
+            help="number of GPUs required per spawned task",
+            doc="Specifies the number of GPUs required per spawned task.",
+        ),
+        PragmaSpec(
+            "gpus_per_socket",
+            ("--gpus-per-socket",),
+            metavar="N",
+            help="number of GPUs required per allocated socket",
+            doc="Sets the number of GPUs required per allocated socket.",
+        ),
+        PragmaSpec(
+            "cpus_per_gpu",
+            ("--cpus-per-gpu",),
+            metavar="N",
+            help="number of CPUs required per allocated GPU",
+            doc="Specifies the number of CPUs required per allocated GPU.",
+            example="4",
+            conflicts=("cpus_per_task",),
+        ),
+        PragmaSpec(
+            "mem_per_gpu",
+            ("--mem-per-gpu",),
+            help="real memory required per allocated GPU",
+            doc="Sets the real memory required per allocated GPU.",
+            example="8GB",
+            parser=parse_memory,
+            conflicts=("mem", "mem_per_cpu"),
+        ),
+        PragmaSpec(
+            "gpu_bind",
+            ("--gpu-bind",),
+            metavar="...",
+            help="task to gpu binding options",
+            doc="Specifies task-to-GPU binding options for optimal placement.",
+        ),
+        PragmaSpec(
+            "gpu_freq",
+            ("--gpu-freq",),
+            metavar="...",
+            help="frequency and voltage of GPUs",
+            doc="Sets the frequency and voltage of GPUs for the job.",
+        ),
+        PragmaSpec(
+            "nvmps",
+            ("--nvmps",),
+            help="launching NVIDIA MPS for job",
+            doc="Launches NVIDIA MPS (Multi-Process Service) for the job.",
+            action="store_true",
+            tools=Tool.SBATCH,
+        ),
+    ),
+    # --- 10. Generic Resources & Licenses ---
+    "generic_resources_and_licenses": (
+        PragmaSpec(
+            "gres",
+            ("--gres",),
+            metavar="LIST",
+            help="required generic resources",
+            doc="Specifies required generic resources (e.g., GPUs, licenses).",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "gres_flags",
+            ("--gres-flags",),
+            metavar="OPTS",
+            help="flags related to GRES management",
+            doc="Sets flags related to GRES (Generic Resource) management.",
+        ),
+        PragmaSpec(
+            "tres_bind",
+            ("--tres-bind",),
+            metavar="...",
+            help="task to tres binding options",
+            doc="Specifies task-to-TRES binding options for resource allocation.",
+        ),
+        PragmaSpec(
+            "tres_per_task",
+            ("--tres-per-task",),
+            metavar="LIST",
+            help="list of tres required per task",
+            doc="Sets the list of TRES (Trackable Resources) required per task.",
+        ),
+        PragmaSpec(
+            "licenses",
+            ("-L", "--licenses"),
+            metavar="NAMES",
+            help="required license, comma separated",
+            doc="Specifies required licenses for the job, comma separated.",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+    ),
+    # --- 11. Node Constraints & Selection ---
+    "node_constraints_and_selection": (
+        PragmaSpec(
+            "constraint",
+            ("-C", "--constraint"),
+            metavar="LIST",
+            help="specify a list of constraints",
+            doc="Specifies a list of constraints for node selection.",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "cluster_constraint",
+            ("--cluster-constraint",),
+            metavar="LIST",
+            help="specify a list of cluster constraints",
+            doc="Specifies a list of cluster constraints for node selection.",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "contiguous",
+            ("--contiguous",),
+            help="demand a contiguous range of nodes",
+            doc="Demands a contiguous range of nodes for the job.",
+            action="store_true",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "nodelist",
+            ("-w", "--nodelist"),
+            metavar="HOST",
+            help="request a specific list of hosts",
+            doc="Requests a specific list of hosts for job execution.",
+            nargs="+",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "nodefile",
+            ("-F", "--nodefile"),
+            metavar="FILENAME",
+            help="request a specific list of hosts",
+            doc="Requests a specific list of hosts from a file for job execution.",
+        ),
+        PragmaSpec(
+            "exclude",
+            ("-x", "--exclude"),
+            metavar="HOST",
+            help="exclude a specific list of hosts",
+            doc="Excludes a specific list of hosts from job allocation.",
+            nargs="+",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+    ),
+    # --- 12. Exclusivity & Sharing ---
+    "exclusivity_and_sharing": (
+        PragmaSpec(
+            "exclusive_user",
+            ("--exclusive-user",),
+            help="allocate nodes in exclusive mode for cpu consumable resource",
+            doc="Allocates nodes in exclusive mode for CPU consumable resources.",
+            action="store_true",
+            tools=Tool.SBATCH,
+        ),
+        PragmaSpec(
+            "exclusive_mcs",
+            ("--exclusive-mcs",),
+            help="allocate nodes in exclusive mode when mcs plugin is enabled",
+            doc="Allocates nodes in exclusive mode when the mcs plugin is enabled.",
+            action="store_true",
+            tools=Tool.SBATCH,
+        ),
+        PragmaSpec(
+            "oversubscribe",
+            ("-s", "--oversubscribe"),
+            help="oversubscribe resources with other jobs",
+            doc="Allows resources to be oversubscribed with other jobs.",
+            action="store_true",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "overcommit",
+            ("-O", "--overcommit"),
+            help="overcommit resources",
+            doc="Allows resources to be overcommitted for the job.",
+            action="store_true",
+        ),
+    ),
+    # --- 13. Execution Behavior & Signals ---
+    "execution_behavior_and_signals": (
+        PragmaSpec(
+            "hold",
+            ("-H", "--hold"),
+            help="submit job in held state",
+            doc="Submits the job in a held state, preventing immediate execution.",
+            action="store_true",
+        ),
+        PragmaSpec(
+            "immediate",
+            ("-I", "--immediate"),
+            metavar="SECS",
+            help='exit if resources not available in "secs"',
+            doc="Exits if resources are not available within the specified seconds.",
+            nargs="?",
+            const="0",
+        ),
+        PragmaSpec(
+            "reboot",
+            ("--reboot",),
+            help="reboot compute nodes before starting job",
+            doc="Reboots compute nodes before starting the job.",
+            action="store_true",
+        ),
+        PragmaSpec(
+            "delay_boot",
+            ("--delay-boot",),
+            metavar="MINS",
+            help="delay boot for desired node features",
+            doc="Delays node boot for desired features before job execution.",
+        ),
+        PragmaSpec(
+            "no_kill",
+            ("-k", "--no-kill"),
+            help="do not kill job on node failure",
+            doc="Prevents job termination on node failure.",
+            action="store_true",
+        ),
+        PragmaSpec(
+            "kill_command",
+            ("-K", "--kill-command"),
+            metavar="SIGNAL",
+            help="signal to send terminating job",
+            doc="Specifies the signal to send when terminating the job.",
+            nargs="?",
+            const="TERM",
+            tools=Tool.SBATCH | Tool.SALLOC,
+        ),
+        PragmaSpec(
+            "signal",
+            ("--signal",),
+            metavar="[R:]NUM[@TIME]",
+            help="send signal when time limit within time seconds",
+            doc="Sends a signal when the time limit is within the specified seconds.",
+        ),
+    ),
+    # --- 14. Advanced / Hardware / Misc ---
+    "advanced_hardware_misc": (
+        PragmaSpec(
+            "core_spec",
+            ("-S", "--core-spec"),
+            metavar="CORES",
+            help="count of reserved cores",
+            doc="Sets the count of reserved cores for the job.",
+        ),
+        PragmaSpec(
+            "thread_spec",
+            ("--thread-spec",),
+            metavar="THREADS",
+            help="count of reserved threads",
+            doc="Sets the count of reserved threads for the job.",
+        ),
+        PragmaSpec(
+            "cpu_freq",
+            ("--cpu-freq",),
+            metavar="MIN[-MAX[:GOV]]",
+            help="requested cpu frequency (and governor)",
+            doc="Requests CPU frequency and governor settings for the job.",
+        ),
+        PragmaSpec(
+            "tmp",
+            ("--tmp",),
+            metavar="MB",
+            help="minimum amount of temporary disk",
+            doc="Sets the minimum amount of temporary disk required for the job.",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "resv_ports",
+            ("--resv-ports",),
+            help="reserve communication ports",
+            doc="Reserves communication ports for the job.",
+            action="store_true",
+        ),
+        PragmaSpec(
+            "switches",
+            ("--switches",),
+            metavar="MAX_SWITCHES[@MAX_TIME]",
+            help="optimum switches and max time to wait for optimum",
+            doc="Sets optimum switches and maximum wait time for optimum.",
+            tools=_LAUNCHERS | Tool.SCONTROL,
+        ),
+        PragmaSpec(
+            "power",
+            ("--power",),
+            metavar="FLAGS",
+            help="power management options",
+            doc="Sets power management options for the job.",
+            tools=Tool.SBATCH,
+        ),
+        PragmaSpec(
+            "profile",
+            ("--profile",),
+            metavar="VALUE",
+            help="enable acct_gather_profile for detailed data",
+            doc="Enables acct_gather_profile for detailed job data collection.",
+        ),
+    ),
+    # --- 15. Plugins (Burst Buffer & Containers) ---
+    "plugins": (
+        PragmaSpec(
+            "burst_buffer",
+            ("--bb",),
+            metavar="SPEC",
+            help="burst buffer specifications",
+            doc="Specifies burst buffer specifications for the job.",
+        ),
+        PragmaSpec(
+            "bb_file",
+            ("--bbf",),
+            metavar="FILE_NAME",
+            help="burst buffer specification file",
+            doc="Specifies a burst buffer specification file for the job.",
+        ),
+        PragmaSpec(
+            "container",
+            ("--container",),
+            metavar="PATH",
+            help="Path to OCI container bundle",
+            doc="Specifies the path to an OCI container bundle for the job.",
+        ),
+        PragmaSpec(
+            "container_id",
+            ("--container-id",),
+            metavar="ID",
+            help="OCI container ID",
+            doc="Specifies the OCI container ID for the job.",
+        ),
+    ),
+}
+
+# arg_varname -> (pragma_type, pragma_id, spec)
+_SPECS_BY_KEY: Dict[str, Tuple[PragmaTypes, int, PragmaSpec]] = {
+    spec.arg_varname: (pragma_type, pragma_id, spec)
+    for pragma_type, specs in PRAGMA_SPECS.items()
+    for pragma_id, spec in enumerate(specs)
+}
+_CLASS_NAMES = {spec.class_name: key for key, (_, _, spec) in _SPECS_BY_KEY.items()}
+_pragma_classes: Dict[str, Type[Pragma]] = {}
+
+
+def _build_pragma_cls(key: str) -> Type[Pragma]:
+    """Create the Pragma class of an option from its spec.
 
-    """
+    Args:
+        key: The arg_varname of the option, e.g. ``"job_name"``.
 
-    pragma_id = 6
-    pragma_type = "advanced_hardware_misc"
-    arg_varname = "power"
-    flags = ["--power"]
-    dest = "--power"
-    metavar = "FLAGS"
-    help = "power management options"
-    type = str
+    Returns:
+        The Pragma subclass, e.g. ``Job_name``.
+    """
+    pragma_type, pragma_id, spec = _SPECS_BY_KEY[key]
+    name = spec.class_name
+    return type(
+        name,
+        (Pragma,),
+        {
+            "__module__": __name__,
+            "__qualname__": name,
+            "__slots__": (),
+            "__doc__": f"Represents the SLURM #SBATCH {spec.dest} pragma.\n\n{spec.doc}",
+            "pragma_id": pragma_id,
+            "pragma_type": pragma_type,
+            "arg_varname": spec.arg_varname,
+            "flags": list(spec.flags),
+            "dest": spec.dest,
+            "metavar": spec.metavar,
+            "help": spec.help,
+            "example": spec.example,
+            "type": spec.type,
+            "nargs": spec.nargs,
+            "const": spec.const,
+            "choices": None if spec.choices is None else list(spec.choices),
+            "action": spec.action,
+            "default": spec.default,
+            "parser": None if spec.parser is None else staticmethod(spec.parser),
+            "conflicts": spec.conflicts,
+            "tools": spec.tools,
+        },
+    )
+
+
+def _get_pragma_cls(key: str) -> Type[Pragma]:
+    """Return the Pragma class of an option, building it on first use."""
+    pragma_cls = _pragma_classes.get(key)
+    if pragma_cls is None:
+        # setdefault, so that threads racing to build a class agree on one.
+        pragma_cls = _pragma_classes.setdefault(key, _build_pragma_cls(key))
+        globals()[pragma_cls.__name__] = pragma_cls
+    return pragma_cls
+
+
+def __getattr__(name: str) -> Any:
+    # Pragma classes (`pragmas.Nodes`) and `pragmas_ordered` are created on
+    # first access rather than at import time.
+    if name in _CLASS_NAMES:
+        return _get_pragma_cls(_CLASS_NAMES[name])
+    if name == "pragmas_ordered":
+        ordered = [_get_pragma_cls(key) for key in _SPECS_BY_KEY]
+        globals()["pragmas_ordered"] = ordered
+        return ordered
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *_CLASS_NAMES, "pragmas_ordered"})
+
+
+# Options (SLURM 25.05) that have no Pragma class, with the commands that
+# accept them. An UnknownPragma of one of these knows where it may be passed.
+# The sbatch ones also take part in deciding which abbreviations are
+# unambiguous: sbatch rejects `--ex` since it could mean `--exclude`,
+# `--exclusive` or `--export`, so we must not read it as Exclude.
+UNMODELLED_OPTIONS: Dict[str, Tool] = {
+    "--acctg-freq": _LAUNCHERS,
+    "--batch": Tool.SBATCH,
+    "--consolidate-segments": Tool.SALLOC,
+    "--container-type": Tool.SALLOC,
+    "--exclusive": _LAUNCHERS,
+    "--export": Tool.SBATCH | Tool.SRUN,
+    "--export-file": Tool.SBATCH,
+    "--extra": _LAUNCHERS | Tool.SCONTROL,
+    "--gid": Tool.SBATCH | Tool.SRUN,
+    "--help": Tool.SBATCH,
+    "--ignore-pbs": Tool.SBATCH,
+    "--input": Tool.SBATCH | Tool.SRUN,
+    "--kill-on-invalid-dep": Tool.SBATCH,
+    "--mem-update": Tool.SALLOC,
+    "--network": _LAUNCHERS,
+    "--no-bell": Tool.SALLOC,
+    "--no-requeue": Tool.SBATCH,
+    "--no-shell": Tool.SALLOC,
+    "--ntasks-per-gpu": _LAUNCHERS,
+    "--open-mode": Tool.SBATCH | Tool.SRUN,
+    "--parsable": Tool.SBATCH,
+    "--prefer": _LAUNCHERS | Tool.SCONTROL,
+    "--propagate": Tool.SBATCH | Tool.SRUN,
+    "--requeue": Tool.SBATCH | Tool.SCONTROL,
+    "--resources": Tool.SALLOC,
+    "--segment": Tool.SBATCH | Tool.SALLOC,
+    "--spread-segments": Tool.SALLOC,
+    "--stepmgr": Tool.SBATCH | Tool.SALLOC,
+    "--test-only": Tool.SBATCH | Tool.SRUN,
+    "--uid": Tool.SBATCH | Tool.SRUN,
+    "--usage": Tool.SBATCH,
+    "--verbose": _LAUNCHERS,
+    "--version": Tool.SBATCH,
+    "--wait": Tool.SBATCH,
+    "--wait-all-nodes": Tool.SBATCH | Tool.SALLOC,
+    "--wrap": Tool.SBATCH,
+    "--x11": Tool.SALLOC | Tool.SRUN,
+}
+
+SBATCH_UNMODELLED_OPTIONS = frozenset(
+    option for option, tools in UNMODELLED_OPTIONS.items() if tools & Tool.SBATCH
+)
+
+
+def build_flag_index(
+    flags_by_key: Mapping[str, Iterable[str]],
+    unmodelled_options: Iterable[str] = (),
+) -> Dict[str, str]:
+    """Map every flag sbatch would accept for an option to the option's key.
+
+    Besides the short and long flags themselves, sbatch (like any getopt_long
+    program) accepts a long option abbreviated to any prefix that no other
+    long option shares, so ``--job=x`` means ``--job-name=x``.
 
+    Args:
+        flags_by_key: The flags of every option, keyed by its arg_varname.
+        unmodelled_options: Long options that exist but have no class. They
+            are not indexed but make prefixes they share ambiguous.
 
-class Profile(Pragma):
-    """Represents the SLURM #SBATCH --profile pragma.
-    Enables acct_gather_profile for detailed job data collection.
-    Usage: --profile <VALUE>
+    Returns:
+        A dict from flag or unambiguous prefix to the option's arg_varname.
+    """
+    unmodelled = frozenset(unmodelled_options)
+    index: Dict[str, str] = {}
+    for key, flags in flags_by_key.items():
+        for flag in flags:
+            index[flag] = key
+
+    # In sorted order, the options sharing a prefix with an option are its
+    # neighbours, so the prefixes only it has are those longer than the
+    # common prefix with either neighbour.
+    options = sorted({flag for flag in index if flag.startswith("--")} | unmodelled)
+    shared = [_common_prefix_length(a, b) for a, b in zip(options, options[1:])]
+    for i, option in enumerate(options):
+        if option in unmodelled:
+            continue
+        start = max(
+            shared[i - 1] if i > 0 else 0,
+            shared[i] if i < len(shared) else 0,
+            len("--"),
+        )
+        for end in range(start + 1, len(option)):
+            # Exact options always win over abbreviations of longer ones.
+            index.setdefault(option[:end], index[option])
+    return index
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    """Length of the longest common prefix of two strings."""
+    length = 0
+    for char_a, char_b in zip(a, b):
+        if char_a != char_b:
+            break
+        length += 1
+    return length
 
-    Parameters
-    ----------
 
-    Returns
-    -------
+class UnknownPragma(Pragma):
+    """An #SBATCH option this library has no class for.
 
+    Scripts written by hand (or by a newer SLURM release) may contain options
+    that are not modelled here. Rather than dropping or rejecting them,
+    :meth:`SlurmScript.from_script` keeps them in this pragma so that reading a
+    script and writing it back out preserves them verbatim.
     """
 
-    pragma_id = 7
-    pragma_type = "advanced_hardware_misc"
-    arg_varname = "profile"
-    flags = ["--profile"]
-    dest = "--profile"
-    metavar = "VALUE"
-    help = "enable acct_gather_profile for detailed data"
-    type = str
-
-
-# --- 15. Plugins (Burst Buffer & Containers) ---
-class Burst_buffer(Pragma):
-    """Represents the SLURM #SBATCH --bb pragma.
-    Specifies burst buffer specifications for the job.
-    Usage: --bb <SPEC>
-
-    Parameters
-    ----------
+    __slots__ = ("flag",)
 
-    Returns
-    -------
+    pragma_id = 0
+    pragma_type = "other_options"
 
-    """
+    def __new__(cls, flag: str, value: Any = True) -> "UnknownPragma":
+        """Return the pragma of the raw flag as it appeared in the script.
 
-    pragma_id = 0
-    pragma_type = "plugins"
-    arg_varname = "burst_buffer"
-    flags = ["--bb"]
-    dest = "--bb"
-    metavar = "SPEC"
-    help = "burst buffer specifications"
-    type = str
+        Args:
+            flag: The flag as written, e.g. ``"--frobnicate"``.
+            value: The value it was given, or True if it took no value.
+        """
 
+        def create() -> UnknownPragma:
+            pragma = object.__new__(cls)
+            object.__setattr__(pragma, "flag", flag)
+            object.__setattr__(pragma, "value", value)
+            return pragma
 
-class Bb_file(Pragma):
-    """Represents the SLURM #SBATCH --bbf pragma.
-    Specifies a burst buffer specification file for the job.
-    Usage: --bbf <FILE_NAME>
+        return _intern((cls, flag, type(value), value), create)
 
-    Parameters
-    ----------
+    # Every unknown option carries its own flag, which stands in for the
+    # class attributes of a modelled option.
+    @property
+    def dest(self) -> str:
+        return self.flag
 
-    Returns
-    -------
+    @property
+    def flags(self) -> List[str]:
+        return [self.flag]
 
-    """
+    @property
+    def arg_varname(self) -> str:
+        return self.flag
 
-    pragma_id = 1
-    pragma_type = "plugins"
-    arg_varname = "bb_file"
-    flags = ["--bbf"]
-    dest = "--bbf"
-    metavar = "FILE_NAME"
-    help = "burst buffer specification file"
-    type = str
+    @property
+    def tools(self) -> Tool:
+        return UNMODELLED_OPTIONS.get(self.flag, Tool(0))
 
+    def to_arg(self) -> str:
+        return _to_arg(self.flag, self.value)
 
-class Container(Pragma):
-    """Represents the SLURM #SBATCH --container pragma.
-    Specifies the path to an OCI container bundle for the job.
-    Usage: --container <PATH>
+    def __reduce__(self) -> tuple:
+        return (self.__class__, (self.flag, self.value))
 
-    Parameters
-    ----------
+    def render(self, line_length: int = 54) -> str:
+        """Render the #SBATCH line of this pragma as it appeared in the script.
 
-    Returns
-    -------
+        Unknown options are rare, so their lines are not cached.
 
-    """
+        Args:
+            line_length: The column at which the comment starts.
 
-    pragma_id = 2
-    pragma_type = "plugins"
-    arg_varname = "container"
-    flags = ["--container"]
-    dest = "--container"
-    metavar = "PATH"
-    help = "Path to OCI container bundle"
-    type = str
+        Returns:
+            The line, including the trailing newline.
+        """
+        line = self.flag if self.value is True else f"{self.flag}={self.value}"
+        return add_line(f"#SBATCH {line}", comment=self.help, line_length=line_length)
 
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(flag={self.flag!r}, value={self.value!r})"
 
-class Container_id(Pragma):
-    """Represents the SLURM #SBATCH --container-id pragma.
-    Specifies the OCI container ID for the job.
-    Usage: --container-id <ID>
 
-    Parameters
-    ----------
+def split_by_tool(
+    pragmas: Iterable[Pragma], tools: Iterable[Tool] = (Tool.SALLOC, Tool.SRUN)
+) -> Dict[Tool, List[str]]:
+    """Translate pragmas into the command-line arguments of several commands.
 
-    Returns
-    -------
+    Args:
+        pragmas: The pragmas to translate, e.g. ``script.pragmas``.
+        tools: The commands to build arguments for.
 
+    Returns:
+        For each tool, the arguments of the pragmas it accepts, in order.
     """
-
-    pragma_id = 3
-    pragma_type = "plugins"
-    arg_varname = "container_id"
-    flags = ["--container-id"]
-    dest = "--container-id"
-    metavar = "ID"
-    help = "OCI container ID"
-    type = str
-
-
-pragmas_ordered: List[Type[Pragma]] = [
-    # --- Job Identification & Basic Info ---
-    Job_name,
-    Account,
-    Partition,
-    Qos,
-    Clusters,
-    Reservation,
-    Wckey,
-    Mcs_label,
-    Comment,
-    # --- Time & Priority ---
-    Time,
-    Time_min,
-    Begin,
-    Deadline,
-    Priority,
-    Nice,
-    # --- Standard IO & Directory ---
-    Chdir,
-    Output,
-    Error,
-    Disable_output_job_summary,
-    Get_user_env,
-    Quiet,
-    # --- Notifications ---
-    Mail_user,
-    Mail_type,
-    Bell,
-    # --- Dependencies & Job Arrays ---
-    Dependency,
-    Array,
-    # --- Core Node & Task Allocation ---
-    Nodes,
-    Ntasks,
-    Ntasks_per_node,
-    Cpus_per_task,
-    Mincpus,
-    Distribution,
-    Spread_job,
-    Use_min_nodes,
-    # --- CPU Topology & Binding ---
-    Sockets_per_node,
-    Cores_per_socket,
-    Threads_per_core,
-    Ntasks_per_core,
-    Ntasks_per_socket,
-    Extra_node_info,
-    Hint,
-    # --- Memory ---
-    Mem,
-    Mem_per_cpu,
-    Mem_bind,
-    Oom_kill_step,
-    # --- GPUs ---
-    Gpus,
-    Gpus_per_node,
-    Gpus_per_task,
-    Gpus_per_socket,
-    Cpus_per_gpu,
-    Mem_per_gpu,
-    Gpu_bind,
-    Gpu_freq,
-    Nvmps,
-    # --- Generic Resources (GRES/TRES) & Licenses ---
-    Gres,
-    Gres_flags,
-    Tres_bind,
-    Tres_per_task,
-    Licenses,
-    # --- Node Constraints & Specific Selection ---
-    Constraint,
-    Cluster_constraint,
-    Contiguous,
-    Nodelist,
-    Nodefile,
-    Exclude,
-    # --- Exclusivity & Sharing ---
-    Exclusive_user,
-    Exclusive_mcs,
-    Oversubscribe,
-    Overcommit,
-    # --- Execution Behavior & Signals ---
-    Hold,
-    Immediate,
-    Reboot,
-    Delay_boot,
-    No_kill,
-    Kill_command,
-    Signal,
-    # --- Advanced / Hardware / Misc ---
-    Core_spec,
-    Thread_spec,
-    Cpu_freq,
-    Tmp,
-    Resv_ports,
-    Switches,
-    Power,
-    Profile,
-    # --- Plugins (Burst Buffer & Containers) ---
-    Burst_buffer,
-    Bb_file,
-    Container,
-    Container_id,
-]
+    tools = list(tools)
+    args: Dict[Tool, List[str]] = {tool: [] for tool in tools}
+    for pragma in pragmas:
+        accepted = pragma.tools
+        arg = pragma.to_arg()
+        for tool in tools:
+            if accepted & tool:
+                args[tool].append(arg)
+    return args
 
 
-class UnknownPragma(Pragma):
-    """An #SBATCH option this library has no class for.
+class _PragmaRegistry(Mapping[str, Type[Pragma]]):
+    """Read-only ``arg_varname -> Pragma class`` mapping.
 
-    Scripts written by hand (or by a newer SLURM release) may contain options
-    that are not modelled here. Rather than dropping or rejecting them,
-    :meth:`SlurmScript.from_script` keeps them in this pragma so that reading a
-    script and writing it back out preserves them verbatim.
+    Looking up a key builds its class on first use, so code that needs a
+    handful of pragmas never pays for creating all of them.
     """
 
-    pragma_id = 0
-    pragma_type = "other_options"
+    def __getitem__(self, key: str) -> Type[Pragma]:
+        if key not in _SPECS_BY_KEY:
+            raise KeyError(key)
+        return _get_pragma_cls(key)
 
-    def __init__(self, flag: str, value: Any = True):
-        """Initialize the pragma from the raw flag as it appeared in the script.
+    def __contains__(self, key: object) -> bool:
+        return key in _SPECS_BY_KEY
 
-        Args:
-            flag: The flag as written, e.g. ``"--frobnicate"``.
-            value: The value it was given, or True if it took no value.
-        """
-        self.flag = flag
-        # Instance-level overrides of the class attributes, since every unknown
-        # option carries its own flag.
-        self.dest = flag
-        self.flags = [flag]
-        self.arg_varname = flag
-        self.value = value
+    def __iter__(self) -> Iterator[str]:
+        return iter(_SPECS_BY_KEY)
 
-    def __str__(self) -> str:
-        line = self.flag if self.value is True else f"{self.flag}={self.value}"
-        return add_line(f"#SBATCH {line}", comment=self.help)
+    def __len__(self) -> int:
+        return len(_SPECS_BY_KEY)
 
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}(flag={self.flag!r}, value={self.value!r})"
+        return f"{self.__class__.__name__}({list(self)})"
 
 
 class PragmaFactory:
@@ -2333,7 +1471,11 @@ class PragmaFactory:
 
     """
 
-    pragmas = {pragma_cls.arg_varname: pragma_cls for pragma_cls in pragmas_ordered}
+    pragmas: Mapping[str, Type[Pragma]] = _PragmaRegistry()
+    _flag_index = build_flag_index(
+        {key: spec.flags for key, (_, _, spec) in _SPECS_BY_KEY.items()},
+        SBATCH_UNMODELLED_OPTIONS,
+    )
 
     @staticmethod
     def is_valid_pragma_key(key: str) -> bool:
@@ -2384,6 +1526,32 @@ class PragmaFactory:
             raise ValueError(f"Unknown pragma key: {key}")
         return PragmaFactory.pragmas[key](value)
 
+    @staticmethod
+    def create_many(mapping: Mapping[str, Any]) -> List[Pragma]:
+        """Create the pragmas for a whole dict of keys and values at once.
+
+        All keys are validated before any pragma is built, so an invalid dict
+        reports every bad key in one error.
+
+        Args:
+            mapping: Pragma values keyed by arg_varname. Entries whose value
+                is None stand for options that were not given and are skipped.
+
+        Returns:
+            The pragmas, in the order of ``mapping``.
+
+        Raises:
+            ValueError: If any key is not a valid pragma key.
+        """
+        unknown = [key for key in mapping if key not in _SPECS_BY_KEY]
+        if unknown:
+            raise ValueError(f"Unknown pragma keys: {', '.join(unknown)}")
+        return [
+            _get_pragma_cls(key)(value)
+            for key, value in mapping.items()
+            if value is not None
+        ]
+
     @staticmethod
     def flag_to_pragma(flag: str, value: str) -> Pragma | None:
         """Create a Pragma instance based on a flag and value.
@@ -2419,16 +1587,32 @@ class PragmaFactory:
     def flag_to_cls(flag: str) -> Type[Pragma] | None:
         """Look up the Pragma class carrying a given flag.
 
+        Abbreviated long options are resolved the way sbatch resolves them,
+        so ``"--job"`` finds the class of ``"--job-name"``.
+
         Args:
             flag: The flag to look up (e.g. ``"--job-name"`` or ``"-J"``).
 
         Returns:
             The matching Pragma class, or None if the flag is not known.
         """
-        for pragma_cls in PragmaFactory.pragmas.values():
-            if flag in pragma_cls.flags:
-                return pragma_cls
-        return None
+        key = PragmaFactory._flag_index.get(flag)
+        return None if key is None else _get_pragma_cls(key)
+
+    @staticmethod
+    def lookup_many(flags: Iterable[str]) -> List[Type[Pragma] | None]:
+        """Look up the Pragma classes of several flags at once.
+
+        Args:
+            flags: The flags to look up, e.g. all flags of a pragma block.
+
+        Returns:
+            The matching classes in the order of ``flags``, with None for
+            every flag that is not known.
+        """
+        lookup = PragmaFactory._flag_index.get
+        keys = [lookup(flag) for flag in flags]
+        return [None if key is None else _get_pragma_cls(key) for key in keys]
 
     @staticmethod
     def get_pragma_cls(key: str) -> Type[Pragma]:
@@ -2456,8 +1640,5 @@ class PragmaFactory:
 
 
 if __name__ == "__main__":
-    acc = Account("max")
+    acc = PragmaFactory.create_pragma("account", "max")
     print(acc.to_dict())
-
-    # for pragma in PragmaFactory.pragmas.values():
-    #     print(f"{pragma.__name__},")
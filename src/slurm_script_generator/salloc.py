@@ -14,115 +14,10 @@ import sys
 import tempfile
 from typing import List, Tuple
 
-from slurm_script_generator.pragmas import Pragma
+from slurm_script_generator.parse_cache import ParseCache, default_cache_dir
+from slurm_script_generator.pragmas import Pragma, Tool
 from slurm_script_generator.slurm_script import SlurmScript
 
-# Long options accepted by salloc (SLURM 25.05). Pragmas whose flag is not in
-# here are dropped, since passing them would make salloc exit with a usage
-# error. Kept as an allowlist so that sbatch-only options in a script are
-# reported rather than silently forwarded.
-SALLOC_OPTIONS = frozenset(
-    {
-        "--account",
-        "--acctg-freq",
-        "--bb",
-        "--bbf",
-        "--begin",
-        "--bell",
-        "--chdir",
-        "--cluster-constraint",
-        "--clusters",
-        "--comment",
-        "--consolidate-segments",
-        "--constraint",
-        "--container",
-        "--container-id",
-        "--container-type",
-        "--contiguous",
-        "--core-spec",
-        "--cores-per-socket",
-        "--cpu-freq",
-        "--cpus-per-gpu",
-        "--cpus-per-task",
-        "--deadline",
-        "--delay-boot",
-        "--dependency",
-        "--distribution",
-        "--exclude",
-        "--exclusive",
-        "--extra",
-        "--extra-node-info",
-        "--gpu-bind",
-        "--gpu-freq",
-        "--gpus",
-        "--gpus-per-node",
-        "--gpus-per-socket",
-        "--gpus-per-task",
-        "--gres",
-        "--gres-flags",
-        "--hint",
-        "--hold",
-        "--immediate",
-        "--job-name",
-        "--kill-command",
-        "--licenses",
-        "--mail-type",
-        "--mail-user",
-        "--mcs-label",
-        "--mem",
-        "--mem-bind",
-        "--mem-per-cpu",
-        "--mem-per-gpu",
-        "--mem-update",
-        "--mincpus",
-        "--network",
-        "--nice",
-        "--no-bell",
-        "--no-kill",
-        "--no-shell",
-        "--nodefile",
-        "--nodelist",
-        "--nodes",
-        "--ntasks",
-        "--ntasks-per-core",
-        "--ntasks-per-gpu",
-        "--ntasks-per-node",
-        "--ntasks-per-socket",
-        "--oom-kill-step",
-        "--overcommit",
-        "--oversubscribe",
-        "--partition",
-        "--prefer",
-        "--priority",
-        "--profile",
-        "--qos",
-        "--quiet",
-        "--reboot",
-        "--reservation",
-        "--resources",
-        "--resv-ports",
-        "--segment",
-        "--signal",
-        "--sockets-per-node",
-        "--spread-job",
-        "--spread-segments",
-        "--stepmgr",
-        "--switches",
-        "--thread-spec",
-        "--threads-per-core",
-        "--time",
-        "--time-min",
-        "--tmp",
-        "--tres-bind",
-        "--tres-per-task",
-        "--use-min-nodes",
-        "--verbose",
-        "--wait-all-nodes",
-        "--wckey",
-        "--x11",
-    }
-)
-
 
 def pragma_to_salloc_arg(pragma: Pragma) -> str:
     """Render a pragma as a single salloc command-line argument.
@@ -133,14 +28,17 @@ def pragma_to_salloc_arg(pragma: Pragma) -> str:
     Returns:
         Either ``"--flag"`` for a valueless switch or ``"--flag=value"``.
     """
-    if getattr(pragma, "is_flag", False) or pragma.value is True:
-        return pragma.dest
-    return f"{pragma.dest}={pragma.value}"
+    return pragma.to_arg()
 
 
 def salloc_args(script: SlurmScript) -> Tuple[List[str], List[str]]:
     """Split a script's pragmas into salloc arguments and dropped options.
 
+    Options are passed on when their class says salloc accepts them (see
+    :class:`~slurm_script_generator.pragmas.Tool`). Anything else, including
+    options unknown to this library, is reported rather than forwarded, since
+    passing it would make salloc exit with a usage error.
+
     Args:
         script: The parsed batch script.
 
@@ -150,8 +48,8 @@ def salloc_args(script: SlurmScript) -> Tuple[List[str], List[str]]:
     args: List[str] = []
     dropped: List[str] = []
     for pragma in script.pragmas:
-        if pragma.dest in SALLOC_OPTIONS:
-            args.append(pragma_to_salloc_arg(pragma))
+        if pragma.tools & Tool.SALLOC:
+            args.append(pragma.to_arg())
         else:
             dropped.append(pragma.dest)
     return args, dropped
@@ -178,7 +76,10 @@ def script_body(text: str) -> str:
 
 
 def build_command(
-    path: str, run: bool = False, extra_args: List[str] | None = None
+    path: str,
+    run: bool = False,
+    extra_args: List[str] | None = None,
+    cache: ParseCache | None = None,
 ) -> Tuple[List[str], str | None]:
     """Build the salloc command for a batch script.
 
@@ -187,14 +88,25 @@ def build_command(
         run: Whether to execute the script's commands in the allocation
             instead of starting an interactive shell.
         extra_args: Additional arguments to append to the salloc invocation.
+        cache: If given, the pragmas of an unchanged script are taken from
+            this cache instead of being parsed again.
 
     Returns:
         A tuple of (command as an argument list, the body to run or None).
     """
-    with open(path, "r") as f:
-        text = f.read()
-
-    script = SlurmScript.from_script(text)
+    text = None
+    if run:
+        with open(path, "r") as f:
+            text = f.read()
+
+    if cache is not None:
+        script = SlurmScript.read_script(path, cache=cache)
+    elif text is None:
+        # Only the pragmas are needed, which map_script reads without
+        # loading the rest of the script.
+        script = SlurmScript.map_script(path)
+    else:
+        script = SlurmScript.from_script(text)
     args, dropped = salloc_args(script)
     if dropped:
         print(
@@ -252,12 +164,26 @@ def main(argv: List[str] | None = None) -> int:
         action="store_true",
         help="Print the salloc command instead of running it.",
     )
+    parser.add_argument(
+        "--parse-cache",
+        nargs="?",
+        const=default_cache_dir(),
+        default=None,
+        metavar="DIRECTORY",
+        help=(
+            "Keep parsed scripts in an on-disk cache, so that an unchanged "
+            f"script is not parsed again (default: {default_cache_dir()})."
+        ),
+    )
     args = parser.parse_args(argv)
 
     if not os.path.isfile(args.script):
         parser.error(f"No such script: {args.script}")
 
-    command, body = build_command(args.script, run=args.run, extra_args=extra_args)
+    cache = None if args.parse_cache is None else ParseCache(args.parse_cache)
+    command, body = build_command(
+        args.script, run=args.run, extra_args=extra_args, cache=cache
+    )
 
     if body is not None and not body.strip():
         print(
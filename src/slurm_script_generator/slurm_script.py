@@ -1,18 +1,173 @@
+import functools
+import glob
+import io
+import itertools
 import json
+import mmap
 import os
-import re
 import subprocess
 from importlib.metadata import version
 from pathlib import Path
-from typing import Any, List
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    NamedTuple,
+    Tuple,
+    get_args,
+)
 
+from slurm_script_generator import binary
+from slurm_script_generator.bundle import BundleEntry, write_bundle
+from slurm_script_generator.parse_cache import ParseCache
 from slurm_script_generator.pragmas import (
     Pragma,
     PragmaFactory,
     PragmaTypes,
     UnknownPragma,
 )
-from slurm_script_generator.utils import add_line
+from slurm_script_generator.templates import CompiledTemplate
+from slurm_script_generator.tokenizer import MODULE, PRAGMA, tokenize
+from slurm_script_generator.utils import add_line, placeholder_pattern
+from slurm_script_generator.validation import Diagnostic, validate_pragmas
+from slurm_script_generator.writers import HashManifest, write_atomic
+
+
+@functools.lru_cache(maxsize=None)
+def _header() -> str:
+    """The header naming the package version, read from metadata once."""
+    v = version("slurm-script-generator")
+    return f"""########################################################
+#            This script was generated using           #
+#             slurm-script-generator v{v}            #
+# https://github.com/max-models/slurm-script-generator #
+#      `pip install slurm-script-generator=={v}`     #
+########################################################\n
+"""
+
+
+class _Layout(NamedTuple):
+    """The fixed lines of a script for one line length."""
+
+    separator: str
+    section_gap: str
+    section_titles: Dict[str, str]
+    module_purge: str
+    module_list: str
+
+
+@functools.lru_cache(maxsize=64)
+def _layout(line_length: int) -> _Layout:
+    return _Layout(
+        separator="#" * (line_length + 2) + "\n",
+        section_gap=add_line("#", "", line_length=line_length),
+        section_titles={
+            pragma_type: add_line(
+                f"# Pragmas for {pragma_type.replace('_', ' ').title()}",
+                comment="",
+                line_length=line_length,
+            )
+            for pragma_type in _PRAGMA_TYPES
+        },
+        module_purge=add_line("module purge", "Purge modules", line_length=line_length),
+        module_list=add_line(
+            "module list", "List loaded modules", line_length=line_length
+        ),
+    )
+
+
+_PRAGMA_TYPES: Tuple[PragmaTypes, ...] = get_args(PragmaTypes)
+
+# Keys of a sweep point that derive() takes besides pragma keys.
+_DERIVE_PARAMS = frozenset({"modules", "custom_commands", "line_length"})
+
+
+def _echo_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Pass lines through, printing each of them (for verbose parsing)."""
+    for line in lines:
+        text = line.rstrip("\r\n")
+        print(f"Processing line: '{text}'")
+        yield line
+
+
+class SweepPoint(NamedTuple):
+    """One point of a parameter sweep, see :meth:`SlurmScript.sweep`."""
+
+    index: int
+    params: Dict[str, Any]
+    script: "SlurmScript"
+
+
+class ReadResult(NamedTuple):
+    """One script read by :meth:`SlurmScript.read_scripts`."""
+
+    path: str
+    # None if the script could not be read.
+    script: "SlurmScript | None"
+    # Why the script could not be read, e.g. "ValueError: Pragma ...".
+    error: str | None = None
+
+
+def _build_pragmas(
+    pragma_lines: List[Tuple[str, str | None, str]],
+) -> List[Pragma]:
+    """Create the pragmas of (flag, value, line) tuples read from a script."""
+    pragma_classes = PragmaFactory.lookup_many(flag for flag, _, _ in pragma_lines)
+    pragmas = []
+    for pragma_cls, (flag, value, line) in zip(pragma_classes, pragma_lines):
+        if pragma_cls is None:
+            # Keep options we do not model, so that reading a script
+            # and writing it back out does not silently drop them.
+            pragmas.append(
+                UnknownPragma(flag=flag, value=True if value is None else value)
+            )
+        elif value is None and not pragma_cls.action == "store_true":
+            raise ValueError(f"Pragma '{flag}' requires a value: '{line.strip()}'")
+        else:
+            pragmas.append(pragma_cls(True if value is None else value))
+    return pragmas
+
+
+def _describe(exc: Exception) -> str:
+    return f"{type(exc).__name__}: {exc}"
+
+
+def _read_chunk(
+    paths: List[str], cache: ParseCache | None
+) -> List[Tuple[str, bytes | None, str | None]]:
+    """Parse scripts in a worker process, returning their binary encoding.
+
+    Bytes are far cheaper to send back than pickled SlurmScript objects.
+    """
+    results = []
+    for path in paths:
+        try:
+            data = SlurmScript.read_script(path, cache=cache).to_bytes()
+        except Exception as exc:
+            results.append((path, None, _describe(exc)))
+        else:
+            results.append((path, data, None))
+    return results
+
+
+def _decode_chunk(
+    results: List[Tuple[str, bytes | None, str | None]],
+) -> Iterator[ReadResult]:
+    for path, data, error in results:
+        if data is None:
+            yield ReadResult(path, None, error)
+        else:
+            yield ReadResult(path, SlurmScript.from_bytes(data))
+
+
+_SHARED_MODULES = 1
+_SHARED_COMMANDS = 2
 
 
 class SlurmScript:
@@ -212,6 +367,20 @@ class SlurmScript:
         Line length for formatting output.
     """
 
+    __slots__ = (
+        "_modules",
+        "_custom_commands",
+        "_line_length",
+        "_fingerprint",
+        "_sections",
+        "_sections_line_length",
+        "_pragma_view",
+        "_pragma_dict",
+        "_origin",
+        "_shared",
+        "_body",
+    )
+
     def __init__(
         self,
         account: str | None = None,
@@ -317,24 +486,26 @@ class SlurmScript:
         self._modules = []
         self._custom_commands = []
         self._line_length = line_length
-        self._pragma_dict = {
-            "job_config": [],
-            "time_and_priority": [],
-            "io_and_directory": [],
-            "notifications": [],
-            "dependencies_and_arrays": [],
-            "core_node_and_task_allocation": [],
-            "cpu_topology_and_binding": [],
-            "memory": [],
-            "gpus": [],
-            "generic_resources_and_licenses": [],
-            "node_constraints_and_selection": [],
-            "exclusivity_and_sharing": [],
-            "execution_behavior_and_signals": [],
-            "advanced_hardware_misc": [],
-            "plugins": [],
-            "other_options": [],
-        }
+        # Cached (fingerprint, hash); reset by every mutator.
+        self._fingerprint = None
+        # Rendered text per section (pragma type or "modules") for
+        # _sections_line_length; a mutator drops only its own section.
+        self._sections: Dict[str, str] | None = None
+        self._sections_line_length = None
+        # Cached flattened tuple of all pragmas; reset by add_pragma.
+        self._pragma_view = None
+        # Pragmas by type, each keyed by dest in insertion order. Only types
+        # with pragmas have a bucket.
+        self._pragma_dict: Dict[PragmaTypes, Dict[str, Pragma]] = {}
+        # Copy-on-write state shared with derived scripts (see derive): an
+        # outer dict whose buckets must not be mutated in place, and the
+        # _SHARED_* bits of the lists that must be copied before writing.
+        self._origin: Dict[PragmaTypes, Dict[str, Pragma]] | None = None
+        self._shared = 0
+        # (path, offset, size, mtime_ns) of the unparsed body of a script from
+        # map_script; _modules and _custom_commands are unset until it is
+        # parsed. No file is held open in the meantime.
+        self._body: Tuple[str, int, int, int] | None = None
 
         # Pragma dict for creating pragmas from individual parameters
         pragma_params = {
@@ -432,10 +603,7 @@ class SlurmScript:
         self.add_pragmas(pragmas=pragmas)
 
         # Add pragmas from individual parameters
-        for name, param in pragma_params.items():
-            if param is not None:
-                pragma = PragmaFactory.create_pragma(name, param)
-                self.add_pragma(pragma=pragma)
+        self.add_pragmas(pragmas=PragmaFactory.create_many(pragma_params))
 
         # Handle modules
         self.add_modules(modules=modules)
@@ -464,7 +632,8 @@ class SlurmScript:
         if command is None:
             return
         assert isinstance(command, str)
-        self._custom_commands.append(command)
+        self._writable_commands().append(command)
+        self._changed()
 
     def add_custom_commands(self, commands: List[str] | None) -> None:
         """Add multiple custom commands to the script.
@@ -501,7 +670,11 @@ class SlurmScript:
             return
         assert isinstance(module, str)
         if module not in self._modules:
+            if self._shared & _SHARED_MODULES:
+                self._modules = list(self._modules)
+                self._shared &= ~_SHARED_MODULES
             self._modules.append(module)
+            self._changed("modules")
 
     def add_modules(self, modules: List[str] | None) -> None:
         """Add multiple modules to the script.
@@ -542,9 +715,11 @@ class SlurmScript:
         assert os.path.isfile(
             path
         ), f"Inlined script '{path}' does not exist or is not a file."
+        commands = self._writable_commands()
         with open(path, "r") as f:
             for line in f.readlines():
-                self._custom_commands.append(line.strip())
+                commands.append(line.strip())
+        self._changed()
 
     def add_inlined_scripts(self, paths: List[str] | None) -> None:
         """Add lines from multiple inlined script files to the custom commands.
@@ -564,6 +739,65 @@ class SlurmScript:
         for path in paths:
             self.add_inlined_script(path)
 
+    def _changed(self, section: str | None = None) -> None:
+        """Drop the cached fingerprint and the rendered text of *section*.
+
+        The custom commands are rendered afresh every time, so changing them
+        only drops the fingerprint.
+        """
+        self._fingerprint = None
+        if section is not None and self._sections is not None:
+            self._sections.pop(section, None)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes that are not set, i.e. the modules and
+        # commands of a script from map_script before its body is parsed.
+        if name in ("_modules", "_custom_commands") and self._body is not None:
+            self._load_body()
+            return object.__getattribute__(self, name)
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    def _load_body(self) -> None:
+        """Parse the modules and commands of a script from map_script."""
+        path, offset, size, mtime_ns = self._body
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                raise ValueError(f"Script changed since it was mapped: '{path}'")
+            f.seek(offset)
+            text = f.read().decode()
+        # The body starts at a line that ends the header, so from_lines reads
+        # any #SBATCH line in it as a command, as it would in the whole file.
+        body = SlurmScript.from_lines(text.splitlines())
+        self._modules = body._modules
+        self._custom_commands = body._custom_commands
+        self._body = None
+
+    def _writable_commands(self) -> List[str]:
+        """The custom commands list, copied first if it is shared."""
+        if self._shared & _SHARED_COMMANDS:
+            self._custom_commands = list(self._custom_commands)
+            self._shared &= ~_SHARED_COMMANDS
+        return self._custom_commands
+
+    def _writable_bucket(self, pragma_type: PragmaTypes) -> Dict[str, Pragma]:
+        """The bucket of *pragma_type*, created or copied first if needed."""
+        buckets = self._pragma_dict
+        origin = self._origin
+        if origin is not None:
+            if buckets is origin:
+                buckets = self._pragma_dict = dict(origin)
+            bucket = buckets.get(pragma_type)
+            if bucket is not None and bucket is origin.get(pragma_type):
+                bucket = buckets[pragma_type] = dict(bucket)
+                return bucket
+        bucket = buckets.get(pragma_type)
+        if bucket is None:
+            bucket = buckets[pragma_type] = {}
+        return bucket
+
     # Pragmas
     def add_pragma(self, pragma: Pragma) -> None:
         """Add a Pragma object to the script, replacing any existing pragma with the same destination.
@@ -579,12 +813,10 @@ class SlurmScript:
         """
         assert isinstance(pragma, Pragma)
         pragma_type: PragmaTypes = pragma.pragma_type
-        # Check if pragma with same dest already exists and replace it
-        for i, existing_pragma in enumerate(self._pragma_dict[pragma_type]):
-            if existing_pragma.dest == pragma.dest:
-                self._pragma_dict[pragma_type][i] = pragma
-                return
-        self._pragma_dict[pragma_type].append(pragma)
+        self._changed(pragma_type)
+        self._pragma_view = None
+        # A pragma with the same dest is replaced in place
+        self._writable_bucket(pragma_type)[pragma.dest] = pragma
 
     def add_pragmas(self, pragmas: List[Pragma] | None) -> None:
         """Add multiple Pragma objects to the script.
@@ -638,6 +870,185 @@ class SlurmScript:
         else:
             raise ValueError(f"Unknown parameter key: {key}")
 
+    def derive(self, **overrides: Any) -> "SlurmScript":
+        """Create a variant of the script with some parameters changed.
+
+        The variant shares the unchanged pragmas, modules and custom commands
+        with this script; whichever of the two is changed later copies the
+        part it changes first. A variant therefore costs a few hundred bytes
+        and behaves exactly like a standalone script.
+
+        Parameters
+        ----------
+        **overrides
+            Pragma values keyed by arg_varname, as for the constructor.
+            ``modules`` and ``custom_commands`` replace the lists of this
+            script and ``line_length`` replaces its line length.
+
+        Returns
+        -------
+        SlurmScript
+            The derived script.
+
+        Raises
+        ------
+        ValueError
+            If any other key is not a pragma key.
+
+        """
+        modules = overrides.pop("modules", None)
+        custom_commands = overrides.pop("custom_commands", None)
+        line_length = overrides.pop("line_length", self._line_length)
+        pragmas = PragmaFactory.create_many(overrides)
+
+        # From now on neither script may mutate the shared containers.
+        self._origin = self._pragma_dict
+        self._shared = _SHARED_MODULES | _SHARED_COMMANDS
+
+        script = object.__new__(SlurmScript)
+        script._modules = self._modules
+        script._custom_commands = self._custom_commands
+        script._line_length = line_length
+        script._fingerprint = None
+        script._sections = None
+        script._sections_line_length = None
+        script._pragma_view = self._pragma_view
+        script._pragma_dict = script._origin = self._pragma_dict
+        script._shared = _SHARED_MODULES | _SHARED_COMMANDS
+        script._body = None
+
+        if modules is not None:
+            assert isinstance(modules, list)
+            script._modules = list(dict.fromkeys(modules))
+            script._shared &= ~_SHARED_MODULES
+        if custom_commands is not None:
+            assert isinstance(custom_commands, list)
+            script._custom_commands = list(custom_commands)
+            script._shared &= ~_SHARED_COMMANDS
+        script.add_pragmas(pragmas)
+        return script
+
+    def sweep(
+        self,
+        grid: Mapping[str, List[Any]] | Iterable[Mapping[str, Any]],
+        mode: Literal["product", "zip"] = "product",
+        where: Callable[[Dict[str, Any]], bool] | None = None,
+    ) -> Iterator[SweepPoint]:
+        """Lazily create one derived script per point of a parameter sweep.
+
+        Each point is a dict of parameters. Pragma keys, ``modules``,
+        ``custom_commands`` and ``line_length`` are applied with
+        :meth:`derive`. Every parameter also fills the ``{name}`` placeholders
+        in the custom commands; bash's ``${name}`` is left alone. Points are
+        created one at a time, so a sweep of any size runs in constant memory.
+
+        Parameters
+        ----------
+        grid : dict of lists, or iterable of dicts
+            Either the values of each parameter, combined according to
+            ``mode``, or the points themselves.
+        mode : {"product", "zip"}, optional
+            Whether a dict grid is combined as the Cartesian product of its
+            values or by zipping lists of equal length.
+        where : callable, optional
+            Predicate on the parameters of a point; points for which it returns
+            False are skipped before their script is created.
+
+        Returns
+        -------
+        Iterator[SweepPoint]
+            The points as (index, params, script). The index is the position
+            of the point in the unfiltered sweep, so it does not change with
+            ``where``.
+
+        Raises
+        ------
+        ValueError
+            If ``mode`` is unknown, zipped lists differ in length, or a point
+            has a key that is neither a pragma key nor used as a placeholder.
+
+        """
+        if isinstance(grid, Mapping):
+            names = tuple(grid)
+            if mode == "product":
+                combos = itertools.product(*grid.values())
+            elif mode == "zip":
+                if len({len(values) for values in grid.values()}) > 1:
+                    raise ValueError("Zipped sweep parameters differ in length")
+                combos = zip(*grid.values())
+            else:
+                raise ValueError(f"Unknown sweep mode: {mode}")
+            points = (dict(zip(names, combo)) for combo in combos)
+        else:
+            points = grid
+
+        for index, params in enumerate(points):
+            if where is not None and not where(params):
+                continue
+            yield SweepPoint(index, params, self._derive_point(params))
+
+    def _derive_point(self, params: Mapping[str, Any]) -> "SlurmScript":
+        """Derive the script of one sweep point, see :meth:`sweep`."""
+        overrides = {}
+        templates = []
+        for key, value in params.items():
+            if key in _DERIVE_PARAMS or key in PragmaFactory.pragmas:
+                overrides[key] = value
+            else:
+                templates.append(key)
+
+        commands = params.get("custom_commands", self._custom_commands)
+        pattern = placeholder_pattern(tuple(params))
+        filled = [
+            pattern.sub(lambda match: str(params[match.group(1)]), command)
+            for command in commands
+        ]
+        if filled != commands:
+            overrides["custom_commands"] = filled
+
+        unused = [
+            key for key in templates if not any(f"{{{key}}}" in c for c in commands)
+        ]
+        if unused:
+            raise ValueError(f"Unknown sweep parameters: {', '.join(unused)}")
+        return self.derive(**overrides)
+
+    def compile_template(
+        self,
+        fields: List[str],
+        line_length: int | None = None,
+        include_header: bool = False,
+    ) -> CompiledTemplate:
+        """Compile the script into a template for rendering many variants.
+
+        The script is rendered once; the chosen pragma values and ``{name}``
+        placeholders in the custom commands become slots that are filled in
+        by :meth:`CompiledTemplate.render`. Later changes to this script do
+        not affect the template.
+
+        Parameters
+        ----------
+        fields : list of str
+            Pragma keys (which must be set, and not switches) and placeholder
+            names to make substitutable.
+        line_length : int, optional
+            Line length for formatting output; defaults to the script's.
+        include_header : bool
+            Whether to include the header in the rendered scripts.
+            (Default value = False)
+
+        Returns
+        -------
+        CompiledTemplate
+            The compiled template.
+
+        """
+        if line_length is None:
+            line_length = self._line_length
+        return CompiledTemplate(
+            self, fields, line_length=line_length, include_header=include_header
+        )
+
     def generate_script(
         self, line_length: int = 54, include_header: bool = False
     ) -> str:
@@ -654,71 +1065,111 @@ class SlurmScript:
         -------
 
         """
-        script_str = "#!/bin/bash\n"
+        return "".join(self._chunks(line_length, include_header))
 
-        # Add header
-        SLURM_SCRIPT_HEADER = f"""########################################################
-#            This script was generated using           #
-#             slurm-script-generator v{version("slurm-script-generator")}            #
-# https://github.com/max-models/slurm-script-generator #
-#      `pip install slurm-script-generator=={version("slurm-script-generator")}`     #
-########################################################\n
-"""
-        if include_header:
-            script_str += SLURM_SCRIPT_HEADER
-
-        # Add sbatch pragmas
-        line_separator = "#" * (line_length + 2) + "\n"
-        script_str += add_line(line_separator)
-
-        # Loop over pragmas (ordered by pragma_id)
-        itype = 0
-        for pragma_type in self._pragma_dict:
-            # A switch that was explicitly set to False is not written out.
-            pragmas = [
-                p
-                for p in self._pragma_dict[pragma_type]
-                if not (p.is_flag and not p.value)
-            ]
-            if len(pragmas) > 0:
-                if itype > 0:
-                    script_str += add_line("#", "", line_length=line_length)
-                script_str += add_line(
-                    f"# Pragmas for {pragma_type.replace('_', ' ').title()}",
-                    comment="",
-                    line_length=line_length,
-                )
-                for pragma in sorted(pragmas, key=lambda p: p.pragma_id):
-                    script_str += f"{pragma}"
-                itype += 1
-        script_str += add_line(line_separator)
-
-        # Load modules
-        if len(self.modules) > 0:
-            script_str += add_line(
-                "module purge",
-                "Purge modules",
-                line_length=line_length,
-            )
-            script_str += add_line(
-                f"module load {' '.join(self.modules)}",
-                "modules",
-                line_length=line_length,
-            )
-            script_str += add_line(
-                "module list",
-                "List loaded modules",
-                line_length=line_length,
-            )
+    def write_to(
+        self,
+        fp: IO[str] | IO[bytes],
+        line_length: int | None = None,
+        include_header: bool = True,
+    ) -> None:
+        """Write the SLURM script to an open stream, section by section.
+
+        The script is never assembled as one string, and custom commands
+        (including inlined scripts) are written one line at a time.
 
-        if len(self.custom_commands) > 0:
-            for custom_command in self.custom_commands:
-                script_str += add_line(
-                    f"{custom_command}\n",
-                    line_length=line_length,
+        Parameters
+        ----------
+        fp : text or binary stream
+            The stream to write to. Binary streams get UTF-8.
+        line_length : int, optional
+            Line length for formatting output; defaults to the script's.
+        include_header : bool
+            Whether to include the script header. (Default value = True)
+
+        Returns
+        -------
+
+        """
+        if line_length is None:
+            line_length = self._line_length
+        chunks = self._chunks(line_length, include_header)
+        if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(
+            fp, "mode", ""
+        ):
+            chunks = (chunk.encode() for chunk in chunks)
+        write = fp.write
+        for chunk in chunks:
+            write(chunk)
+
+    def _chunks(self, line_length: int, include_header: bool) -> Iterator[str]:
+        """Yield the text of the script in order, from cached sections."""
+        layout = _layout(line_length)
+        if self._sections is None or line_length != self._sections_line_length:
+            self._sections = {}
+            self._sections_line_length = line_length
+        sections = self._sections
+
+        yield "#!/bin/bash\n"
+        if include_header:
+            yield _header()
+
+        # Add sbatch pragmas, one block per non-empty pragma type
+        yield layout.separator
+        first_block = True
+        buckets = self._pragma_dict
+        for pragma_type in _PRAGMA_TYPES:
+            if not buckets.get(pragma_type):
+                continue
+            block = sections.get(pragma_type)
+            if block is None:
+                block = sections[pragma_type] = self._render_pragmas(
+                    pragma_type, layout, line_length
                 )
+            if block:
+                if not first_block:
+                    yield layout.section_gap
+                first_block = False
+                yield block
+        yield layout.separator
+
+        block = sections.get("modules")
+        if block is None:
+            block = sections["modules"] = self._render_modules(layout, line_length)
+        yield block
+
+        # Commands can be large inlined scripts: neither cached nor copied.
+        for command in self._custom_commands:
+            yield command
+            yield "\n"
+
+    def _render_pragmas(
+        self, pragma_type: PragmaTypes, layout: _Layout, line_length: int
+    ) -> str:
+        """Render the block of one pragma type, ordered by pragma_id."""
+        # A switch that was explicitly set to False is not written out.
+        pragmas = [
+            p
+            for p in self._pragma_dict[pragma_type].values()
+            if not (p.is_flag and not p.value)
+        ]
+        if not pragmas:
+            return ""
+        pragmas.sort(key=lambda p: p.pragma_id)
+        return layout.section_titles[pragma_type] + "".join(
+            p.render(line_length=line_length) for p in pragmas
+        )
 
-        return script_str
+    def _render_modules(self, layout: _Layout, line_length: int) -> str:
+        """Render the module purge/load/list block."""
+        if not self._modules:
+            return ""
+        load = add_line(
+            f"module load {' '.join(self._modules)}",
+            "modules",
+            line_length=line_length,
+        )
+        return layout.module_purge + load + layout.module_list
 
     def to_dict(self) -> dict[str, Any]:
         """Convert the SlurmScript instance to a dictionary representation.
@@ -734,13 +1185,18 @@ class SlurmScript:
         """
         return {
             "pragmas": {pragma.arg_varname: pragma.value for pragma in self.pragmas},
-            "modules": self.modules,
-            "custom_commands": self.custom_commands,
+            "modules": list(self._modules),
+            "custom_commands": list(self._custom_commands),
         }
 
     def save(
-        self, path: str | Path, include_header: bool = True, verbose: bool = False
-    ) -> None:
+        self,
+        path: str | Path,
+        include_header: bool = True,
+        verbose: bool = False,
+        skip_unchanged: bool = False,
+        manifest: HashManifest | None = None,
+    ) -> bool:
         """Save the generated SLURM script to a file.
 
         Parameters
@@ -751,20 +1207,42 @@ class SlurmScript:
             Whether to include the script header.
         verbose : bool
             Whether to enable verbose output. (Default value = False)
+        skip_unchanged : bool
+            Whether to leave the file alone if it already holds this script,
+            as recorded in the hash manifest of its directory (see
+            :class:`~slurm_script_generator.writers.HashManifest`). The file
+            is then written atomically. The manifest is read and written on
+            every call; to save many scripts use
+            :func:`~slurm_script_generator.writers.save_many`, or pass
+            *manifest*. (Default value = False)
+        manifest : HashManifest or None
+            The manifest of the file's directory, kept by the caller across
+            many saves. Implies ``skip_unchanged``; the caller writes it out
+            with :meth:`HashManifest.save` when done. (Default value = None)
 
         Returns
         -------
+        bool
+            Whether the file was written.
 
         """
+        if skip_unchanged or manifest is not None:
+            owned = manifest is None
+            if owned:
+                manifest = HashManifest(os.path.dirname(os.fspath(path)) or ".")
+            timing = write_atomic(self, path, include_header, manifest=manifest)
+            if owned:
+                manifest.save()
+            if verbose:
+                state = "saved to" if timing.written else "unchanged at"
+                print(f"SLURM script {state}: {path}")
+            return timing.written
+
         with open(path, "w") as f:
-            f.write(
-                self.generate_script(
-                    line_length=self.line_length,
-                    include_header=include_header,
-                ),
-            )
+            self.write_to(f, include_header=include_header)
         if verbose:
             print(f"SLURM script saved to: {path}")
+        return True
 
     def submit_job(self, path: str, verbose: bool = False) -> int:
         """Submit the SLURM script as a job using sbatch.
@@ -810,22 +1288,160 @@ class SlurmScript:
             The constructed SlurmScript object.
 
         """
-        script = SlurmScript()
-        # for pragma in data.get("pragmas", []):
-        #     print(f"Creating pragma from dict: {pragma}")
-        for key, value in data.get("pragmas", {}).items():
-            # Unknown options are keyed by their raw flag (see UnknownPragma).
-            if key.startswith("-"):
-                pragma = UnknownPragma(flag=key, value=value)
-            else:
-                pragma = PragmaFactory.create_pragma(key=key, value=value)
-            script.add_pragma(pragma=pragma)
+        script = SlurmScript.from_pragma_mapping(data.get("pragmas", {}))
         script._modules = data.get("modules", [])
         script._custom_commands = data.get("custom_commands", [])
         return script
 
     @staticmethod
-    def read_script(path: str, verbose: bool = False) -> "SlurmScript":
+    def _blank(line_length: int = 54) -> "SlurmScript":
+        """An empty script, without going through the keyword arguments.
+
+        Parameters
+        ----------
+        line_length : int
+            Line length for formatting output. (Default value = 54)
+
+        Returns
+        -------
+        SlurmScript
+            A script without pragmas, modules or commands.
+
+        """
+        script = object.__new__(SlurmScript)
+        script._modules = []
+        script._custom_commands = []
+        script._line_length = line_length
+        script._fingerprint = None
+        script._sections = None
+        script._sections_line_length = None
+        script._pragma_view = None
+        script._pragma_dict = {}
+        script._origin = None
+        script._shared = 0
+        script._body = None
+        return script
+
+    @staticmethod
+    def from_pragma_mapping(
+        mapping: dict[str, Any], line_length: int = 54
+    ) -> "SlurmScript":
+        """Create a SlurmScript from a dict of pragma values in one pass.
+
+        All keys are validated up front and the pragmas are put straight into
+        their sections: the keys of a dict are unique, so there is nothing to
+        replace.
+
+        Parameters
+        ----------
+        mapping : dict[str, Any]
+            Pragma values keyed by arg_varname. Unknown options are keyed by
+            their raw flag (see UnknownPragma), e.g. ``"--frobnicate"``.
+        line_length : int, optional
+            Line length for formatting output.
+
+        Returns
+        -------
+        SlurmScript
+            The constructed SlurmScript object.
+
+        Raises
+        ------
+        ValueError
+            If any key is neither a pragma key nor a raw flag.
+
+        """
+        known = {}
+        unknown = []
+        for key, value in mapping.items():
+            if key.startswith("-"):
+                unknown.append(UnknownPragma(flag=key, value=value))
+            else:
+                known[key] = value
+
+        script = SlurmScript._blank(line_length)
+        for pragma in [*PragmaFactory.create_many(known), *unknown]:
+            script._pragma_dict.setdefault(pragma.pragma_type, {})[pragma.dest] = pragma
+        return script
+
+    @staticmethod
+    def read_scripts(
+        paths_or_glob: Iterable[str | Path] | str | Path,
+        workers: int | None = None,
+        chunksize: int = 64,
+        cache: ParseCache | None = None,
+    ) -> Iterator[ReadResult]:
+        """Read many SLURM scripts in parallel, in a pool of processes.
+
+        Paths are handed to the workers in chunks, and each worker sends back
+        the binary encoding of its scripts (see :meth:`to_bytes`). Results are
+        yielded as their chunk completes, so they do not come in the order of
+        the paths. A script that cannot be read does not stop the others; its
+        result carries the error instead.
+
+        Parameters
+        ----------
+        paths_or_glob : iterable of str, or str
+            The scripts to read, or a glob pattern such as
+            ``"/home/*/jobs/**/*.sh"`` (``**`` matches any number of
+            directories).
+        workers : int, optional
+            Number of worker processes, by default one per CPU. With 1, the
+            scripts are read in this process.
+        chunksize : int
+            Number of scripts sent to a worker at a time. (Default value = 64)
+        cache : ParseCache or None
+            If given, every worker reads scripts through this cache.
+            (Default value = None)
+
+        Returns
+        -------
+        iterator of ReadResult
+            The path, the parsed script or None, and the error if any, of
+            every script.
+
+        """
+        if isinstance(paths_or_glob, (str, Path)):
+            paths = glob.iglob(os.fspath(paths_or_glob), recursive=True)
+        else:
+            paths = map(os.fspath, paths_or_glob)
+        workers = workers or os.cpu_count() or 1
+
+        if workers == 1:
+            for path in paths:
+                try:
+                    script = SlurmScript.read_script(path, cache=cache)
+                except Exception as exc:
+                    yield ReadResult(path, None, _describe(exc))
+                else:
+                    yield ReadResult(path, script)
+            return
+
+        # Imported here: most programs never start a pool.
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        chunks = iter(lambda: list(itertools.islice(paths, chunksize)), [])
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            pending = set()
+            for chunk in chunks:
+                pending.add(pool.submit(_read_chunk, chunk, cache))
+                if len(pending) >= 4 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from _decode_chunk(future.result())
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from _decode_chunk(future.result())
+        finally:
+            # Also when the caller stops early: drop the chunks not started.
+            pool.shutdown(cancel_futures=True)
+
+    @staticmethod
+    def read_script(
+        path: str, verbose: bool = False, cache: ParseCache | None = None
+    ) -> "SlurmScript":
         """Read a SLURM script from a file and parse it into a SlurmScript instance.
 
         Parameters
@@ -834,6 +1450,10 @@ class SlurmScript:
             Path to the script file.
         verbose : bool
             Whether to enable verbose output. (Default value = False)
+        cache : ParseCache or None
+            If given, an unchanged script is taken from this cache instead of
+            being parsed again. Nothing is printed for cached scripts.
+            (Default value = None)
 
         Returns
         -------
@@ -841,9 +1461,76 @@ class SlurmScript:
             The parsed SlurmScript object.
 
         """
+        if cache is not None:
+            return SlurmScript.from_bytes(
+                cache.load(
+                    path,
+                    lambda text: SlurmScript.from_script(
+                        text, verbose=verbose
+                    ).to_bytes(),
+                )
+            )
         with open(path, "r") as f:
-            script_str = f.read()
-        return SlurmScript.from_script(script_str, verbose=verbose)
+            return SlurmScript.from_lines(f, verbose=verbose)
+
+    @staticmethod
+    def map_script(path: str | Path) -> "SlurmScript":
+        """Read the pragmas of a SLURM script, leaving its body for later.
+
+        The file is memory-mapped and only its header, up to the first line
+        that is neither a comment, blank nor an ``#SBATCH`` pragma, is read.
+        Like sbatch, this takes later ``#SBATCH`` lines for commands. The
+        file is closed again once the header is read; the modules and
+        commands are read from it the first time they are needed, so the
+        pragmas of a script with a huge inlined payload are read in
+        milliseconds, without reading the payload into memory.
+
+        Reading the modules or commands raises ValueError if the file has
+        changed in the meantime.
+
+        Parameters
+        ----------
+        path : str
+            Path to the script file.
+
+        Returns
+        -------
+        SlurmScript
+            The parsed SlurmScript object.
+
+        Raises
+        ------
+        ValueError
+            If a pragma that needs a value has none.
+
+        """
+        script = SlurmScript._blank()
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            size = stat.st_size
+            if size == 0:
+                return script
+            pragma_lines = []
+            pos = 0
+            # The mapping only lives as long as the header scan, so mapped
+            # scripts do not each hold a file descriptor.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                while pos < size:
+                    end = mapping.find(b"\n", pos)
+                    end = size if end == -1 else end + 1
+                    line = mapping[pos:end].decode()
+                    token = next(tokenize((line,)), None)
+                    if token is not None:
+                        if token[0] != PRAGMA:
+                            break
+                        pragma_lines.append(token[1:])
+                    pos = end
+        script.add_pragmas(_build_pragmas(pragma_lines))
+
+        if pos < size:
+            del script._modules, script._custom_commands
+            script._body = (os.path.abspath(path), pos, size, stat.st_mtime_ns)
+        return script
 
     @staticmethod
     def from_script(script: str, verbose: bool = False) -> "SlurmScript":
@@ -862,65 +1549,170 @@ class SlurmScript:
             The constructed SlurmScript object.
 
         """
-        lines = script.splitlines()
-        pragmas = []
-        modules = []
-        custom_commands = []
-        for line in lines:
-            if verbose:
-                print(f"Processing line: '{line}'")
-            line = line.strip()
+        return SlurmScript.from_lines(script.splitlines(), verbose=verbose)
 
-            if line.startswith("#SBATCH"):
-                if verbose:
-                    print(f"Found SBATCH pragma line: '{line}'")
-                pragma_line = line[len("#SBATCH") :].strip()
-                if verbose:
-                    print(f"Extracted pragma line: '{pragma_line}'")
+    @staticmethod
+    def from_lines(lines: Iterable[str], verbose: bool = False) -> "SlurmScript":
+        """Parse the lines of a SLURM script and create a SlurmScript instance.
 
-                # Strip a trailing comment. The '#' must start a new word, so
-                # that values containing a '#' (e.g. --comment=a#b) survive.
-                pragma_line = re.split(r"\s+#", pragma_line, maxsplit=1)[0].strip()
-                if not pragma_line:
-                    continue
+        Lines are read one at a time (see :func:`~slurm_script_generator.
+        tokenizer.tokenize`), so an open file can be parsed without reading it
+        into memory first. Like sbatch, only the ``#SBATCH`` lines before the
+        first line that is neither a comment nor blank are read as pragmas;
+        later ones are kept as commands.
 
-                # Split on '=' or whitespace. Valueless switches such as
-                # --hold have no separator at all.
-                if "=" in pragma_line.split(None, 1)[0]:
-                    flag, value = pragma_line.split("=", 1)
-                    value = value.strip()
-                else:
-                    parts = pragma_line.split(None, 1)
-                    flag = parts[0]
-                    value = parts[1].strip() if len(parts) > 1 else None
+        Parameters
+        ----------
+        lines : iterable of str
+            Lines of the script, with or without their line endings.
+        verbose : bool
+            Whether to print each line and pragma as it is parsed.
+            (Default value = False)
+
+        Returns
+        -------
+        SlurmScript
+            The constructed SlurmScript object.
+
+        Raises
+        ------
+        ValueError
+            If a pragma that needs a value has none.
+
+        """
+        if verbose:
+            lines = _echo_lines(lines)
+        # (flag, value, line) of every pragma; their classes are looked up in
+        # one go once the whole script has been read.
+        pragma_lines = []
+        modules = []
+        custom_commands = []
+        in_header = True
+        for kind, text, value, line in tokenize(lines):
+            if kind == PRAGMA and in_header:
                 if verbose:
-                    print(f"Parsing pragma: {flag = }, {value = }")
-
-                pragma_cls = PragmaFactory.flag_to_cls(flag)
-                if pragma_cls is None:
-                    # Keep options we do not model, so that reading a script
-                    # and writing it back out does not silently drop them.
-                    pragmas.append(
-                        UnknownPragma(flag=flag, value=True if value is None else value)
-                    )
-                elif value is None and not pragma_cls.action == "store_true":
-                    raise ValueError(f"Pragma '{flag}' requires a value: '{line}'")
-                else:
-                    pragmas.append(pragma_cls(True if value is None else value))
-            elif line.startswith("#") or line == "":
-                continue
-            elif line.startswith("module load"):
-                module_line = line[len("module load") :]
-                # Drop the trailing comment we add when generating the line.
-                module_line = re.split(r"\s+#", module_line, maxsplit=1)[0]
-                modules.extend(module_line.split())
-            elif line.startswith("module purge") or line.startswith("module list"):
+                    print(f"Parsing pragma: flag = {text!r}, {value = }")
+                pragma_lines.append((text, value, line))
                 continue
+            in_header = False
+            if kind == MODULE:
+                modules.extend(text.split())
             else:
-                custom_commands.append(line)
-        return SlurmScript(
-            pragmas=pragmas, modules=modules, custom_commands=custom_commands
-        )
+                # sbatch ignores #SBATCH lines once the header has ended, so
+                # they are kept as they are rather than read as pragmas.
+                custom_commands.append(line.strip() if kind == PRAGMA else text)
+
+        script = SlurmScript(pragmas=_build_pragmas(pragma_lines), modules=modules)
+        # The list is ours, so it is taken over rather than copied one
+        # command at a time.
+        script._custom_commands = custom_commands
+        return script
+
+    def to_bytes(self) -> bytes:
+        """Encode the SlurmScript in the compact binary format.
+
+        See :mod:`slurm_script_generator.binary` for the layout.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        bytes
+            The encoded script.
+
+        """
+        return binary.encode(self.to_dict())
+
+    @staticmethod
+    def from_bytes(data: bytes) -> "SlurmScript":
+        """Create a SlurmScript instance from its binary encoding.
+
+        Parameters
+        ----------
+        data : bytes
+            A script encoded with :meth:`to_bytes`.
+
+        Returns
+        -------
+        SlurmScript
+            The constructed SlurmScript object.
+
+        """
+        return SlurmScript.from_dict(binary.decode(data))
+
+    @staticmethod
+    def to_binary_file(scripts: Iterable["SlurmScript"], path: str | Path) -> int:
+        """Save many SlurmScript instances to one binary file.
+
+        Parameters
+        ----------
+        scripts : iterable of SlurmScript
+            The scripts to save. They are encoded one at a time.
+        path : str
+            Path to save the file to.
+
+        Returns
+        -------
+        int
+            The number of scripts written.
+
+        """
+        with open(path, "wb") as f:
+            return binary.write_records(f, (script.to_bytes() for script in scripts))
+
+    @staticmethod
+    def iter_binary_file(path: str | Path) -> Iterator["SlurmScript"]:
+        """Read the SlurmScript instances of a file written by :meth:`to_binary_file`.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file to read.
+
+        Returns
+        -------
+        Iterator[SlurmScript]
+            The scripts, read one at a time in the order they were written.
+
+        """
+        with open(path, "rb") as f:
+            for record in binary.iter_records(f):
+                yield SlurmScript.from_bytes(record)
+
+    @staticmethod
+    def to_bundle(
+        scripts: Iterable["SlurmScript"],
+        path: str | Path,
+        names: Iterable[str] | str = "job_{index:05d}.sh",
+        include_header: bool = True,
+    ) -> List[BundleEntry]:
+        """Save many SlurmScript instances into one tar or zip archive.
+
+        See :mod:`slurm_script_generator.bundle`; use
+        :class:`~slurm_script_generator.bundle.Bundle` to read single scripts
+        back, extract or submit them.
+
+        Parameters
+        ----------
+        scripts : iterable of SlurmScript
+            The scripts to save. They are rendered one at a time.
+        path : str
+            Path of the archive; a ``.zip`` suffix makes a zip archive,
+            anything else a tar archive.
+        names : list of str or str, optional
+            One member name per script, or a pattern formatted with the index
+            of each script.
+        include_header : bool
+            Whether to include the script header. (Default value = True)
+
+        Returns
+        -------
+        List[BundleEntry]
+            Name, SHA-256, offset and size of each script.
+
+        """
+        return write_bundle(scripts, path, names=names, include_header=include_header)
 
     def to_json(self, path: str) -> None:
         """Save the SlurmScript instance as a JSON file.
@@ -938,6 +1730,63 @@ class SlurmScript:
         with open(path, "w") as f:
             json.dump(self.to_dict(), f, indent=4)
 
+    @staticmethod
+    def to_jsonl(scripts: Iterable["SlurmScript"], path: str | Path) -> int:
+        """Save many SlurmScript instances as a JSON Lines manifest.
+
+        Each line holds the :meth:`to_dict` of one script.
+
+        Parameters
+        ----------
+        scripts : iterable of SlurmScript
+            The scripts to save. They are written one at a time.
+        path : str
+            Path to save the manifest to.
+
+        Returns
+        -------
+        int
+            The number of scripts written.
+
+        """
+        count = 0
+        with open(path, "w") as f:
+            for script in scripts:
+                f.write(json.dumps(script.to_dict()))
+                f.write("\n")
+                count += 1
+        return count
+
+    @staticmethod
+    def iter_jsonl(path: str | Path) -> Iterator["SlurmScript"]:
+        """Read the SlurmScript instances of a JSON Lines manifest.
+
+        Parameters
+        ----------
+        path : str
+            Path to the manifest. Blank lines are skipped.
+
+        Returns
+        -------
+        Iterator[SlurmScript]
+            The scripts, read one line at a time.
+
+        Raises
+        ------
+        ValueError
+            If a line is not valid JSON; the message names the line.
+
+        """
+        with open(path, "r") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                except ValueError as error:
+                    raise ValueError(f"{path}:{line_number}: {error}") from error
+                yield SlurmScript.from_dict(data)
+
     @staticmethod
     def from_json(path: str) -> "SlurmScript":
         """Load a SlurmScript instance from a JSON file.
@@ -967,7 +1816,43 @@ class SlurmScript:
         """
         if not isinstance(value, SlurmScript):
             return False
-        return self.to_dict() == value.to_dict()
+        if hash(self) != hash(value):
+            return False
+        return self.fingerprint == value.fingerprint
+
+    def __hash__(self) -> int:
+        if self._fingerprint is None:
+            self._compute_fingerprint()
+        return self._fingerprint[1]
+
+    def _compute_fingerprint(self) -> None:
+        fingerprint = (
+            frozenset(self.pragmas),
+            tuple(self._modules),
+            tuple(self._custom_commands),
+        )
+        self._fingerprint = (fingerprint, hash(fingerprint))
+
+    @property
+    def fingerprint(self) -> tuple:
+        """Get the structural fingerprint of the script.
+
+        Two scripts are equal exactly when their fingerprints are. The
+        fingerprint is computed once and cached until the next ``add_*`` call,
+        so comparing and hashing scripts does not rebuild their contents.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        tuple
+            The set of pragmas, the modules and the custom commands.
+
+        """
+        if self._fingerprint is None:
+            self._compute_fingerprint()
+        return self._fingerprint[0]
 
     def to_string(self, include_header: bool = True) -> str:
         """Generate the SLURM script as a string.
@@ -983,7 +1868,9 @@ class SlurmScript:
             The generated script string.
 
         """
-        return self.generate_script(include_header=include_header)
+        buffer = io.StringIO()
+        self.write_to(buffer, include_header=include_header)
+        return buffer.getvalue()
 
     def __str__(self) -> str:
         """
@@ -1008,10 +1895,10 @@ class SlurmScript:
         script_repr = "SlurmScript(\n"
         for pragma in self.pragmas:
             script_repr += f"    {pragma.arg_varname}={repr(pragma.value)},\n"
-        if len(self.modules) > 0:
-            script_repr += f"    modules={repr(self.modules)},\n"
-        if len(self.custom_commands) > 0:
-            script_repr += f"    custom_commands={repr(self.custom_commands)},\n"
+        if len(self._modules) > 0:
+            script_repr += f"    modules={repr(self._modules)},\n"
+        if len(self._custom_commands) > 0:
+            script_repr += f"    custom_commands={repr(self._custom_commands)},\n"
         script_repr += ")"
         return script_repr
 
@@ -1034,27 +1921,180 @@ class SlurmScript:
         return self._line_length
 
     @property
-    def pragmas(self) -> List[Pragma]:
-        """Get the list of Pragma objects in the script.
+    def pragmas(self) -> Tuple[Pragma, ...]:
+        """Get the Pragma objects in the script.
+
+        The tuple is built once and reused until the next ``add_pragma``.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        Tuple[Pragma, ...]
+            All Pragma instances, grouped by pragma type.
+
+        """
+        if self._pragma_view is None:
+            buckets = self._pragma_dict
+            self._pragma_view = tuple(
+                pragma
+                for pragma_type in _PRAGMA_TYPES
+                if pragma_type in buckets
+                for pragma in buckets[pragma_type].values()
+            )
+        return self._pragma_view
+
+    def get_pragma(self, key: str) -> Pragma | None:
+        """Get the pragma set for an option.
+
+        Parameters
+        ----------
+        key : str
+            The pragma key (e.g. ``"time"``), or the raw flag of an
+            unknown option (e.g. ``"--gpu-bind"``).
+
+        Returns
+        -------
+        Pragma or None
+            The pragma, or None if the option is not set.
+
+        Raises
+        ------
+        ValueError
+            If the key is neither a pragma key nor a raw flag.
+
+        """
+        if key.startswith("-"):
+            pragma_type, dest = UnknownPragma.pragma_type, key
+        else:
+            pragma_cls = PragmaFactory.get_pragma_cls(key)
+            pragma_type, dest = pragma_cls.pragma_type, pragma_cls.dest
+        bucket = self._pragma_dict.get(pragma_type)
+        return None if bucket is None else bucket.get(dest)
+
+    def validate(self) -> List[Diagnostic]:
+        """Check the script for option combinations sbatch would reject.
+
+        Use :func:`slurm_script_generator.validation.validate_scripts` to check
+        many scripts at once.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        List[Diagnostic]
+            The problems found, empty if there are none.
+
+        """
+        return validate_pragmas(self.pragmas)
+
+    def _parsed_value(self, key: str) -> Any:
+        """Return the parsed value of the pragma ``key``, or None if unset."""
+        pragma = self.get_pragma(key)
+        return None if pragma is None else pragma.parsed
+
+    @property
+    def time_limit(self) -> float | None:
+        """Get the requested time limit in seconds.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        float or None
+            Seconds (``math.inf`` for an unlimited job), or None if no
+            ``--time`` is set.
+
+        """
+        return self._parsed_value("time")
+
+    @property
+    def requested_cpus(self) -> int:
+        """Get the number of CPUs the job requests.
+
+        Ranges count with their upper end, i.e. the most the job can be given.
+        Unset counts take SLURM's defaults: one node, one task per node and
+        one CPU per task.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        int
+            Number of tasks times CPUs per task.
+
+        """
+        nodes = self._parsed_value("nodes")
+        ntasks = self._parsed_value("ntasks")
+        ntasks_per_node = self._parsed_value("ntasks_per_node")
+        cpus_per_task = self._parsed_value("cpus_per_task")
+
+        max_nodes = 1 if nodes is None else nodes[1]
+        if ntasks is not None:
+            tasks = ntasks[1]
+        elif ntasks_per_node is not None:
+            tasks = max_nodes * ntasks_per_node[1]
+        else:
+            tasks = max_nodes
+        return tasks * (1 if cpus_per_task is None else cpus_per_task[1])
+
+    @property
+    def core_hours(self) -> float | None:
+        """Get the core-hours the job requests: CPUs times time limit.
 
         Parameters
         ----------
 
         Returns
         -------
-        List[Pragma]
-            List of all Pragma instances.
+        float or None
+            Requested core-hours, or None if no ``--time`` is set.
 
         """
-        pragma_list = []
-        for pragma_type in self._pragma_dict:
-            pragma_list.extend(self._pragma_dict[pragma_type])
-        return pragma_list
+        time_limit = self.time_limit
+        if time_limit is None:
+            return None
+        return self.requested_cpus * time_limit / 3600
+
+    @property
+    def requested_memory(self) -> int | None:
+        """Get the total memory the job requests in MiB.
+
+        Computed from ``--mem`` (per node), ``--mem-per-cpu`` or
+        ``--mem-per-gpu`` together with ``--gpus``.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        int or None
+            Total memory in MiB, or None if it cannot be determined.
+
+        """
+        mem = self._parsed_value("mem")
+        if mem is not None:
+            nodes = self._parsed_value("nodes")
+            return mem * (1 if nodes is None else nodes[1])
+        mem_per_cpu = self._parsed_value("mem_per_cpu")
+        if mem_per_cpu is not None:
+            return mem_per_cpu * self.requested_cpus
+        mem_per_gpu = self._parsed_value("mem_per_gpu")
+        gpus = self.get_pragma("gpus")
+        if mem_per_gpu is not None and gpus is not None and str(gpus.value).isdigit():
+            return mem_per_gpu * int(gpus.value)
+        return None
 
     @property
     def modules(self) -> List[str]:
         """Get the list of modules to load in the script.
 
+        The list is a copy: change the modules with :meth:`add_module`.
+
         Parameters
         ----------
 
@@ -1064,12 +2104,15 @@ class SlurmScript:
             List of module names.
 
         """
-        return self._modules
+        return list(self._modules)
 
     @property
     def custom_commands(self) -> List[str]:
         """Get the list of custom commands to run in the script.
 
+        The list is a copy: change the commands with
+        :meth:`add_custom_command`.
+
         Parameters
         ----------
 
@@ -1079,7 +2122,7 @@ class SlurmScript:
             List of custom command strings.
 
         """
-        return self._custom_commands
+        return list(self._custom_commands)
 
     # @property
     # def inlined_scripts(self) -> list:
@@ -0,0 +1,134 @@
+"""Precompiled script templates for rendering many variants of one script.
+
+See :meth:`slurm_script_generator.slurm_script.SlurmScript.compile_template`.
+"""
+
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Tuple
+
+from slurm_script_generator.pragmas import PragmaFactory
+from slurm_script_generator.utils import add_line, placeholder_pattern
+
+if TYPE_CHECKING:
+    from slurm_script_generator.slurm_script import SlurmScript
+
+
+def _line_filler(prefix: str, comment: str, line_length: int) -> Callable[[Any], str]:
+    """Return a function rendering ``prefix + value`` like :func:`add_line`."""
+    # Take the comment tails from add_line itself so the two cannot diverge.
+    padded_tail = add_line("", comment, line_length=line_length)[line_length + 1 :]
+    long_line = "x" * (line_length + 1)
+    long_tail = add_line(long_line, comment, line_length=line_length)[len(long_line) :]
+
+    def fill(value: Any) -> str:
+        line = f"{prefix}{value}"
+        padding = line_length - len(line)
+        if padding < 0:
+            return line + long_tail
+        return line + " " * (padding + 1) + padded_tail
+
+    return fill
+
+
+class CompiledTemplate:
+    """A script rendered once, with slots for the values that change.
+
+    Slots are either pragma values, whose lines are re-padded so that their
+    comments stay aligned, or ``{name}`` placeholders in the custom commands.
+    Rendering a variant only fills the slots and joins the parts.
+
+    Args:
+        script: The script to compile.
+        fields: Pragma keys and command placeholder names to turn into slots.
+        line_length: The column at which comments start.
+        include_header: Whether to include the header in the rendered scripts.
+
+    Raises:
+        ValueError: If a field is a switch or an unset pragma, or is neither a
+            pragma key nor a placeholder used in the custom commands.
+    """
+
+    def __init__(
+        self,
+        script: "SlurmScript",
+        fields: Iterable[str],
+        line_length: int = 54,
+        include_header: bool = False,
+    ) -> None:
+        fields = list(dict.fromkeys(fields))
+        text = script.generate_script(
+            line_length=line_length, include_header=include_header
+        )
+        commands = "".join(f"{command}\n" for command in script.custom_commands)
+        head = text[: len(text) - len(commands)]
+
+        self._parts: List[str] = []
+        # (index into _parts, field, function rendering the part)
+        self._slots: List[Tuple[int, str, Callable[[Any], str]]] = []
+
+        # Pragma lines appear in the head in script order; cut each field's
+        # line out of it.
+        lines = []
+        placeholders = []
+        for field in fields:
+            if field not in PragmaFactory.pragmas:
+                placeholders.append(field)
+                continue
+            pragma = script.get_pragma(field)
+            if pragma is None:
+                raise ValueError(f"Template field '{field}' is not set in the script")
+            if pragma.is_flag:
+                raise ValueError(f"Template field '{field}' is a switch")
+            line = pragma.render(line_length=line_length)
+            # Every line follows a newline, at least the one after "#!/bin/bash".
+            lines.append((head.index("\n" + line) + 1, line, field, pragma))
+
+        position = 0
+        for start, line, field, pragma in sorted(lines, key=lambda item: item[0]):
+            self._parts.append(head[position:start])
+            prefix = f"#SBATCH {pragma.dest.replace('_', '-')}="
+            fill = _line_filler(prefix, pragma.help, line_length)
+            self._slots.append((len(self._parts), field, fill))
+            self._parts.append(line)
+            position = start + len(line)
+        self._parts.append(head[position:])
+
+        # Placeholders are cut out of the custom commands block.
+        pattern = placeholder_pattern(tuple(placeholders))
+        used = set()
+        position = 0
+        for match in pattern.finditer(commands):
+            name = match.group(1)
+            used.add(name)
+            self._parts.append(commands[position : match.start()])
+            self._slots.append((len(self._parts), name, str))
+            self._parts.append(match.group(0))
+            position = match.end()
+        self._parts.append(commands[position:])
+
+        unused = [name for name in placeholders if name not in used]
+        if unused:
+            raise ValueError(f"Unknown template fields: {', '.join(unused)}")
+        self.fields = frozenset(fields)
+
+    def render(self, **values: Any) -> str:
+        """Render the script with some slot values replaced.
+
+        Args:
+            **values: Values keyed by field. Pragma fields that are not given
+                keep the value of the compiled script, placeholders stay as
+                ``{name}``.
+
+        Returns:
+            The script, exactly as ``generate_script`` would render it.
+
+        Raises:
+            ValueError: If a key is not a field of the template.
+        """
+        unknown = values.keys() - self.fields
+        if unknown:
+            raise ValueError(f"Unknown template fields: {', '.join(sorted(unknown))}")
+        parts = self._parts.copy()
+        for index, field, fill in self._slots:
+            if field in values:
+                parts[index] = fill(values[field])
+        return "".join(parts)
@@ -0,0 +1,79 @@
+"""Split the lines of a batch script into pragmas, modules and commands.
+
+Every line is classified by a single match of one compiled regular
+expression, which also extracts the flag and value of a pragma or the module
+names of a ``module load`` line and drops their trailing comments. The outer
+named group of the branch that matched is the last group to close, so
+``Match.lastgroup`` names the kind of the line.
+"""
+
+import re
+from typing import Iterable, Iterator, Tuple
+
+PRAGMA = "pragma"
+MODULE = "module"
+COMMAND = "command"
+
+_LINE = re.compile(
+    r"""
+    \s*
+    (?:
+        (?P<pragma>
+            \#SBATCH\s*
+            (?P<flag>[^\s=]*)
+            # Split on '=' if the first word has one, else on whitespace.
+            # Valueless switches such as --hold have no separator at all.
+            # A value only starts with a '#' right after the '=', as one
+            # after whitespace would start a comment.
+            (?:=\s*(?P<eq>(?:(?:[^\s\#]|(?<==)\#).*?)?)|\s+(?P<ws>[^\s\#].*?))?
+            # A trailing comment must start a new word, so that values
+            # containing a '#' (e.g. --comment=a#b) survive.
+            (?:\s+\#.*)?\s*\Z
+        )
+      | (?P<module>
+            module\ load(?P<modules>.*?)
+            # The trailing comment we add when generating the line.
+            (?:\s+\#.*)?\s*\Z
+            # Lines that load nothing, but still end the header.
+          | module\ purge|module\ list
+        )
+      | (?P<skip>\#|\Z)
+      | (?P<command>.*\S)
+    )
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+Token = Tuple[str, str, str | None, str]
+
+
+def tokenize(lines: Iterable[str]) -> Iterator[Token]:
+    """Classify the lines of a batch script.
+
+    Comments and blank lines are skipped. Lines may keep their line endings,
+    so a file object can be passed as it is.
+
+    Args:
+        lines: The lines of the script.
+
+    Yields:
+        Tuples of (kind, text, value, line). For a ``PRAGMA``, text and value
+        are its flag and value, the value being None for a switch. For a
+        ``MODULE``, text holds the space separated module names, which are
+        none for ``module purge`` and ``module list``, and for a ``COMMAND``
+        the command without surrounding whitespace; their value is None.
+        Line is the line the token was read from.
+    """
+    match = _LINE.match
+    for line in lines:
+        m = match(line)
+        kind = m.lastgroup
+        if kind == COMMAND:
+            yield COMMAND, m[COMMAND], None, line
+        elif kind == PRAGMA:
+            flag, eq, ws = m.group("flag", "eq", "ws")
+            value = ws if eq is None else eq
+            if flag or value is not None:
+                yield PRAGMA, flag, value, line
+        elif kind == MODULE:
+            yield MODULE, m["modules"] or "", None, line
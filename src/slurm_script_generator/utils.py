@@ -1,3 +1,8 @@
+import functools
+import re
+from typing import Tuple
+
+
 def add_line(line, comment=None, line_length=54):
     """Add a line to the script with an optional comment, aligned to the right.
 
@@ -24,3 +29,27 @@ def add_line(line, comment=None, line_length=54):
     else:
         comment = ""
     return line + comment
+
+
+@functools.lru_cache(maxsize=64)
+def placeholder_pattern(names: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile a pattern matching ``{name}`` placeholders for the given names.
+
+    Bash's ``${name}`` is not matched, so commands can still use variables.
+
+    Parameters
+    ----------
+    names : tuple of str
+        The placeholder names.
+
+    Returns
+    -------
+    re.Pattern
+        A pattern whose first group is the name.
+
+    """
+    if not names:
+        # Never matches, rather than matching "{}".
+        return re.compile(r"(?!)")
+    alternatives = "|".join(map(re.escape, sorted(names, key=len, reverse=True)))
+    return re.compile(r"(?<!\$)\{(" + alternatives + r")\}")
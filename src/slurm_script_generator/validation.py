@@ -0,0 +1,125 @@
+"""Check batches of scripts for option combinations sbatch would reject.
+
+Some mistakes, such as ``--mem`` together with ``--mem-per-cpu``, only show up
+when sbatch asks slurmctld to queue the job. :func:`validate_scripts` finds
+them locally, so that a whole sweep can be screened before anything is
+submitted.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Tuple
+
+from slurm_script_generator.pragmas import PRAGMA_SPECS, Pragma
+
+
+@dataclass(frozen=True)
+class Diagnostic:
+    """A problem found in a script."""
+
+    code: str  # "conflict", "invalid-value" or "inconsistent"
+    message: str
+    keys: Tuple[str, ...]  # arg_varnames of the pragmas involved
+
+
+def _conflict_table() -> Dict[str, FrozenSet[str]]:
+    """Collect the declared conflicts of all options, in both directions."""
+    table: Dict[str, set] = {}
+    for specs in PRAGMA_SPECS.values():
+        for spec in specs:
+            for other in spec.conflicts:
+                table.setdefault(spec.arg_varname, set()).add(other)
+                table.setdefault(other, set()).add(spec.arg_varname)
+    return {key: frozenset(others) for key, others in table.items()}
+
+
+_CONFLICTS = _conflict_table()
+
+
+def _check_ntasks_fit(parsed: Dict[str, Any]) -> Diagnostic | None:
+    ntasks, nodes, per_node = (
+        parsed.get("ntasks"),
+        parsed.get("nodes"),
+        parsed.get("ntasks_per_node"),
+    )
+    # Without --nodes, Slurm derives the node count from the other two.
+    if ntasks is None or nodes is None or per_node is None:
+        return None
+    max_nodes = nodes[1]
+    # With --ntasks, --ntasks-per-node is the most tasks a node may get.
+    if ntasks[0] <= max_nodes * per_node[1]:
+        return None
+    return Diagnostic(
+        "inconsistent",
+        f"--ntasks={ntasks[0]} does not fit on {max_nodes} node(s) "
+        f"with --ntasks-per-node={per_node[1]}",
+        ("ntasks", "nodes", "ntasks_per_node"),
+    )
+
+
+def _check_time_min(parsed: Dict[str, Any]) -> Diagnostic | None:
+    time, time_min = parsed.get("time"), parsed.get("time_min")
+    if time is None or time_min is None or time_min <= time:
+        return None
+    return Diagnostic(
+        "inconsistent", "--time-min is longer than --time", ("time_min", "time")
+    )
+
+
+# Checks that relate the parsed values of several options.
+RULES: List[Callable[[Dict[str, Any]], Diagnostic | None]] = [
+    _check_ntasks_fit,
+    _check_time_min,
+]
+
+
+def validate_pragmas(pragmas: Iterable[Pragma]) -> List[Diagnostic]:
+    """Check the pragmas of one script.
+
+    Args:
+        pragmas: The pragmas of the script.
+
+    Returns:
+        The problems found, empty if there are none.
+    """
+    diagnostics: List[Diagnostic] = []
+    by_key = {pragma.arg_varname: pragma for pragma in pragmas}
+
+    parsed: Dict[str, Any] = {}
+    for key, pragma in by_key.items():
+        for other in _CONFLICTS.get(key, ()):
+            # Report each pair once.
+            if other in by_key and key < other:
+                diagnostics.append(
+                    Diagnostic(
+                        "conflict",
+                        f"{pragma.dest} cannot be combined with "
+                        f"{by_key[other].dest}",
+                        (key, other),
+                    )
+                )
+        if pragma.parser is not None:
+            try:
+                parsed[key] = pragma.parsed
+            except ValueError as error:
+                diagnostics.append(Diagnostic("invalid-value", str(error), (key,)))
+
+    for rule in RULES:
+        diagnostic = rule(parsed)
+        if diagnostic is not None:
+            diagnostics.append(diagnostic)
+    return diagnostics
+
+
+def validate_scripts(scripts: Iterable[Any]) -> List[List[Diagnostic]]:
+    """Check a batch of scripts in a single pass.
+
+    Pragmas are interned and cache their parsed values, so a pragma shared by
+    many scripts of a sweep is only parsed once.
+
+    Args:
+        scripts: The SlurmScript objects to check.
+
+    Returns:
+        One list of diagnostics per script, in the order of ``scripts``.
+    """
+    return [validate_pragmas(script.pragmas) for script in scripts]
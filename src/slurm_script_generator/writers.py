@@ -0,0 +1,255 @@
+"""Writing many scripts to disk at once.
+
+Parallel filesystems such as Lustre or GPFS take a long time to open and close
+a file, but handle many of those requests at the same time. :func:`save_many`
+therefore writes from a pool of threads.
+"""
+
+import collections
+import functools
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Callable, Deque, Dict, Iterable, List, NamedTuple
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from slurm_script_generator.slurm_script import SlurmScript
+
+
+class SaveTiming(NamedTuple):
+    """Where one script was written and how long that took."""
+
+    path: str
+    seconds: float
+    # False if the file already held the script and was left alone.
+    written: bool = True
+
+
+# Name of the sidecar file holding the HashManifest of a directory.
+MANIFEST_NAME = ".slurm-script-hashes.json"
+
+
+class HashManifest:
+    """SHA-256 of the scripts written to one directory, in a sidecar file.
+
+    Each entry also records the size and modification time the file had right
+    after it was written. A file whose size or mtime differs was changed by
+    something else and is not trusted, so files never need to be read back
+    to be hashed.
+
+    Args:
+        directory: The directory the scripts are written to.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self._changed = False
+        self._mode = _default_mode()
+        try:
+            with open(self.path) as f:
+                self._entries: Dict[str, List] = json.load(f)
+        except (FileNotFoundError, ValueError):
+            # A missing or damaged manifest only costs rewriting the scripts.
+            self._entries = {}
+
+    def is_current(self, path: str, sha256: str) -> bool:
+        """Whether *path* is known to hold content with this hash."""
+        entry = self._entries.get(os.path.basename(path))
+        if entry is None or entry[0] != sha256:
+            return False
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+        return entry[1:] == [stat.st_size, stat.st_mtime_ns]
+
+    def record(self, path: str, sha256: str) -> None:
+        """Remember that *path* was just written with content of this hash."""
+        stat = os.stat(path)
+        with self._lock:
+            self._entries[os.path.basename(path)] = [
+                sha256,
+                stat.st_size,
+                stat.st_mtime_ns,
+            ]
+            self._changed = True
+
+    def save(self) -> None:
+        """Write the manifest, if anything was recorded since it was read."""
+        if self._changed:
+            _replace(self.path, lambda f: json.dump(self._entries, f), self._mode)
+            self._changed = False
+
+
+def _default_mode() -> int:
+    """The permissions ``open()`` would give a new file under the umask."""
+    return 0o666 & ~_umask()
+
+
+def _umask() -> int:
+    # Linux reports the umask without changing it. os.umask can only read
+    # it by setting it, and any file another thread creates meanwhile would
+    # get the temporary mask, so that is done only once per process.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except OSError:
+        pass
+    return _umask_once()
+
+
+@functools.lru_cache(maxsize=1)
+def _umask_once() -> int:
+    umask = os.umask(0o077)
+    os.umask(umask)
+    return umask
+
+
+def _replace(
+    path: str, write: Callable[[IO], None], mode: int, binary: bool = False
+) -> None:
+    """Call *write* on a temporary file, then rename that file to *path*."""
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=f".{name}.")
+    try:
+        # The file object owns fd from here on, so it is closed on any error.
+        with os.fdopen(fd, "wb" if binary else "w") as f:
+            # mkstemp creates files readable only by their owner.
+            os.fchmod(f.fileno(), mode)
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_atomic(
+    script: "SlurmScript",
+    path: str | Path,
+    include_header: bool = True,
+    mode: int | None = None,
+    manifest: HashManifest | None = None,
+) -> SaveTiming:
+    """Write a script to a temporary file and rename it to *path*.
+
+    The rename is atomic, so *path* holds either its old content or the whole
+    new script, never a partial one, even if the process dies while writing.
+
+    Args:
+        script: The script to write.
+        path: Where to write it.
+        include_header: Whether to include the script header.
+        mode: Permissions of the file; by default those ``open()`` would use.
+        manifest: If given, the file is left alone when the manifest says it
+            already holds the script, and the manifest is updated otherwise.
+
+    Returns:
+        The path, the time taken and whether the file was written.
+    """
+    start = time.perf_counter()
+    path = os.fspath(path)
+    if mode is None:
+        mode = _default_mode()
+    if manifest is None:
+        _replace(
+            path, lambda f: script.write_to(f, include_header=include_header), mode
+        )
+        return SaveTiming(path, time.perf_counter() - start)
+
+    text = script.to_string(include_header=include_header)
+    sha256 = hashlib.sha256(text.encode()).hexdigest()
+    if manifest.is_current(path, sha256):
+        return SaveTiming(path, time.perf_counter() - start, written=False)
+    _replace(path, lambda f: f.write(text), mode)
+    manifest.record(path, sha256)
+    return SaveTiming(path, time.perf_counter() - start)
+
+
+def save_many(
+    scripts: Iterable["SlurmScript"],
+    paths_or_pattern: Iterable[str | Path] | str | Path,
+    workers: int = 8,
+    include_header: bool = True,
+    skip_unchanged: bool = False,
+    verbose: bool = False,
+) -> List[SaveTiming]:
+    """Render and save many scripts concurrently, each written atomically.
+
+    Scripts are taken from *scripts* as the pool is ready for them, so a lazy
+    sweep is never held in memory as a whole.
+
+    With ``skip_unchanged``, a script whose content hash matches the
+    :class:`HashManifest` of its directory is not written again, so its
+    mtime and anything keyed on it stay as they are.
+
+    Args:
+        scripts: The scripts to save.
+        paths_or_pattern: One path per script, or a pattern such as
+            ``"jobs/job_{index:05d}.sh"`` that is formatted with the index of
+            each script.
+        workers: Number of threads writing at the same time.
+        include_header: Whether to include the script header.
+        skip_unchanged: Whether to leave files alone that already hold their
+            script.
+        verbose: Whether to print how many files were written and skipped.
+
+    Returns:
+        The path, time taken and whether it was written of every script, in
+        the order of *scripts*.
+
+    Raises:
+        ValueError: If the pattern does not use ``{index}``, or there are
+            fewer or more paths than scripts.
+    """
+    if isinstance(paths_or_pattern, (str, Path)):
+        pattern = os.fspath(paths_or_pattern)
+        if pattern.format(index=0) == pattern.format(index=1):
+            raise ValueError(f"Pattern '{pattern}' does not use {{index}}")
+        jobs = zip(scripts, (pattern.format(index=i) for i in itertools.count()))
+    else:
+        jobs = zip(scripts, paths_or_pattern, strict=True)
+
+    # Imported here: the package imports this module, and most programs
+    # never start a pool.
+    from concurrent.futures import ThreadPoolExecutor
+
+    mode = _default_mode()
+    manifests: Dict[str, HashManifest] = {}
+    timings = []
+    pending: Deque["Future"] = collections.deque()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for script, path in jobs:
+                manifest = None
+                if skip_unchanged:
+                    directory = os.path.dirname(os.fspath(path)) or "."
+                    manifest = manifests.get(directory)
+                    if manifest is None:
+                        manifest = manifests[directory] = HashManifest(directory)
+                if len(pending) >= 4 * workers:
+                    timings.append(pending.popleft().result())
+                pending.append(
+                    pool.submit(
+                        write_atomic, script, path, include_header, mode, manifest
+                    )
+                )
+            timings.extend(future.result() for future in pending)
+    finally:
+        # Also after an error, so the files written so far are not redone.
+        for manifest in manifests.values():
+            manifest.save()
+
+    if verbose:
+        written = sum(timing.written for timing in timings)
+        print(f"{written} scripts written, {len(timings) - written} unchanged")
+    return timings
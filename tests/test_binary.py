@@ -0,0 +1,122 @@
+import io
+import json
+
+import pytest
+
+from slurm_script_generator import binary
+from slurm_script_generator.pragmas import PragmaFactory, UnknownPragma, pragmas_ordered
+from slurm_script_generator.slurm_script import SlurmScript
+
+
+def _script(**overrides) -> SlurmScript:
+    params = dict(
+        job_name="bin",
+        nodes=2,
+        time="01:00:00",
+        hold=True,
+        modules=["gcc/12"],
+        custom_commands=["srun ./app", "echo ünïcode"],
+    )
+    params.update(overrides)
+    return SlurmScript(**params)
+
+
+def test_script_round_trips():
+    script = _script()
+
+    decoded = SlurmScript.from_bytes(script.to_bytes())
+
+    assert decoded == script
+    assert decoded.to_dict() == script.to_dict()
+
+
+def test_every_pragma_round_trips():
+    pragmas = [
+        cls(True if cls.action == "store_true" else "1") for cls in pragmas_ordered
+    ]
+    script = SlurmScript(pragmas=pragmas)
+
+    assert SlurmScript.from_bytes(script.to_bytes()).to_dict() == script.to_dict()
+
+
+def test_unknown_pragma_round_trips():
+    script = SlurmScript(pragmas=[UnknownPragma("--gpu-bind", "closest")])
+
+    decoded = SlurmScript.from_bytes(script.to_bytes())
+
+    assert decoded.to_dict() == script.to_dict()
+
+
+@pytest.mark.parametrize(
+    "value", [True, False, "", "x" * 300, 0, 5, -3, 2**40, ["a", "b"]]
+)
+def test_values_round_trip(value):
+    data = {"pragmas": {"comment": value}, "modules": [], "custom_commands": []}
+
+    assert binary.decode(binary.encode(data)) == data
+
+
+def test_pragma_ids_are_small():
+    script = SlurmScript(pragmas=[PragmaFactory.create_pragma("nodes", "2")])
+
+    # version, count, id, tag, length, "2", no modules, no commands
+    assert len(script.to_bytes()) == 8
+
+
+def test_encoding_is_smaller_than_json():
+    script = _script()
+
+    assert len(script.to_bytes()) < len(json.dumps(script.to_dict(), indent=4)) / 2
+
+
+def test_unsupported_version_is_rejected():
+    with pytest.raises(ValueError, match="version"):
+        binary.decode(b"\x7f")
+
+
+def test_records_are_read_back_in_order(tmp_path):
+    scripts = [_script(job_name=f"job_{i}") for i in range(5)]
+    path = tmp_path / "scripts.bin"
+
+    assert SlurmScript.to_binary_file(scripts, path) == 5
+
+    assert list(SlurmScript.iter_binary_file(path)) == scripts
+
+
+def test_records_are_read_lazily():
+    fp = io.BytesIO()
+    binary.write_records(fp, [b"a" * 200, b"b"])
+    fp.seek(0)
+
+    records = binary.iter_records(fp)
+
+    assert next(records) == b"a" * 200
+    assert fp.tell() < len(fp.getvalue())
+    assert list(records) == [b"b"]
+
+
+def test_truncated_record_is_rejected():
+    data = binary.encode(
+        {
+            "pragmas": {"nodes": 300, "job_name": "x" * 200, "--frobnicate": True},
+            "modules": ["gcc"],
+            "custom_commands": ["srun ./bin", "y" * 200],
+        }
+    )
+
+    for end in range(len(data)):
+        with pytest.raises(ValueError, match="Truncated record"):
+            binary.decode(data[:end])
+
+
+def test_truncated_record_file_is_rejected():
+    fp = io.BytesIO()
+    binary.write_records(fp, [b"abc"])
+
+    with pytest.raises(ValueError, match="Truncated"):
+        list(binary.iter_records(io.BytesIO(fp.getvalue()[:-1])))
+
+
+def test_foreign_file_is_rejected():
+    with pytest.raises(ValueError, match="Not a file"):
+        list(binary.iter_records(io.BytesIO(b"#!/bin/bash\n")))
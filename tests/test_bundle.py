@@ -0,0 +1,125 @@
+import tarfile
+import zipfile
+from unittest.mock import patch
+
+import pytest
+
+from slurm_script_generator.bundle import (
+    INDEX_NAME,
+    Bundle,
+    BundleEntry,
+    _index_bytes,
+    write_bundle,
+)
+from slurm_script_generator.slurm_script import SlurmScript
+
+
+def _scripts(n: int) -> list:
+    return [SlurmScript(job_name=f"job_{i}", nodes=i + 1) for i in range(n)]
+
+
+@pytest.mark.parametrize("suffix", [".tar", ".zip"])
+def test_scripts_are_read_back_by_name(tmp_path, suffix):
+    path = tmp_path / f"jobs{suffix}"
+    scripts = _scripts(300)
+
+    SlurmScript.to_bundle(iter(scripts), path)
+
+    with Bundle(path) as bundle:
+        assert len(bundle) == 300
+        assert "job_00299.sh" in bundle
+        assert bundle.read("job_00042.sh") == scripts[42].to_string().encode()
+
+
+def test_bundles_are_ordinary_archives(tmp_path):
+    write_bundle(_scripts(2), tmp_path / "jobs.tar", names=["a.sh", "dir/b.sh"])
+    write_bundle(_scripts(2), tmp_path / "jobs.zip", names=["a.sh", "dir/b.sh"])
+
+    with tarfile.open(tmp_path / "jobs.tar") as archive:
+        assert archive.getnames() == ["a.sh", "dir/b.sh", INDEX_NAME]
+    with zipfile.ZipFile(tmp_path / "jobs.zip") as archive:
+        assert archive.namelist() == ["a.sh", "dir/b.sh", INDEX_NAME]
+
+
+def test_index_records_offsets_and_hashes(tmp_path):
+    path = tmp_path / "jobs.tar"
+    entries = write_bundle(_scripts(3), path, include_header=False)
+
+    data = path.read_bytes()
+    entry = entries[1]
+    assert data[entry.offset : entry.offset + entry.size] == (
+        _scripts(3)[1].to_string(include_header=False).encode()
+    )
+    with Bundle(path) as bundle:
+        assert bundle.entries["job_00001.sh"] == entry
+
+
+def test_index_larger_than_a_read_chunk_is_found(tmp_path):
+    path = tmp_path / "jobs.tar"
+    scripts = [SlurmScript(nodes=1)] * 3000
+    entries = write_bundle(scripts, path, include_header=False)
+
+    with Bundle(path) as bundle:
+        assert list(bundle) == [entry.name for entry in entries]
+
+
+def test_read_only_touches_the_requested_member(tmp_path):
+    path = tmp_path / "jobs.tar"
+    write_bundle(_scripts(3), path)
+    with open(path, "r+b") as f:
+        f.seek(700)
+        f.write(b"corrupt")
+
+    with Bundle(path) as bundle:
+        assert bundle.read("job_00002.sh")
+        with pytest.raises(ValueError, match="does not match"):
+            bundle.read("job_00000.sh")
+
+
+def test_extract_writes_the_member(tmp_path):
+    path = tmp_path / "jobs.zip"
+    write_bundle(_scripts(1), path, names=["sub/run.sh"])
+
+    with Bundle(path) as bundle:
+        extracted = bundle.extract("sub/run.sh", tmp_path / "out")
+
+    assert extracted == tmp_path / "out" / "sub" / "run.sh"
+    assert extracted.read_text() == _scripts(1)[0].to_string()
+
+
+def test_submit_passes_the_member_to_sbatch(tmp_path):
+    path = tmp_path / "jobs.tar"
+    write_bundle(_scripts(2), path)
+    completed = type("Completed", (), {"returncode": 0, "stdout": b"Submitted 77"})
+
+    with Bundle(path) as bundle, patch("subprocess.run", return_value=completed) as run:
+        assert bundle.submit("job_00001.sh") == 77
+
+    assert run.call_args.args == (["sbatch"],)
+    assert run.call_args.kwargs["input"] == _scripts(2)[1].to_string().encode()
+
+
+@pytest.mark.parametrize("names", [["../x.sh"], ["/x.sh"], [INDEX_NAME], "same.sh"])
+def test_invalid_names_are_rejected(tmp_path, names):
+    with pytest.raises(ValueError, match="bundle member name"):
+        write_bundle(_scripts(2)[: len(names)], tmp_path / "jobs.tar", names=names)
+
+
+def test_index_names_are_checked_when_loaded(tmp_path):
+    path = tmp_path / "jobs.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("x.sh", b"echo\n")
+        entry = BundleEntry("../evil.sh", "0" * 64, 0, 5)
+        archive.writestr(INDEX_NAME, _index_bytes([entry]))
+
+    with pytest.raises(ValueError, match="Invalid bundle member name"):
+        Bundle(path)
+
+
+def test_plain_archive_is_not_a_bundle(tmp_path):
+    path = tmp_path / "plain.tar"
+    with tarfile.open(path, "w") as archive:
+        archive.add(__file__, arcname="x.py")
+
+    with pytest.raises(ValueError, match="Not a bundle"):
+        Bundle(path)
@@ -1,10 +1,13 @@
 """End-to-end tests of the `generate-slurm-script` command line interface."""
 
 import json
+import os
+import re
 from unittest.mock import patch
 
 import pytest
 
+from slurm_script_generator.bundle import Bundle
 from slurm_script_generator.main import main as cli_main
 from slurm_script_generator.slurm_script import SlurmScript
 
@@ -94,6 +97,64 @@ def test_input_json_is_used_as_a_base(tmp_path, capsys):
     assert "#SBATCH --ntasks-per-node=16" in out
 
 
+def test_input_manifest_writes_one_script_per_record(tmp_path):
+    manifest = tmp_path / "sweep.jsonl"
+    SlurmScript.to_jsonl(
+        [SlurmScript(nodes=n, job_name=f"run_{n}") for n in (1, 2, 4)], manifest
+    )
+
+    run_cli(
+        "--input",
+        str(manifest),
+        "--partition",
+        "gpu",
+        "--output-path",
+        str(tmp_path / "job_{index}.sh"),
+    )
+
+    for index, nodes in enumerate((1, 2, 4)):
+        text = (tmp_path / f"job_{index}.sh").read_text()
+        assert f"#SBATCH --nodes={nodes}" in text
+        assert f"#SBATCH --job-name=run_{nodes}" in text
+        assert "#SBATCH --partition=gpu" in text
+
+
+@pytest.mark.parametrize(
+    "pattern, message",
+    [
+        ("job.sh", "does not use {index}"),
+        ("job_{name}.sh", "may only use the {index} placeholder"),
+        ("job_{index:q}.sh", "Invalid pattern"),
+    ],
+)
+@pytest.mark.parametrize("submit", [False, True])
+def test_input_manifest_with_a_bad_pattern_is_an_error(
+    tmp_path, pattern, message, submit
+):
+    manifest = tmp_path / "sweep.jsonl"
+    SlurmScript.to_jsonl([SlurmScript(nodes=1), SlurmScript(nodes=2)], manifest)
+    args = ["--input", str(manifest), "--output-path", str(tmp_path / pattern)]
+
+    with patch.object(SlurmScript, "submit_job") as submit_job:
+        with pytest.raises(SystemExit, match=re.escape(message)):
+            run_cli(*args, *(["--submit"] if submit else []))
+
+    submit_job.assert_not_called()
+    assert not list(tmp_path.glob("job*"))
+
+
+def test_input_manifest_to_stdout_and_bundle(tmp_path, capsys):
+    manifest = tmp_path / "sweep.jsonl"
+    SlurmScript.to_jsonl([SlurmScript(nodes=1), SlurmScript(nodes=2)], manifest)
+
+    run_cli("--input", str(manifest))
+    run_cli("--input", str(manifest), "--bundle", str(tmp_path / "jobs.zip"))
+
+    assert capsys.readouterr().out.count("#!/bin/bash") == 2
+    with Bundle(tmp_path / "jobs.zip") as bundle:
+        assert list(bundle) == ["job_00000.sh", "job_00001.sh"]
+
+
 def test_read_script_is_used_as_a_base(tmp_path, capsys):
     path = tmp_path / "job.sh"
     SlurmScript(nodes=2, job_name="from_script", modules=["intel"]).save(str(path))
@@ -117,6 +178,20 @@ def test_read_script_overrides_existing_pragma(tmp_path, capsys):
     assert "#SBATCH --nodes=2" not in out
 
 
+def test_read_script_with_a_parse_cache(tmp_path, capsys):
+    path = tmp_path / "job.sh"
+    SlurmScript(nodes=2, job_name="cached").save(str(path))
+    directory = tmp_path / "cache"
+
+    run_cli("--read-script", str(path), "--parse-cache", str(directory))
+    first = capsys.readouterr().out
+    run_cli("--read-script", str(path), "--parse-cache", str(directory))
+
+    assert capsys.readouterr().out == first
+    assert "#SBATCH --job-name=cached" in first
+    assert len(os.listdir(directory)) == 1
+
+
 def test_read_script_keeps_unknown_pragmas(tmp_path, capsys):
     path = tmp_path / "job.sh"
     path.write_text("#!/bin/bash\n#SBATCH --frobnicate=1\n#SBATCH --exclusive\n")
@@ -128,6 +203,38 @@ def test_read_script_keeps_unknown_pragmas(tmp_path, capsys):
     assert "#SBATCH --exclusive" in out
 
 
+def test_bundle_writes_an_archive(tmp_path):
+    path = tmp_path / "jobs.tar"
+
+    run_cli("--nodes", "2", "--bundle", str(path), "--output-path", "run.sh")
+
+    with Bundle(path) as bundle:
+        assert list(bundle) == ["run.sh"]
+        assert "#SBATCH --nodes=2" in bundle.read("run.sh").decode()
+
+
+@pytest.mark.parametrize("output", ["./run.sh", "/tmp/run.sh", "../run.sh"])
+def test_bundle_member_name_is_relative(tmp_path, output):
+    path = tmp_path / "jobs.tar"
+
+    run_cli("--nodes", "2", "--bundle", str(path), "--output-path", output)
+
+    with Bundle(path) as bundle:
+        assert list(bundle) == ["run.sh"]
+
+
+def test_invalid_bundle_member_name_is_an_error(tmp_path):
+    with pytest.raises(SystemExit, match="Error: Invalid bundle member name"):
+        run_cli(
+            "--nodes",
+            "2",
+            "--bundle",
+            str(tmp_path / "b.tar"),
+            "--output-path",
+            ".bundle-index.json",
+        )
+
+
 def test_submit_requires_output_path(capsys):
     run_cli("--nodes", "1", "--submit")
 
@@ -0,0 +1,153 @@
+import os
+import time
+
+import pytest
+
+from slurm_script_generator.parse_cache import ParseCache
+from slurm_script_generator.slurm_script import SlurmScript
+
+SCRIPT = """#!/bin/bash
+#SBATCH --job-name=cached
+#SBATCH --nodes=2
+#SBATCH --frobnicate=1
+
+module load intel
+srun ./bin > run.out
+"""
+
+
+def _age(path, seconds=3600):
+    """Make *path* look modified a while ago, so its stat is trusted."""
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+@pytest.fixture
+def script(tmp_path):
+    path = tmp_path / "job.sh"
+    path.write_text(SCRIPT)
+    _age(path)
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(tmp_path / "cache")
+
+
+def _parse(text):
+    return SlurmScript.from_script(text).to_bytes()
+
+
+def test_second_read_is_a_hit(script, cache):
+    first = SlurmScript.read_script(script, cache=cache)
+    second = SlurmScript.read_script(script, cache=cache)
+
+    assert first == second == SlurmScript.read_script(script)
+    assert second.get_pragma("--frobnicate").value == "1"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_hit_does_not_parse(script, cache):
+    cache.load(script, _parse)
+
+    def fail(text):
+        raise AssertionError("parsed again")
+
+    assert cache.load(script, fail) == SlurmScript.read_script(script).to_bytes()
+
+
+def test_changed_script_is_parsed_again(script, cache):
+    SlurmScript.read_script(script, cache=cache)
+    with open(script, "a") as f:
+        f.write("echo done\n")
+    _age(script, 60)
+
+    parsed = SlurmScript.read_script(script, cache=cache)
+
+    assert parsed.custom_commands[-1] == "echo done"
+    assert cache.misses == 2
+
+
+def test_touched_script_is_recognised_by_its_hash(script, cache):
+    cache.load(script, _parse)
+    _age(script, 60)
+
+    def fail(text):
+        raise AssertionError("parsed again")
+
+    cache.load(script, fail)
+    # The entry was refreshed with the new mtime.
+    cache.load(script, fail)
+    assert cache.hits == 2
+
+
+def test_recently_modified_script_is_not_trusted_by_stat(tmp_path, cache):
+    path = tmp_path / "job.sh"
+    path.write_text(SCRIPT)
+    stat = path.stat()
+    SlurmScript.read_script(str(path), cache=cache)
+
+    # Same size and mtime, different content: only the hash can tell.
+    path.write_text(SCRIPT.replace("nodes=2", "nodes=4"))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    parsed = SlurmScript.read_script(str(path), cache=cache)
+    assert parsed.get_pragma("nodes").value == "4"
+
+
+def test_cache_directory_is_shared(script, tmp_path):
+    SlurmScript.read_script(script, cache=ParseCache(tmp_path / "cache"))
+    other = ParseCache(tmp_path / "cache")
+
+    SlurmScript.read_script(script, cache=other)
+
+    assert (other.hits, other.misses) == (1, 0)
+
+
+def test_damaged_entry_is_a_miss(script, cache):
+    cache.load(script, _parse)
+    for name in os.listdir(cache.directory):
+        with open(os.path.join(cache.directory, name), "wb") as f:
+            f.write(b"garbage")
+
+    assert SlurmScript.read_script(script, cache=cache) == SlurmScript.read_script(
+        script
+    )
+    assert cache.misses == 2
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    paths = []
+    for i in range(20):
+        path = tmp_path / f"job_{i}.sh"
+        path.write_text(SCRIPT.replace("cached", f"job_{i}"))
+        _age(path)
+        paths.append(str(path))
+    cache = ParseCache(tmp_path / "cache")
+    cache.load(paths[0], _parse)
+    entry_size = os.path.getsize(
+        os.path.join(cache.directory, os.listdir(cache.directory)[0])
+    )
+    cache.max_bytes = 5 * entry_size
+
+    for i, path in enumerate(paths):
+        cache.load(path, _parse)
+        # Keep the first script in use.
+        cache.load(paths[0], _parse)
+        _age(os.path.join(cache.directory, cache._entry_path(path)), 20 - i)
+
+    sizes = [os.path.getsize(e.path) for e in os.scandir(cache.directory)]
+    assert sum(sizes) <= cache.max_bytes
+    hits = cache.hits
+    cache.load(paths[0], _parse)
+    cache.load(paths[-1], _parse)
+    assert cache.hits == hits + 2
+
+
+def test_clear_removes_entries(script, cache):
+    cache.load(script, _parse)
+
+    cache.clear()
+
+    assert os.listdir(cache.directory) == []
@@ -1,4 +1,14 @@
-from slurm_script_generator.pragmas import PragmaFactory
+import math
+
+import pytest
+
+from slurm_script_generator.pragmas import (
+    PragmaFactory,
+    Tool,
+    parse_count_range,
+    parse_memory,
+    parse_time,
+)
 
 
 def test_pragma_factory():
@@ -36,8 +46,6 @@ def test_pragma_serialization():
 
 
 def test_invalid_pragma_key():
-    import pytest
-
     with pytest.raises(ValueError):
         PragmaFactory.create_pragma("notarealpragma", "1")
 
@@ -85,3 +93,292 @@ def test_io_pragmas():
     assert summary.flags == ["--disable-output-job-summary"]
     assert summary.dest == "--disable-output-job-summary"
     assert summary.arg_varname == "disable_output_job_summary"
+
+
+@pytest.mark.parametrize(
+    "flag, key",
+    [
+        ("--job-name", "job_name"),
+        ("-J", "job_name"),
+        ("-N", "nodes"),
+        ("--output", "output"),
+        ("-o", "output"),
+    ],
+)
+def test_flag_to_cls_finds_long_and_short_flags(flag, key):
+    assert PragmaFactory.flag_to_cls(flag) is PragmaFactory.pragmas[key]
+
+
+@pytest.mark.parametrize(
+    "flag, key",
+    [
+        ("--job", "job_name"),
+        ("--part", "partition"),
+        ("--ntasks-per-n", "ntasks_per_node"),
+        # An exact option wins over the longer options it abbreviates.
+        ("--mem", "mem"),
+        ("--ntasks", "ntasks"),
+    ],
+)
+def test_flag_to_cls_resolves_unambiguous_prefixes(flag, key):
+    assert PragmaFactory.flag_to_cls(flag) is PragmaFactory.pragmas[key]
+
+
+@pytest.mark.parametrize(
+    "flag",
+    [
+        "--no",  # --nodes, --no-kill, ...
+        "--me",  # --mem, --mem-per-cpu, ...
+        "--ex",  # --exclude, but also the unmodelled --exclusive and --export
+        "--exclusive",  # unmodelled, though a prefix of --exclusive-user
+        "--frobnicate",
+        "-Z",
+    ],
+)
+def test_flag_to_cls_rejects_ambiguous_or_unknown_flags(flag):
+    assert PragmaFactory.flag_to_cls(flag) is None
+
+
+def test_lookup_many_keeps_order_and_marks_unknown_flags():
+    classes = PragmaFactory.lookup_many(["-N", "--frobnicate", "--time"])
+
+    assert classes == [
+        PragmaFactory.pragmas["nodes"],
+        None,
+        PragmaFactory.pragmas["time"],
+    ]
+
+
+def test_pragma_classes_are_available_as_module_attributes():
+    import slurm_script_generator.pragmas as pragmas
+
+    assert pragmas.Nodes is PragmaFactory.pragmas["nodes"]
+    assert pragmas.Job_name.pragma_type == "job_config"
+    assert "--job-name" in pragmas.Job_name.__doc__
+    assert pragmas.pragmas_ordered == list(PragmaFactory.pragmas.values())
+
+
+def test_unknown_module_attribute_raises():
+    import slurm_script_generator.pragmas as pragmas
+
+    with pytest.raises(AttributeError):
+        pragmas.Not_a_pragma
+
+
+def test_pragma_ids_follow_the_spec_table():
+    from slurm_script_generator.pragmas import PRAGMA_SPECS
+
+    for pragma_type, specs in PRAGMA_SPECS.items():
+        for pragma_id, spec in enumerate(specs):
+            pragma_cls = PragmaFactory.pragmas[spec.arg_varname]
+            assert pragma_cls.pragma_type == pragma_type
+            assert pragma_cls.pragma_id == pragma_id
+
+
+def test_equal_pragmas_are_shared():
+    first = PragmaFactory.create_pragma("partition", "gpu")
+    second = PragmaFactory.create_pragma("partition", "gpu")
+
+    assert first is second
+    assert PragmaFactory.create_pragma("partition", "cpu") is not first
+
+
+def test_values_of_different_types_are_not_shared():
+    assert PragmaFactory.create_pragma("nodes", 1).value is not True
+    assert PragmaFactory.create_pragma("nodes", True).value is True
+
+
+def test_pragmas_are_immutable_and_slotted():
+    pragma = PragmaFactory.create_pragma("nodes", 2)
+
+    with pytest.raises(AttributeError):
+        pragma.value = 3
+    assert not hasattr(pragma, "__dict__")
+
+
+def test_pragmas_with_unhashable_values_are_not_shared():
+    pragma = PragmaFactory.create_pragma("nodelist", ["node1", "node2"])
+
+    assert pragma.value == ["node1", "node2"]
+    assert PragmaFactory.create_pragma("nodelist", ["node1", "node2"]) is not pragma
+
+
+def test_unknown_pragmas_are_shared_per_flag_and_value():
+    from slurm_script_generator.pragmas import UnknownPragma
+
+    pragma = UnknownPragma("--frobnicate", "1")
+
+    assert UnknownPragma("--frobnicate", "1") is pragma
+    assert UnknownPragma("--frobnicate", "2") is not pragma
+    assert pragma.dest == pragma.arg_varname == "--frobnicate"
+    assert pragma.flags == ["--frobnicate"]
+
+
+def test_pickled_pragmas_are_interned_again():
+    import pickle
+
+    from slurm_script_generator.pragmas import UnknownPragma
+
+    pragma = PragmaFactory.create_pragma("time", "01:00:00")
+    unknown = UnknownPragma("--frobnicate", "1")
+
+    assert pickle.loads(pickle.dumps(pragma)) is pragma
+    assert pickle.loads(pickle.dumps(unknown)) is unknown
+
+
+def test_rendered_lines_are_cached():
+    from slurm_script_generator.pragmas import clear_render_cache, render_cache_info
+
+    clear_render_cache()
+    pragma = PragmaFactory.create_pragma("nodes", 2)
+
+    first = pragma.render()
+    second = pragma.render()
+    pragma.render(line_length=80)
+
+    info = render_cache_info()
+    assert first == second == str(pragma)
+    assert (info.hits, info.misses) == (1, 2)
+
+
+def test_render_respects_line_length():
+    pragma = PragmaFactory.create_pragma("nodes", 2)
+
+    assert pragma.render(line_length=30).index("#", 1) == 31
+    assert pragma.render(line_length=60).index("#", 1) == 61
+
+
+def test_unhashable_values_are_rendered_without_the_cache():
+    pragma = PragmaFactory.create_pragma("nodelist", ["node1"])
+
+    assert pragma.render().startswith("#SBATCH --nodelist=['node1']")
+
+
+def test_create_many_builds_pragmas_in_order():
+    pragmas = PragmaFactory.create_many({"time": "1:00:00", "nodes": 2, "qos": None})
+
+    assert pragmas == [
+        PragmaFactory.create_pragma("time", "1:00:00"),
+        PragmaFactory.create_pragma("nodes", 2),
+    ]
+
+
+def test_create_many_reports_every_unknown_key():
+    with pytest.raises(ValueError, match="notakey, alsonotakey"):
+        PragmaFactory.create_many({"notakey": 1, "nodes": 2, "alsonotakey": 3})
+
+
+@pytest.mark.parametrize(
+    "value, seconds",
+    [
+        (90, 90 * 60),
+        ("90", 90 * 60),
+        ("10:30", 10 * 60 + 30),
+        ("12:00:00", 12 * 3600),
+        ("1-02", 26 * 3600),
+        ("1-02:30", 26 * 3600 + 30 * 60),
+        ("1-02:00:05", 26 * 3600 + 5),
+        ("UNLIMITED", math.inf),
+    ],
+)
+def test_parse_time(value, seconds):
+    assert parse_time(value) == seconds
+
+
+@pytest.mark.parametrize(
+    "value, mib",
+    [(4000, 4000), ("32G", 32768), ("25GB", 25600), ("1T", 1024**2), ("1536K", 2)],
+)
+def test_parse_memory(value, mib):
+    assert parse_memory(value) == mib
+
+
+@pytest.mark.parametrize(
+    "value, counts", [(4, (4, 4)), ("2-4", (2, 4)), ("2,8,4", (2, 8))]
+)
+def test_parse_count_range(value, counts):
+    assert parse_count_range(value) == counts
+
+
+@pytest.mark.parametrize(
+    "parser, value",
+    [(parse_time, "soon"), (parse_memory, "lots"), (parse_count_range, "a-b")],
+)
+def test_parsers_reject_nonsense(parser, value):
+    with pytest.raises(ValueError):
+        parser(value)
+
+
+def test_parsed_value_is_computed_once(monkeypatch):
+    import slurm_script_generator.pragmas as pragmas
+
+    pragma = PragmaFactory.create_pragma("time", "2-00:00:00")
+    assert pragma.parsed == 2 * 24 * 3600
+
+    monkeypatch.setattr(pragma.__class__, "parser", None)
+    assert pragma.parsed == 2 * 24 * 3600
+    assert pragmas.Account("max").parsed is None
+
+
+def test_every_modelled_option_is_an_sbatch_option():
+    for pragma_cls in PragmaFactory.pragmas.values():
+        assert pragma_cls.tools & Tool.SBATCH, pragma_cls.__name__
+
+
+@pytest.mark.parametrize(
+    "key, tool, accepted",
+    [
+        ("nodes", Tool.SRUN, True),
+        ("nodes", Tool.SCONTROL, True),
+        ("array", Tool.SALLOC, False),
+        ("array", Tool.SRUN, False),
+        ("output", Tool.SRUN, True),
+        ("output", Tool.SALLOC, False),
+        ("cpus_per_task", Tool.SCONTROL, False),
+    ],
+)
+def test_pragma_classes_know_which_tools_accept_them(key, tool, accepted):
+    assert bool(PragmaFactory.pragmas[key].tools & tool) is accepted
+
+
+def test_unknown_pragmas_take_their_tools_from_the_unmodelled_options():
+    from slurm_script_generator.pragmas import UnknownPragma
+
+    assert UnknownPragma("--x11").tools == Tool.SALLOC | Tool.SRUN
+    assert UnknownPragma("--frobnicate").tools == Tool(0)
+
+
+def test_split_by_tool_builds_arguments_in_one_pass():
+    from slurm_script_generator.pragmas import UnknownPragma, split_by_tool
+
+    pragmas = [
+        PragmaFactory.create_pragma("nodes", 2),
+        PragmaFactory.create_pragma("array", "1-4"),
+        PragmaFactory.create_pragma("output", "job.out"),
+        PragmaFactory.create_pragma("hold", True),
+        UnknownPragma("--x11"),
+    ]
+
+    args = split_by_tool(pragmas, tools=[Tool.SBATCH, Tool.SALLOC, Tool.SRUN])
+
+    assert args[Tool.SBATCH] == [
+        "--nodes=2",
+        "--array=1-4",
+        "--output=job.out",
+        "--hold",
+    ]
+    assert args[Tool.SALLOC] == ["--nodes=2", "--hold", "--x11"]
+    assert args[Tool.SRUN] == ["--nodes=2", "--output=job.out", "--hold", "--x11"]
+
+
+def test_equal_pragmas_hash_equal():
+    a = PragmaFactory.create_pragma("nodes", "2")
+    b = PragmaFactory.create_pragma("nodes", "2")
+
+    assert len({a, b, PragmaFactory.create_pragma("nodes", "3")}) == 2
+
+
+def test_pragma_with_list_value_is_hashable():
+    pragma = PragmaFactory.create_pragma("nodelist", ["n1", "n2"])
+
+    assert pragma in {pragma}
@@ -107,6 +107,32 @@ def test_round_trip_via_json(tmp_path):
     assert SlurmScript.from_json(str(path)) == script
 
 
+def test_round_trip_via_jsonl(tmp_path):
+    scripts = [
+        SlurmScript(nodes=i, hold=True, custom_commands=[f"srun ./bin {i}"])
+        for i in range(1, 4)
+    ]
+    path = tmp_path / "scripts.jsonl"
+
+    assert SlurmScript.to_jsonl(iter(scripts), path) == 3
+
+    assert len(path.read_text().splitlines()) == 3
+    assert list(SlurmScript.iter_jsonl(path)) == scripts
+
+
+def test_jsonl_is_read_one_record_at_a_time(tmp_path):
+    path = tmp_path / "scripts.jsonl"
+    SlurmScript.to_jsonl([SlurmScript(nodes=1)], path)
+    with open(path, "a") as f:
+        f.write("\n{broken\n")
+
+    records = SlurmScript.iter_jsonl(path)
+
+    assert next(records) == SlurmScript(nodes=1)
+    with pytest.raises(ValueError, match="scripts.jsonl:3"):
+        next(records)
+
+
 # ---------------------------------------------------------------------------
 # Parsing scripts we did not write ourselves
 # ---------------------------------------------------------------------------
@@ -141,6 +167,12 @@ def test_parses_value_forms(line, expected):
     assert parsed.to_dict()["pragmas"]["nodes"] == expected
 
 
+def test_abbreviated_options_are_parsed_like_sbatch_does():
+    parsed = _parse_line("#SBATCH --job=my_job\n#SBATCH --part gpu")
+
+    assert parsed.to_dict()["pragmas"] == {"job_name": "my_job", "partition": "gpu"}
+
+
 def test_hash_inside_a_value_is_not_a_comment():
     parsed = _parse_line("#SBATCH --comment=a#b")
 
@@ -185,4 +217,4 @@ def test_known_pragma_without_a_value_is_an_error():
 def test_empty_sbatch_line_is_ignored():
     parsed = _parse_line("#SBATCH")
 
-    assert parsed.pragmas == []
+    assert parsed.pragmas == ()
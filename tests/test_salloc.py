@@ -5,6 +5,7 @@ from unittest.mock import patch
 
 import pytest
 
+from slurm_script_generator.parse_cache import ParseCache
 from slurm_script_generator.pragmas import PragmaFactory, UnknownPragma
 from slurm_script_generator.salloc import (
     build_command,
@@ -140,6 +141,17 @@ def test_build_command_appends_extra_args(script):
     assert command[-1] == "--x11"
 
 
+def test_build_command_with_a_parse_cache(script, tmp_path):
+    cache = ParseCache(tmp_path / "cache")
+
+    first, _ = build_command(script, cache=cache)
+    second, body = build_command(script, run=True, cache=cache)
+
+    assert first == second == build_command(script)[0]
+    assert body == "module load intel\n# a comment\nsrun ./bin > run.out"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
 def test_dropped_options_are_reported(tmp_path, capsys):
     path = tmp_path / "job.sh"
     path.write_text("#!/bin/bash\n#SBATCH --nodes=1\n#SBATCH --output=job.out\n")
@@ -171,6 +183,15 @@ def test_dry_run_shows_the_body(script, capsys):
     assert "srun ./bin > run.out" in out
 
 
+def test_parse_cache_option(script, tmp_path, capsys):
+    directory = tmp_path / "cache"
+
+    main([script, "--dry-run", "--parse-cache", str(directory)])
+
+    assert "--nodes=2" in capsys.readouterr().out
+    assert len(os.listdir(directory)) == 1
+
+
 def test_dry_run_does_not_run_salloc(script):
     with patch("subprocess.run") as run:
         main([script, "--dry-run"])
@@ -261,3 +282,15 @@ def test_missing_salloc_is_reported(script, capsys):
         assert main([script]) == 127
 
     assert "salloc not found" in capsys.readouterr().err
+
+
+def test_late_pragmas_are_ignored_on_every_path(tmp_path):
+    path = tmp_path / "job.sh"
+    path.write_text("#SBATCH --job-name=a\necho hi\n#SBATCH --time=10\n")
+
+    plain, _ = build_command(str(path))
+    cached, _ = build_command(str(path), cache=ParseCache(tmp_path / "cache"))
+    run, body = build_command(str(path), run=True)
+
+    assert plain == cached == run == ["salloc", "--job-name=a"]
+    assert body == "echo hi"
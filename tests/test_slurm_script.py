@@ -1,10 +1,13 @@
+import io
+import os
+import tracemalloc
 from tempfile import NamedTemporaryFile
 from unittest.mock import patch
 
 import pytest
 
 from slurm_script_generator.pragmas import PragmaFactory
-from slurm_script_generator.slurm_script import SlurmScript
+from slurm_script_generator.slurm_script import SlurmScript, _header
 
 
 def test_export_import():
@@ -124,6 +127,62 @@ def test_add_param_sets_line_length():
     assert script.line_length == 80
 
 
+def test_from_pragma_mapping_matches_the_constructor():
+    script = SlurmScript.from_pragma_mapping(
+        {"nodes": 2, "job_name": "my_job", "--frobnicate": "1"}
+    )
+
+    assert script.to_dict()["pragmas"] == {
+        "job_name": "my_job",
+        "nodes": 2,
+        "--frobnicate": "1",
+    }
+    assert script.to_string() == SlurmScript.from_dict(script.to_dict()).to_string()
+
+
+def test_from_pragma_mapping_rejects_unknown_keys():
+    with pytest.raises(ValueError, match="Unknown pragma keys: notakey"):
+        SlurmScript.from_pragma_mapping({"nodes": 2, "notakey": 1})
+
+
+# ---------------------------------------------------------------------------
+# Requested resources
+# ---------------------------------------------------------------------------
+
+
+def test_core_hours_from_tasks_and_cpus():
+    script = SlurmScript(ntasks=8, cpus_per_task=4, time="1-00:00:00")
+
+    assert script.time_limit == 24 * 3600
+    assert script.requested_cpus == 32
+    assert script.core_hours == 32 * 24
+
+
+def test_requested_cpus_from_nodes_and_tasks_per_node():
+    script = SlurmScript(nodes="2-4", ntasks_per_node=16)
+
+    assert script.requested_cpus == 64
+    assert script.core_hours is None
+
+
+def test_requested_cpus_defaults_to_one():
+    assert SlurmScript().requested_cpus == 1
+
+
+@pytest.mark.parametrize(
+    "kwargs, mib",
+    [
+        ({"nodes": 2, "mem": "32G"}, 65536),
+        ({"ntasks": 4, "mem_per_cpu": "2G"}, 8192),
+        ({"gpus": "2", "mem_per_gpu": "10G"}, 20480),
+        ({"gpus": "a100:2", "mem_per_gpu": "10G"}, None),
+        ({"nodes": 2}, None),
+    ],
+)
+def test_requested_memory(kwargs, mib):
+    assert SlurmScript(**kwargs).requested_memory == mib
+
+
 # ---------------------------------------------------------------------------
 # Output
 # ---------------------------------------------------------------------------
@@ -160,6 +219,162 @@ def test_read_script_reads_from_disk(tmp_path):
     assert read_back.modules == ["intel"]
 
 
+@pytest.fixture
+def script_dir(tmp_path):
+    for i in range(5):
+        SlurmScript(job_name=f"job_{i}", nodes=i + 1).save(str(tmp_path / f"{i}.sh"))
+    (tmp_path / "bad.sh").write_text("#!/bin/bash\n#SBATCH --nodes\n")
+    return tmp_path
+
+
+def test_read_scripts_with_a_glob(script_dir):
+    results = sorted(SlurmScript.read_scripts(str(script_dir / "*.sh"), workers=1))
+
+    assert [os.path.basename(r.path) for r in results] == [
+        "0.sh",
+        "1.sh",
+        "2.sh",
+        "3.sh",
+        "4.sh",
+        "bad.sh",
+    ]
+    assert results[3].script == SlurmScript.read_script(str(script_dir / "3.sh"))
+    assert results[3].error is None
+    assert results[-1].script is None
+    assert results[-1].error.startswith("ValueError: Pragma '--nodes'")
+
+
+def test_read_scripts_in_worker_processes(script_dir):
+    paths = [str(script_dir / f"{i}.sh") for i in range(5)]
+    paths.append(str(script_dir / "missing.sh"))
+
+    results = {
+        r.path: r for r in SlurmScript.read_scripts(paths, workers=2, chunksize=2)
+    }
+
+    assert results.keys() == set(paths)
+    for path in paths[:-1]:
+        assert results[path].script == SlurmScript.read_script(path)
+    assert results[paths[-1]].error.startswith("FileNotFoundError")
+
+
+def test_read_scripts_can_be_stopped_early(script_dir):
+    results = SlurmScript.read_scripts(str(script_dir / "*.sh"), workers=2, chunksize=1)
+
+    next(results)
+    results.close()
+
+
+def _write(tmp_path, text):
+    path = tmp_path / "job.sh"
+    path.write_text(text)
+    return str(path)
+
+
+def test_map_script_reads_like_read_script(tmp_path):
+    path = str(tmp_path / "job.sh")
+    SlurmScript(
+        nodes=2,
+        job_name="mapped",
+        modules=["intel", "openmpi"],
+        custom_commands=["srun ./bin > run.out", "echo done"],
+    ).save(path)
+
+    mapped = SlurmScript.map_script(path)
+
+    assert mapped == SlurmScript.read_script(path)
+    assert mapped.to_string() == SlurmScript.read_script(path).to_string()
+
+
+def test_map_script_parses_the_body_only_when_needed(tmp_path):
+    path = _write(tmp_path, "#SBATCH --nodes=2\n#SBATCH --frobnicate\nsrun ./bin\n")
+
+    script = SlurmScript.map_script(path)
+
+    assert script._body is not None
+    assert script.get_pragma("nodes").value == "2"
+    assert script.get_pragma("--frobnicate").value is True
+    assert script.custom_commands == ["srun ./bin"]
+    assert script._body is None
+
+
+def test_map_script_keeps_late_pragmas_as_commands(tmp_path):
+    path = _write(
+        tmp_path, "#SBATCH --nodes=2\nmodule load intel\necho\n  #SBATCH --hold\n"
+    )
+
+    script = SlurmScript.map_script(path)
+
+    assert [p.dest for p in script.pragmas] == ["--nodes"]
+    assert script.modules == ["intel"]
+    assert script.custom_commands == ["echo", "#SBATCH --hold"]
+    assert script == SlurmScript.read_script(path)
+
+
+@pytest.mark.parametrize("text", ["", "#!/bin/bash\n#SBATCH --nodes=2"])
+def test_map_script_without_a_body(tmp_path, text):
+    script = SlurmScript.map_script(_write(tmp_path, text))
+
+    assert script._body is None
+    assert script.custom_commands == []
+
+
+def test_lazy_body_is_parsed_before_a_change(tmp_path):
+    path = _write(tmp_path, "#SBATCH --nodes=2\nmodule load intel\nsrun ./bin\n")
+    script = SlurmScript.map_script(path)
+
+    script.add_custom_command("echo done")
+    script.add_module("gcc")
+
+    assert script.custom_commands == ["srun ./bin", "echo done"]
+    assert script.modules == ["intel", "gcc"]
+
+
+def test_map_script_does_not_read_the_body(tmp_path):
+    payload = "x" * 999 + "\n"
+    path = _write(tmp_path, "#SBATCH --nodes=2\ncat << EOF\n" + payload * 20_000)
+
+    tracemalloc.start()
+    try:
+        script = SlurmScript.map_script(path)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 1_000_000
+    assert len(script.custom_commands) == 20_001
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+def test_mapped_scripts_do_not_hold_file_descriptors(tmp_path):
+    paths = []
+    for i in range(50):
+        path = tmp_path / f"job_{i}.sh"
+        path.write_text("#SBATCH --nodes=2\nsrun ./bin\n")
+        paths.append(path)
+    fds = len(os.listdir("/proc/self/fd"))
+
+    scripts = [SlurmScript.map_script(path) for path in paths]
+
+    assert len(os.listdir("/proc/self/fd")) == fds
+    assert all(script.custom_commands == ["srun ./bin"] for script in scripts)
+
+
+def test_changed_script_is_not_read_after_mapping(tmp_path):
+    path = _write(tmp_path, "#SBATCH --nodes=2\nsrun ./bin\n")
+    script = SlurmScript.map_script(path)
+    with open(path, "a") as f:
+        f.write("echo done\n")
+
+    with pytest.raises(ValueError, match="changed since it was mapped"):
+        script.custom_commands
+
+
+def test_missing_attributes_still_raise():
+    with pytest.raises(AttributeError, match="no_such_thing"):
+        SlurmScript().no_such_thing
+
+
 def test_scripts_with_different_pragmas_are_not_equal():
     assert SlurmScript(nodes=1) != SlurmScript(nodes=2)
 
@@ -193,3 +408,336 @@ def test_submit_job_raises_when_sbatch_fails(tmp_path):
     with patch("subprocess.run", return_value=completed):
         with pytest.raises(RuntimeError, match="boom"):
             SlurmScript(nodes=1).submit_job(str(path))
+
+
+def test_pragma_comments_follow_the_line_length():
+    generated = SlurmScript(nodes=2).generate_script(line_length=70)
+
+    line = next(line for line in generated.splitlines() if "--nodes" in line)
+    assert line.index("# number of nodes") == 71
+
+
+def test_scripts_with_equal_contents_are_deduplicated():
+    scripts = [
+        SlurmScript(nodes=2, time="01:00:00", modules=["gcc"]),
+        SlurmScript(time="01:00:00", nodes=2, modules=["gcc"]),
+        SlurmScript(nodes=3, time="01:00:00", modules=["gcc"]),
+    ]
+
+    assert scripts[0] == scripts[1]
+    assert len(set(scripts)) == 2
+
+
+def test_scripts_differing_in_order_of_commands_are_not_equal():
+    a = SlurmScript(custom_commands=["a", "b"])
+    b = SlurmScript(custom_commands=["b", "a"])
+
+    assert a != b
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda s: s.add_pragma(PragmaFactory.create_pragma("nodes", "4")),
+        lambda s: s.add_module("cuda"),
+        lambda s: s.add_custom_command("srun ./other"),
+    ],
+)
+def test_fingerprint_is_invalidated_by_mutators(mutate):
+    script = SlurmScript(nodes=2, custom_commands=["srun ./app"])
+    copy = SlurmScript(nodes=2, custom_commands=["srun ./app"])
+    assert script == copy and hash(script) == hash(copy)
+
+    mutate(script)
+
+    assert script != copy
+    assert script == SlurmScript.from_dict(script.to_dict())
+
+
+def test_package_version_is_read_once_per_process():
+    script = SlurmScript(nodes=2)
+    _header.cache_clear()
+    try:
+        with patch(
+            "slurm_script_generator.slurm_script.version", return_value="9.9.9"
+        ) as version:
+            first = script.generate_script(include_header=True)
+            second = script.generate_script(include_header=True)
+    finally:
+        _header.cache_clear()
+
+    assert version.call_count == 1
+    assert first == second
+    assert "slurm-script-generator v9.9.9" in first
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda s: s.add_pragma(PragmaFactory.create_pragma("time", "02:00:00")),
+        lambda s: s.add_pragma(PragmaFactory.create_pragma("hold", True)),
+        lambda s: s.add_module("cuda"),
+        lambda s: s.add_custom_command("srun ./other"),
+    ],
+)
+def test_rerender_after_a_change_matches_a_fresh_render(mutate):
+    script = SlurmScript(nodes=2, time="01:00:00", modules=["gcc"])
+    script.generate_script(line_length=40)
+
+    mutate(script)
+
+    fresh = SlurmScript.from_dict(script.to_dict())
+    for line_length in (40, 54):
+        assert script.generate_script(line_length=line_length) == (
+            fresh.generate_script(line_length=line_length)
+        )
+
+
+def test_rerender_only_renders_the_changed_section():
+    script = SlurmScript(job_name="a", nodes=2, time="01:00:00", mem="4G")
+    script.generate_script()
+
+    with patch.object(
+        SlurmScript,
+        "_render_pragmas",
+        autospec=True,
+        side_effect=SlurmScript._render_pragmas,
+    ) as render:
+        script.add_pragma(PragmaFactory.create_pragma("time", "02:00:00"))
+        text = script.generate_script()
+
+    assert render.call_count == 1
+    assert "--time=02:00:00" in text
+
+
+def test_cached_sections_and_fingerprint_cannot_go_stale():
+    script = SlurmScript(modules=["gcc"], custom_commands=["a"])
+    script.generate_script()
+    before = hash(script)
+
+    # The lists handed out are copies, so the only way to change the script
+    # is through the mutators, which drop the cached state.
+    script.modules.append("cuda")
+    script.custom_commands.append("b")
+    assert hash(script) == before
+    script.add_module("cuda")
+    script.add_custom_command("b")
+
+    assert "module load gcc cuda" in script.generate_script()
+    assert hash(script) != before
+    assert script != SlurmScript(modules=["gcc"], custom_commands=["a"])
+
+
+def test_get_pragma_by_key():
+    script = SlurmScript(nodes=2, time="01:00:00")
+
+    assert script.get_pragma("time").value == "01:00:00"
+    assert script.get_pragma("mem") is None
+
+
+def test_get_pragma_by_raw_flag_of_unknown_option():
+    script = SlurmScript.from_pragma_mapping({"--gpu-bind": "closest"})
+
+    assert script.get_pragma("--gpu-bind").value == "closest"
+
+
+def test_get_pragma_rejects_unknown_keys():
+    with pytest.raises(ValueError):
+        SlurmScript().get_pragma("frobnicate")
+
+
+def test_pragmas_view_is_cached_until_a_pragma_changes():
+    script = SlurmScript(nodes=2, time="01:00:00")
+    view = script.pragmas
+
+    assert script.pragmas is view
+    script.add_module("gcc")
+    assert script.pragmas is view
+
+    script.add_pragma(PragmaFactory.create_pragma("nodes", "3"))
+    assert script.pragmas is not view
+    assert [p.value for p in script.pragmas] == ["01:00:00", "3"]
+
+
+def test_replacing_a_pragma_keeps_its_position():
+    script = SlurmScript(
+        pragmas=[
+            PragmaFactory.create_pragma("job_name", "a"),
+            PragmaFactory.create_pragma("account", "b"),
+        ]
+    )
+    script.add_pragma(PragmaFactory.create_pragma("job_name", "c"))
+
+    assert [p.value for p in script.pragmas] == ["c", "b"]
+
+
+def _base_script() -> SlurmScript:
+    return SlurmScript(
+        job_name="base",
+        nodes=2,
+        time="01:00:00",
+        mem="4G",
+        modules=["gcc"],
+        custom_commands=["srun ./app"],
+    )
+
+
+def test_derived_script_matches_a_standalone_script(tmp_path):
+    derived = _base_script().derive(
+        time="02:00:00", ntasks=8, custom_commands=["srun ./other"]
+    )
+    standalone = SlurmScript(
+        job_name="base",
+        nodes=2,
+        ntasks=8,
+        time="02:00:00",
+        mem="4G",
+        modules=["gcc"],
+        custom_commands=["srun ./other"],
+    )
+
+    assert derived == standalone
+    assert derived.to_dict() == standalone.to_dict()
+    assert derived.to_string() == standalone.to_string()
+    derived.to_json(tmp_path / "derived.json")
+    assert SlurmScript.from_json(tmp_path / "derived.json") == standalone
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda s: s.add_pragma(PragmaFactory.create_pragma("time", "09:00:00")),
+        lambda s: s.add_pragma(PragmaFactory.create_pragma("qos", "high")),
+        lambda s: s.add_module("cuda"),
+        lambda s: s.add_custom_command("echo done"),
+    ],
+)
+def test_derived_and_parent_do_not_see_each_others_changes(mutate):
+    base = _base_script()
+    derived = base.derive(nodes=4)
+    before = base.to_dict()
+
+    mutate(derived)
+    assert base.to_dict() == before
+
+    after = derived.to_dict()
+    mutate(base)
+    assert base.to_dict() != before
+    assert derived.to_dict() == after
+
+
+def test_derived_script_does_not_hand_out_shared_lists():
+    base = _base_script()
+    child = base.derive(time="02:00:00")
+    sibling = base.derive(time="03:00:00")
+    before = base.to_dict()
+
+    child.custom_commands.append("echo done")
+    child.modules.append("cuda")
+    child.to_dict()["modules"].append("cuda")
+    child.to_dict()["custom_commands"].append("echo done")
+
+    assert base.to_dict() == before
+    assert sibling.modules == base.modules
+    assert sibling.custom_commands == base.custom_commands
+
+
+def test_derive_rejects_unknown_keys():
+    with pytest.raises(ValueError, match="Unknown pragma keys"):
+        _base_script().derive(frobnicate=1)
+
+
+def test_sweep_over_a_cartesian_grid():
+    base = SlurmScript(job_name="sweep", custom_commands=["srun ./app --lr {lr}"])
+
+    points = list(base.sweep({"nodes": [1, 2], "lr": [0.1, 0.01]}))
+
+    assert [p.index for p in points] == [0, 1, 2, 3]
+    assert [p.params for p in points][1] == {"nodes": 1, "lr": 0.01}
+    assert points[1].script == SlurmScript(
+        job_name="sweep", nodes=1, custom_commands=["srun ./app --lr 0.01"]
+    )
+
+
+def test_sweep_over_zipped_lists():
+    points = SlurmScript().sweep({"nodes": [1, 2], "time": ["1:00", "2:00"]}, "zip")
+
+    assert [p.script.to_dict()["pragmas"] for p in points] == [
+        {"nodes": 1, "time": "1:00"},
+        {"nodes": 2, "time": "2:00"},
+    ]
+
+
+def test_sweep_rejects_zipped_lists_of_different_length():
+    with pytest.raises(ValueError, match="differ in length"):
+        next(SlurmScript().sweep({"nodes": [1, 2], "time": ["1:00"]}, "zip"))
+
+
+def test_sweep_over_explicit_points_is_lazy():
+    def points():
+        yield {"job_name": "a"}
+        raise AssertionError("the sweep read ahead")
+
+    sweep = SlurmScript().sweep(points())
+
+    assert next(sweep).script.get_pragma("job_name").value == "a"
+
+
+def test_filtered_sweep_keeps_the_index_of_each_point():
+    sweep = SlurmScript().sweep({"nodes": [1, 2, 3, 4]}, where=lambda p: p["nodes"] % 2)
+
+    assert [(p.index, p.params["nodes"]) for p in sweep] == [(0, 1), (2, 3)]
+
+
+def test_sweep_leaves_bash_variables_alone():
+    base = SlurmScript(custom_commands=["echo {seed} ${seed} ${SLURM_JOB_ID} {other}"])
+
+    (point,) = base.sweep([{"seed": 7}])
+
+    assert point.script.custom_commands == ["echo 7 ${seed} ${SLURM_JOB_ID} {other}"]
+    assert base.custom_commands == ["echo {seed} ${seed} ${SLURM_JOB_ID} {other}"]
+
+
+def test_sweep_rejects_parameters_that_are_not_used():
+    with pytest.raises(ValueError, match="Unknown sweep parameters: ndoes"):
+        next(SlurmScript(custom_commands=["srun ./app"]).sweep([{"ndoes": 2}]))
+
+
+def test_write_to_text_and_binary_streams_matches_to_string(tmp_path):
+    script = SlurmScript(nodes=2, modules=["gcc"], custom_commands=["echo ü"])
+    text = io.StringIO()
+    binary = io.BytesIO()
+
+    script.write_to(text)
+    script.write_to(binary)
+    with open(tmp_path / "job.sh", "wb") as f:
+        script.write_to(f, include_header=False)
+
+    assert text.getvalue() == script.to_string()
+    assert binary.getvalue() == script.to_string().encode()
+    assert (tmp_path / "job.sh").read_text() == script.to_string(include_header=False)
+
+
+def test_write_to_uses_the_line_length_of_the_script():
+    script = SlurmScript(nodes=2, line_length=70)
+    out = io.StringIO()
+
+    script.write_to(out)
+
+    assert out.getvalue() == script.generate_script(70, include_header=True)
+
+
+def test_write_to_does_not_assemble_large_inlined_scripts(tmp_path):
+    payload = tmp_path / "payload.sh"
+    payload.write_text(("echo " + "x" * 1000 + "\n") * 2000)
+    script = SlurmScript(inlined_script=str(payload))
+    size = len(script.to_string())
+
+    tracemalloc.start()
+    with open(tmp_path / "job.sh", "w") as f:
+        script.write_to(f)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    assert size > 2_000_000
+    assert peak < size / 10
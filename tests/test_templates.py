@@ -0,0 +1,92 @@
+import pytest
+
+from slurm_script_generator.slurm_script import SlurmScript
+
+
+def _base() -> SlurmScript:
+    return SlurmScript(
+        job_name="base",
+        nodes=2,
+        time="01:00:00",
+        hold=True,
+        modules=["gcc"],
+        custom_commands=["srun ./app --seed {seed}", "echo ${seed} {seed}"],
+    )
+
+
+def _expected(script: SlurmScript, seed=None, **overrides) -> str:
+    commands = script.custom_commands
+    if seed is not None:
+        commands = [
+            command.replace("${seed}", "\0").replace("{seed}", str(seed))
+            for command in commands
+        ]
+        commands = [command.replace("\0", "${seed}") for command in commands]
+    return script.derive(custom_commands=commands, **overrides).generate_script(
+        include_header=True
+    )
+
+
+def test_template_without_values_renders_the_script():
+    script = _base()
+
+    template = script.compile_template(["time", "seed"], include_header=True)
+
+    assert template.render() == script.generate_script(include_header=True)
+
+
+@pytest.mark.parametrize("job_name", ["a", "x" * 44, "x" * 45, "x" * 46, "x" * 80])
+def test_comment_padding_follows_the_value_length(job_name):
+    script = _base()
+    template = script.compile_template(["job_name"], include_header=True)
+
+    assert template.render(job_name=job_name) == _expected(script, job_name=job_name)
+
+
+def test_pragma_and_placeholder_slots_are_filled():
+    script = _base()
+    template = script.compile_template(["nodes", "time", "seed"], include_header=True)
+
+    rendered = template.render(nodes=16, time="12:00:00", seed=42)
+
+    assert rendered == _expected(script, seed=42, nodes=16, time="12:00:00")
+    assert "echo ${seed} 42\n" in rendered
+
+
+def test_template_honours_line_length():
+    script = _base()
+    template = script.compile_template(["time"], line_length=30)
+
+    assert template.render(time="2:00") == script.derive(time="2:00").generate_script(
+        line_length=30
+    )
+
+
+def test_template_is_not_affected_by_later_changes():
+    script = _base()
+    template = script.compile_template(["time"])
+    before = template.render(time="2:00")
+
+    script.add_module("cuda")
+
+    assert template.render(time="2:00") == before
+
+
+@pytest.mark.parametrize(
+    "field, message",
+    [
+        ("mem", "not set"),
+        ("hold", "switch"),
+        ("sede", "Unknown template fields: sede"),
+    ],
+)
+def test_invalid_fields_are_rejected(field, message):
+    with pytest.raises(ValueError, match=message):
+        _base().compile_template([field])
+
+
+def test_render_rejects_values_for_other_fields():
+    template = _base().compile_template(["time"])
+
+    with pytest.raises(ValueError, match="Unknown template fields: nodes"):
+        template.render(nodes=4)
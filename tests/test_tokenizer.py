@@ -0,0 +1,93 @@
+import io
+
+import pytest
+
+from slurm_script_generator.slurm_script import SlurmScript
+from slurm_script_generator.tokenizer import COMMAND, MODULE, PRAGMA, tokenize
+
+
+def _tokens(*lines):
+    return [token[:3] for token in tokenize(lines)]
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("#SBATCH --nodes=2", (PRAGMA, "--nodes", "2")),
+        ("  #SBATCH   --nodes = 2 ", (PRAGMA, "--nodes", "= 2")),
+        ("#SBATCH --nodes 2", (PRAGMA, "--nodes", "2")),
+        ("#SBATCH --hold", (PRAGMA, "--hold", None)),
+        ("#SBATCH --job-name=my job", (PRAGMA, "--job-name", "my job")),
+        ("#SBATCH --nodes=2 # two nodes", (PRAGMA, "--nodes", "2")),
+        ("#SBATCH --hold  # comment", (PRAGMA, "--hold", None)),
+        ("#SBATCH --comment=a#b", (PRAGMA, "--comment", "a#b")),
+        ("#SBATCH --comment=#b", (PRAGMA, "--comment", "#b")),
+        ("#SBATCH --comment= #b", (PRAGMA, "--comment", "")),
+        ("#SBATCH --array=1-3=x", (PRAGMA, "--array", "1-3=x")),
+        ("module load gcc openmpi", (MODULE, " gcc openmpi", None)),
+        ("module load gcc # compilers", (MODULE, " gcc", None)),
+        ("module purge", (MODULE, "", None)),
+        ("module list", (MODULE, "", None)),
+        ("  srun ./bin # keep this  ", (COMMAND, "srun ./bin # keep this", None)),
+        ("echo '#SBATCH --nodes=2'", (COMMAND, "echo '#SBATCH --nodes=2'", None)),
+    ],
+)
+def test_line_is_classified(line, expected):
+    assert _tokens(line) == [expected]
+
+
+@pytest.mark.parametrize(
+    "line",
+    ["", "   ", "# a comment", "#!/bin/bash", "#SBATCH"],
+)
+def test_line_is_skipped(line):
+    assert _tokens(line) == []
+
+
+def test_line_endings_are_ignored():
+    assert _tokens("#SBATCH --nodes=2\r\n", "srun ./bin\n") == [
+        (PRAGMA, "--nodes", "2"),
+        (COMMAND, "srun ./bin", None),
+    ]
+
+
+def test_tokens_keep_their_line():
+    [(_, _, _, line)] = tokenize(["  #SBATCH --nodes=2\n"])
+
+    assert line == "  #SBATCH --nodes=2\n"
+
+
+def test_from_lines_reads_a_file_object():
+    text = "#!/bin/bash\n#SBATCH --nodes=2\nmodule load gcc\nsrun ./bin\n"
+
+    script = SlurmScript.from_lines(io.StringIO(text))
+
+    assert script == SlurmScript.from_script(text)
+    assert script.custom_commands == ["srun ./bin"]
+
+
+def test_from_lines_reports_the_line_of_a_missing_value():
+    with pytest.raises(ValueError, match="'#SBATCH --nodes'"):
+        SlurmScript.from_lines(["  #SBATCH --nodes\n"])
+
+
+@pytest.mark.parametrize("reader", ["read_script", "map_script"])
+@pytest.mark.parametrize("first", ["module purge", "module list", "echo hi"])
+def test_header_ends_at_the_first_line_that_is_not_a_comment(tmp_path, reader, first):
+    path = tmp_path / "job.sh"
+    path.write_text(f"#!/bin/bash\n#SBATCH --nodes=2\n{first}\n#SBATCH --hold\n")
+
+    script = getattr(SlurmScript, reader)(str(path))
+
+    assert [p.dest for p in script.pragmas] == ["--nodes"]
+    assert script.modules == []
+    assert script.custom_commands[-1] == "#SBATCH --hold"
+
+
+def test_verbose_parsing_prints_lines(capsys):
+    SlurmScript.from_lines(["#SBATCH --nodes=2\n", "srun ./bin\n"], verbose=True)
+
+    out = capsys.readouterr().out
+    assert "Processing line: '#SBATCH --nodes=2'" in out
+    assert "Processing line: 'srun ./bin'" in out
+    assert "flag = '--nodes'" in out
@@ -0,0 +1,66 @@
+"""Tests of the cross-pragma consistency checks."""
+
+import pytest
+
+from slurm_script_generator.slurm_script import SlurmScript
+from slurm_script_generator.validation import validate_scripts
+
+
+def codes(script: SlurmScript) -> list:
+    return [diagnostic.code for diagnostic in script.validate()]
+
+
+def test_consistent_script_has_no_diagnostics():
+    script = SlurmScript(
+        nodes=2, ntasks=32, ntasks_per_node=16, mem="32G", time="1:00:00"
+    )
+
+    assert script.validate() == []
+
+
+@pytest.mark.parametrize(
+    "kwargs, keys",
+    [
+        ({"mem": "4G", "mem_per_cpu": "1G"}, ("mem", "mem_per_cpu")),
+        ({"mem_per_gpu": "4G", "mem_per_cpu": "1G"}, ("mem_per_cpu", "mem_per_gpu")),
+        ({"cpus_per_task": 4, "cpus_per_gpu": 8}, ("cpus_per_gpu", "cpus_per_task")),
+    ],
+)
+def test_conflicting_options_are_reported_once(kwargs, keys):
+    diagnostics = SlurmScript(**kwargs).validate()
+
+    assert len(diagnostics) == 1
+    assert diagnostics[0].code == "conflict"
+    assert diagnostics[0].keys == keys
+
+
+def test_ntasks_must_fit_on_the_nodes():
+    script = SlurmScript(nodes="1-2", ntasks=40, ntasks_per_node=16)
+
+    assert codes(script) == ["inconsistent"]
+    assert codes(SlurmScript(nodes="1-2", ntasks=32, ntasks_per_node=16)) == []
+
+
+def test_ntasks_without_nodes_sets_the_node_count():
+    assert codes(SlurmScript(ntasks=8, ntasks_per_node=4)) == []
+
+
+def test_time_min_must_not_exceed_time():
+    assert codes(SlurmScript(time="1:00:00", time_min="2:00:00")) == ["inconsistent"]
+
+
+def test_unparsable_values_are_reported():
+    diagnostics = SlurmScript(time="soon").validate()
+
+    assert [d.code for d in diagnostics] == ["invalid-value"]
+    assert diagnostics[0].keys == ("time",)
+
+
+def test_validate_scripts_returns_one_list_per_script():
+    scripts = [
+        SlurmScript(mem="1G"),
+        SlurmScript(mem="1G", mem_per_cpu="1G"),
+        SlurmScript(time="soon"),
+    ]
+
+    assert [len(d) for d in validate_scripts(scripts)] == [0, 1, 1]
@@ -0,0 +1,143 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from slurm_script_generator import save_many
+from slurm_script_generator.slurm_script import SlurmScript
+from slurm_script_generator.writers import MANIFEST_NAME, HashManifest, write_atomic
+
+
+def _scripts(n: int) -> list:
+    return [SlurmScript(job_name=f"job_{i}", nodes=i + 1) for i in range(n)]
+
+
+def test_save_many_with_a_pattern(tmp_path):
+    scripts = _scripts(20)
+
+    timings = save_many(iter(scripts), str(tmp_path / "job_{index:03d}.sh"), workers=4)
+
+    assert [t.path for t in timings] == [
+        str(tmp_path / f"job_{i:03d}.sh") for i in range(20)
+    ]
+    assert all(t.seconds >= 0 for t in timings)
+    for script, timing in zip(scripts, timings):
+        with open(timing.path) as f:
+            assert f.read() == script.to_string()
+    assert sorted(os.listdir(tmp_path)) == [f"job_{i:03d}.sh" for i in range(20)]
+
+
+def test_save_many_with_explicit_paths(tmp_path):
+    paths = [tmp_path / "a.sh", tmp_path / "b.sh"]
+
+    save_many(_scripts(2), paths, include_header=False)
+
+    assert paths[1].read_text() == _scripts(2)[1].to_string(include_header=False)
+
+
+def test_save_many_needs_one_path_per_script(tmp_path):
+    with pytest.raises(ValueError):
+        save_many(_scripts(3), [tmp_path / "a.sh", tmp_path / "b.sh"])
+
+
+def test_save_many_rejects_pattern_without_index(tmp_path):
+    with pytest.raises(ValueError, match="index"):
+        save_many(_scripts(2), str(tmp_path / "job.sh"))
+
+
+def test_written_files_get_the_usual_permissions(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        write_atomic(SlurmScript(), tmp_path / "job.sh")
+    finally:
+        os.umask(umask)
+
+    assert (tmp_path / "job.sh").stat().st_mode & 0o777 == 0o644
+
+
+@pytest.mark.skipif(
+    not os.path.exists("/proc/self/status"), reason="needs /proc/self/status"
+)
+def test_default_mode_does_not_touch_the_umask(tmp_path):
+    with patch("os.umask", side_effect=AssertionError("umask changed")):
+        write_atomic(SlurmScript(), tmp_path / "job.sh")
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+def test_failed_chmod_closes_the_temporary_file(tmp_path):
+    fds = len(os.listdir("/proc/self/fd"))
+
+    with patch("os.fchmod", side_effect=PermissionError("no chmod")):
+        with pytest.raises(PermissionError, match="no chmod"):
+            write_atomic(SlurmScript(), tmp_path / "job.sh")
+
+    assert len(os.listdir("/proc/self/fd")) == fds
+    assert os.listdir(tmp_path) == []
+
+
+def test_failed_write_keeps_the_old_file(tmp_path):
+    path = tmp_path / "job.sh"
+    path.write_text("old")
+
+    with patch.object(SlurmScript, "write_to", side_effect=OSError("disk full")):
+        with pytest.raises(OSError, match="disk full"):
+            write_atomic(SlurmScript(), path)
+
+    assert path.read_text() == "old"
+    assert os.listdir(tmp_path) == ["job.sh"]
+
+
+def test_unchanged_scripts_are_not_rewritten(tmp_path, capsys):
+    pattern = str(tmp_path / "job_{index}.sh")
+    save_many(_scripts(3), pattern, skip_unchanged=True)
+    mtimes = [os.stat(tmp_path / f"job_{i}.sh").st_mtime_ns for i in range(3)]
+
+    scripts = _scripts(3)
+    scripts[1].add_module("gcc")
+    timings = save_many(scripts, pattern, skip_unchanged=True, verbose=True)
+
+    assert [t.written for t in timings] == [False, True, False]
+    assert "1 scripts written, 2 unchanged" in capsys.readouterr().out
+    assert os.stat(tmp_path / "job_0.sh").st_mtime_ns == mtimes[0]
+    assert (tmp_path / "job_1.sh").read_text() == scripts[1].to_string()
+    assert MANIFEST_NAME in os.listdir(tmp_path)
+
+
+def test_file_changed_behind_the_manifest_is_rewritten(tmp_path):
+    path = tmp_path / "job.sh"
+    script = SlurmScript(nodes=2)
+    assert script.save(path, skip_unchanged=True)
+    assert not script.save(path, skip_unchanged=True)
+
+    path.write_text("edited by hand")
+
+    assert script.save(path, skip_unchanged=True)
+    assert path.read_text() == script.to_string()
+
+
+def test_damaged_manifest_means_rewriting(tmp_path):
+    path = tmp_path / "job.sh"
+    SlurmScript().save(path, skip_unchanged=True)
+    (tmp_path / MANIFEST_NAME).write_text("{not json")
+
+    assert SlurmScript().save(path, skip_unchanged=True)
+    assert not SlurmScript().save(path, skip_unchanged=True)
+
+
+def test_save_with_a_shared_manifest(tmp_path):
+    scripts = _scripts(5)
+    manifest = HashManifest(tmp_path)
+
+    with patch.object(HashManifest, "save", autospec=True) as save:
+        written = [
+            s.save(tmp_path / f"{i}.sh", manifest=manifest)
+            for i, s in enumerate(scripts)
+        ]
+    assert written == [True] * 5
+    assert save.call_count == 0
+    manifest.save()
+
+    again = HashManifest(tmp_path)
+    assert not any(
+        s.save(tmp_path / f"{i}.sh", manifest=again) for i, s in enumerate(scripts)
+    )